@@ -48,4 +48,9 @@ class Profile(models.Model):
         return f"{self.user.email} ({self.role})"
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Admin volunteers list filters (see takaful_app/volunteer_filters.py)
+            models.Index(fields=['role', 'is_approved', 'city'], name='profile_role_city_idx'),
+            models.Index(fields=['role', 'is_approved', 'total_volunteer_hours'], name='profile_role_hours_idx'),
+        ]
\ No newline at end of file
@@ -1,4 +1,5 @@
 from django.urls import path
+from django.views.decorators.cache import never_cache
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -13,10 +14,11 @@ class EmailTokenObtainPairView(TokenObtainPairView):
 
 
 urlpatterns = [
-    # Authentication endpoints
-    path("auth/register/", register, name="register"),
-    path("auth/token/", EmailTokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("auth/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    # Authentication endpoints (never_cache: token responses are no-store, which also
+    # keeps CompressionMiddleware from compressing them)
+    path("auth/register/", never_cache(register), name="register"),
+    path("auth/token/", never_cache(EmailTokenObtainPairView.as_view()), name="token_obtain_pair"),
+    path("auth/token/refresh/", never_cache(TokenRefreshView.as_view()), name="token_refresh"),
     
     # User profile endpoints
     path("me/", me, name="me"),
@@ -6,4 +6,8 @@ pip install -r requirements.txt
 
 python manage.py collectstatic --no-input
 python manage.py migrate
+python manage.py createcachetable
 python manage.py create_admin
+python manage.py publish_public_snapshots
+python manage.py rebuild_task_rollups
+python manage.py verify_project_counters --repair
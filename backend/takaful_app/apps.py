@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TakafulAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'takaful_app'
+
+    def ready(self):
+        import takaful_app.signals
@@ -0,0 +1,86 @@
+"""
+Versioned cache for public (anonymous) endpoint payloads and admin
+dashboard sections.
+Entries are keyed by the DataVersion of every model they depend on; model
+signals bump those versions, so a changed model makes the old entries
+unreachable immediately and reads never return stale data.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .versioning import get_versions
+
+
+def _cache_key(prefix, name, version_keys, versions, params):
+    return ':'.join(
+        [prefix, name]
+        + [str(param) for param in params]
+        + [f'{version_key}{versions[version_key]}' for version_key in version_keys]
+    )
+
+
+def _timeout():
+    return getattr(settings, 'PUBLIC_CACHE_TIMEOUT', 3600)
+
+
+def cached_payload(name, version_keys, compute, *params):
+    """
+    Return compute() through the cache.
+    name identifies the endpoint, version_keys the DataVersion keys the
+    payload depends on and params any request parameters that change it.
+    """
+    versions = dict(zip(version_keys, get_versions(*version_keys)))
+    key = _cache_key('public', name, version_keys, versions, params)
+
+    payload = cache.get(key)
+    if payload is None:
+        payload = compute()
+        cache.set(key, payload, _timeout())
+    return payload
+
+
+def cached_sections(prefix, sections):
+    """
+    Resolve several independently versioned payloads together.
+    sections is a list of (name, version_keys, compute, params); returns
+    {name: payload}. All versions are read in one query and all entries in
+    one cache round trip, and only the sections whose versions moved are
+    recomputed.
+    """
+    version_keys = sorted({key for _, keys, _, _ in sections for key in keys})
+    versions = dict(zip(version_keys, get_versions(*version_keys)))
+    keys = {
+        name: _cache_key(prefix, name, section_keys, versions, params)
+        for name, section_keys, _, params in sections
+    }
+
+    cached = cache.get_many(keys.values())
+    payloads, missing = {}, {}
+    for name, _, compute, _ in sections:
+        if keys[name] in cached:
+            payloads[name] = cached[keys[name]]
+        else:
+            payloads[name] = missing[keys[name]] = compute()
+
+    if missing:
+        cache.set_many(missing, _timeout())
+    return payloads
+
+
+def cached_count(queryset, version_keys):
+    """
+    queryset.count() through the cache, keyed by the query's SQL and the
+    DataVersion keys of the models it reads.
+    """
+    sql = str(queryset.order_by().query)
+    versions = dict(zip(version_keys, get_versions(*version_keys)))
+    key = _cache_key('count', queryset.model._meta.label_lower, version_keys, versions,
+                     [hashlib.sha1(sql.encode('utf-8')).hexdigest()])
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, _timeout())
+    return count
@@ -0,0 +1,192 @@
+"""
+Response compression for the API.
+CompressionMiddleware negotiates brotli (when the optional `brotli` package
+is installed) or gzip from Accept-Encoding and skips small bodies. Compressed
+bodies are kept in a bounded in-process LRU keyed by ETag (or a body hash),
+so hot payloads - cached catalog/statistics responses - are compressed once
+per worker instead of on every request. Responses that set cookies or are
+marked no-store (the token views) are left uncompressed, so their secrets
+cannot be recovered through compressed sizes (BREACH).
+
+Settings:
+    COMPRESSION_MIN_LENGTH   smallest body worth compressing (bytes)
+    COMPRESSION_CACHE_BYTES  memory budget of the compressed-body cache
+"""
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+DEFAULT_MIN_LENGTH = 1024
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript')
+
+
+def available_encodings():
+    """Encodings this process can produce, most preferred first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def negotiate_encoding(accept_encoding, available=None):
+    """
+    Pick the best encoding from an Accept-Encoding header (None = identity).
+    Honours q=0 and prefers br over gzip at equal quality. available limits
+    the candidates (default: available_encodings()).
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available or available_encodings():
+        quality = accepted.get(encoding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    """Compress an iterable of byte chunks incrementally"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    # wbits=31 emits a gzip header/trailer
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CompressedBodyCache:
+    """Thread-safe LRU of compressed bodies bounded by total size in bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+body_cache = CompressedBodyCache(getattr(settings, 'COMPRESSION_CACHE_BYTES', DEFAULT_CACHE_BYTES))
+
+
+def compressed_body(content, encoding, etag=None):
+    """Compressed content, reused from the cache when the same body was compressed before"""
+    key = (encoding, etag or hashlib.sha1(content).hexdigest())
+    data = body_cache.get(key)
+    if data is None:
+        data = compress(content, encoding)
+        body_cache.set(key, data)
+    return data
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli response compression with a compressed-body cache.
+    Place it right after CorsMiddleware so it sees the final response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_length = getattr(settings, 'COMPRESSION_MIN_LENGTH', DEFAULT_MIN_LENGTH)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.has_header('Content-Encoding') or response.status_code != 200:
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        cache_control = response.get('Cache-Control', '')
+        if 'no-transform' in cache_control:
+            return response
+        # Credentials: cookies and no-store (token) responses
+        if response.cookies or 'no-store' in cache_control:
+            return response
+
+        patch_vary_headers(response, ['Accept-Encoding'])
+
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            if len(response.content) < self.min_length:
+                return response
+            etag = response.get('ETag')
+            response.content = compressed_body(response.content, encoding, etag)
+            response['Content-Length'] = str(len(response.content))
+
+        # The body differs from the identity representation
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,42 @@
+"""
+Conditional GET (ETag / Last-Modified) support for public catalog endpoints.
+The validators come from one cheap aggregate over the endpoint's queryset,
+so a matching If-None-Match / If-Modified-Since is answered with 304 before
+anything is serialized.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def conditional_get(request, queryset, build_response, key='', timestamp_field='updated_at'):
+    """
+    Return a 304 when the client's cached copy of queryset is still current,
+    otherwise build_response() with ETag and Last-Modified headers attached.
+    key distinguishes payloads built from the same queryset (e.g. query params).
+    """
+    state = queryset.order_by().aggregate(last_modified=Max(timestamp_field), count=Count('id'))
+    last_modified = state['last_modified']
+
+    if last_modified is None:
+        # Nothing to validate against (empty result) - always send the body
+        return build_response()
+
+    etag = '"%s"' % hashlib.sha1(
+        f"{request.path}|{key}|{state['count']}|{last_modified.isoformat()}".encode('utf-8')
+    ).hexdigest()
+    last_modified_ts = int(last_modified.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+    if response is None:
+        response = build_response()
+        if response.status_code != 200:
+            return response
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified_ts)
+    # Let browsers and the CDN keep the body but revalidate on every use
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
@@ -0,0 +1,83 @@
+"""
+Sections of the admin main page, shared by their standalone endpoints and
+by the composite /api/admin/dashboard/ endpoint.
+Each dashboard section is cached on its own DataVersion keys, so a project
+edit only recomputes the project sections and a new volunteer only the
+volunteer ones.
+"""
+from django.contrib.auth.models import User
+from django.db.models import Case, IntegerField, Value, When
+
+from .cache import cached_sections
+from .models import Project
+from .serializers import ProjectSerializer, VolunteerRequestSerializer
+from .stats import project_totals, volunteer_totals
+from .versioning import PROJECTS, VOLUNTEERS, VOLUNTEER_REQUESTS
+
+
+DEFAULT_REQUESTS_LIMIT = 4
+
+# Arabic dropdown labels -> Project.status
+PROJECT_STATUS_MAP = {
+    'نشط': 'ACTIVE',
+    'متوقف': 'PLANNED',
+    'مكتمل': 'COMPLETED',
+    'ملغي': 'CANCELLED',
+}
+
+
+def project_stats():
+    totals = project_totals()  # Single aggregate query
+    return {
+        'total_donations': float(totals['total_donations']),
+        'total_beneficiaries': totals['total_beneficiaries'],
+        'active_projects': totals['active_projects'],
+        'completed_projects': totals['completed_projects'],
+        'total_projects': totals['total_projects'],
+    }
+
+
+def pending_volunteer_requests(limit=None):
+    """Serialized pending (not approved) volunteers, newest first"""
+    pending = User.objects.filter(
+        profile__role='user',
+        profile__is_approved=False
+    ).select_related('profile').order_by('-date_joined')
+    if limit is not None:
+        pending = pending[:limit]
+    return VolunteerRequestSerializer(pending, many=True).data
+
+
+def active_project(status_filter=None, project_id=None):
+    """
+    Serialized project for the bottom section of the main page, or None.
+    A project_id that exists wins; otherwise the most recently updated
+    project with status_filter; otherwise the most recently updated project,
+    preferring active ones.
+    """
+    if project_id:
+        project = Project.objects.filter(id=project_id).first()
+        if project:
+            return ProjectSerializer(project).data
+
+    projects = Project.objects.all()
+    ordering = ['-updated_at']
+    if status_filter:
+        projects = projects.filter(status=PROJECT_STATUS_MAP.get(status_filter, status_filter))
+    else:
+        ordering.insert(0, Case(When(status='ACTIVE', then=Value(0)), default=Value(1), output_field=IntegerField()))
+
+    project = projects.order_by(*ordering).first()
+    return ProjectSerializer(project).data if project else None
+
+
+def dashboard_sections(requests_limit=DEFAULT_REQUESTS_LIMIT, status_filter=None, project_id=None):
+    """Every admin main page section, each served from its own cache entry"""
+    return cached_sections('dashboard', [
+        ('stats', [PROJECTS], project_stats, []),
+        ('volunteer_stats', [VOLUNTEERS], volunteer_totals, []),
+        ('volunteer_requests', [VOLUNTEER_REQUESTS],
+         lambda: {'results': pending_volunteer_requests(requests_limit)}, [requests_limit]),
+        ('active_project', [PROJECTS],
+         lambda: active_project(status_filter, project_id), [status_filter or '', project_id or '']),
+    ])
@@ -0,0 +1,260 @@
+"""
+Live admin dashboard events over Server-Sent Events.
+Signals record compact deltas (new pending volunteer, new application,
+completed task, new water supply request) as AdminEvent rows, the log
+shared by every worker. Each process runs one EventBroker: a single
+background thread polls the log for new rows (one indexed query per
+POLL_INTERVAL however many admins are connected) and wakes that process's
+streams. Events written by the same process wake the poller as soon as
+their transaction commits instead of waiting for the next poll.
+
+Under ASGI streams are async generators and hold no thread. Under WSGI a
+request is a short poll instead: it returns the events after Last-Event-ID
+straight from the log and closes, and EventSource reconnects after
+WSGI_RETRY seconds, so no worker thread is held. publish() prunes rows older
+than RETENTION_HOURS at most once per PRUNE_INTERVAL per process.
+
+Note: the log is tailed by id, so an event whose transaction commits after
+a later id was already polled is skipped. Events are refresh hints for the
+dashboard, not an audit log.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+
+from .models import AdminEvent
+
+
+VOLUNTEER_PENDING = 'volunteer_pending'
+PROJECT_APPLICATION = 'project_application'
+SERVICE_APPLICATION = 'service_application'
+TASK_COMPLETED = 'task_completed'
+WATER_SUPPLY_REQUEST = 'water_supply_request'
+
+DEFAULTS = {'POLL_INTERVAL': 1.0, 'HEARTBEAT': 15, 'WSGI_RETRY': 5, 'RETENTION_HOURS': 24}
+
+# Events kept in memory per process; streams further behind read the log
+BUFFER_SIZE = 500
+PRUNE_INTERVAL = 3600
+
+RETRY = b'retry: 1000\n\n'
+PING = b': ping\n\n'
+
+
+def events_settings():
+    return {**DEFAULTS, **getattr(settings, 'ADMIN_EVENTS', {})}
+
+
+_last_prune = None  # time.monotonic() of this process's last prune
+
+
+def publish(kind, **payload):
+    """Record an event; streams of this process are woken once it commits"""
+    global _last_prune
+    AdminEvent.objects.create(kind=kind, payload=payload)
+    transaction.on_commit(broker.wake)
+
+    if _last_prune is None or time.monotonic() - _last_prune > PRUNE_INTERVAL:
+        _last_prune = time.monotonic()
+        transaction.on_commit(prune)
+
+
+def format_event(event_id, kind, payload):
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+    return f'id: {event_id}\nevent: {kind}\ndata: {data}\n\n'.encode('utf-8')
+
+
+def read_log(last_id):
+    """(id, message) pairs after last_id, straight from the AdminEvent table"""
+    rows = AdminEvent.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'kind', 'payload')
+    return [(row[0], format_event(*row)) for row in rows[:BUFFER_SIZE]]
+
+
+def prune():
+    cutoff = timezone.now() - timedelta(hours=events_settings()['RETENTION_HOURS'])
+    AdminEvent.objects.filter(created_at__lt=cutoff).delete()
+
+
+class Subscription:
+    """One stream's cursor into the broker"""
+
+    def __init__(self, broker, last_id):
+        self.broker = broker
+        self.last_id = last_id
+        self._loop = None
+        self._async_ready = None
+
+    def bind_loop(self):
+        """Receive notifications on the running event loop"""
+        self._loop = asyncio.get_running_loop()
+        self._async_ready = asyncio.Event()
+
+    def notify(self):
+        # Called from the poller thread
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._async_ready.set)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    def _advance(self, events):
+        if events:
+            self.last_id = events[-1][0]
+        return [message for _, message in events]
+
+    async def pending_async(self):
+        events = self.broker.buffered_after(self.last_id)
+        if events is None:
+            events = await sync_to_async(read_log)(self.last_id)
+        return self._advance(events)
+
+    async def wait_async(self, timeout):
+        try:
+            await asyncio.wait_for(self._async_ready.wait(), timeout)
+            notified = True
+        except TimeoutError:
+            notified = False
+        self._async_ready.clear()
+        return notified
+
+
+class EventBroker:
+    """
+    Per-process fan-out of the AdminEvent log. The poller thread starts with
+    the first subscriber and stops after the last one leaves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffer = deque()  # (id, message), oldest first
+        self._floor = 0  # Every event with a larger id is in the buffer
+        self._subscribers = set()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def _latest_id(self):
+        return self._buffer[-1][0] if self._buffer else self._floor
+
+    def subscribe(self, last_id=None):
+        """New subscription after last_id (default: from now on)"""
+        with self._lock:
+            if self._thread is None:
+                self._floor = AdminEvent.objects.aggregate(latest=Max('id'))['latest'] or 0
+                self._buffer.clear()
+                self._thread = threading.Thread(target=self._run, name='admin-events', daemon=True)
+                self._thread.start()
+            subscription = Subscription(self, self._latest_id() if last_id is None else last_id)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def wake(self):
+        self._wakeup.set()
+
+    def buffered_after(self, last_id):
+        """(id, message) pairs after last_id, or None if they are no longer buffered"""
+        with self._lock:
+            if last_id < self._floor:
+                return None
+            return [event for event in self._buffer if event[0] > last_id]
+
+    def _poll(self):
+        with self._lock:
+            latest = self._latest_id()
+        events = read_log(latest)
+        if not events:
+            return
+
+        with self._lock:
+            self._buffer.extend(events)
+            while len(self._buffer) > BUFFER_SIZE:
+                self._floor = self._buffer.popleft()[0]
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.notify()
+
+        if len(events) == BUFFER_SIZE:
+            self.wake()  # More rows are waiting
+
+    def _run(self):
+        try:
+            while True:
+                self._wakeup.wait(events_settings()['POLL_INTERVAL'])
+                self._wakeup.clear()
+                with self._lock:
+                    if not self._subscribers:
+                        self._thread = None
+                        return
+                try:
+                    self._poll()
+                except Exception as e:
+                    print(f"⚠️ Admin event poll failed: {e}")
+        finally:
+            connections.close_all()  # This thread's connections
+
+
+broker = EventBroker()
+
+
+def poll(last_id):
+    """
+    Sync (WSGI) short poll: the events after last_id, then the response ends.
+    A first request (no last_id) only records the current position as the
+    event id, so the next poll starts from there.
+    """
+    messages = [f'retry: {int(events_settings()["WSGI_RETRY"] * 1000)}\n\n'.encode('utf-8')]
+    if last_id is None:
+        latest = AdminEvent.objects.aggregate(latest=Max('id'))['latest'] or 0
+        messages.append(f'id: {latest}\n\n'.encode('utf-8'))
+    else:
+        messages.extend(message for _, message in read_log(last_id))
+    return messages
+
+
+async def stream_async(subscription):
+    """Async (ASGI) stream; runs until the client disconnects"""
+    heartbeat = events_settings()['HEARTBEAT']
+    subscription.bind_loop()
+    try:
+        yield RETRY
+        while True:
+            messages = await subscription.pending_async()
+            if messages:
+                yield b''.join(messages)
+                continue
+            if not await subscription.wait_async(heartbeat):
+                yield PING
+    finally:
+        broker.unsubscribe(subscription)
+
+
+def open_stream(request, last_id=None):
+    """Streaming content for request: a long-lived stream over ASGI, a short poll over WSGI"""
+    if isinstance(request, ASGIRequest):
+        return stream_async(broker.subscribe(last_id))
+    return poll(last_id)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Accepts `Accept: text/event-stream`; error responses are rendered as JSON"""
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, ensure_ascii=False).encode('utf-8')
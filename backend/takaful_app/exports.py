@@ -0,0 +1,216 @@
+"""
+XLSX / CSV export of generated AdminReports.
+Rows are parsed one at a time (ijson) from the compressed report_data column
+while it is being decompressed, so the decoded report is never held in
+memory, and written with a streaming csv writer (CSV) or openpyxl's
+write-only mode (XLSX).
+
+Remaining limits: the compressed column itself is read in one piece, and an
+XLSX file (a zip archive) is assembled in a temporary file on disk before
+its first byte is sent.
+"""
+import csv
+import json
+import tempfile
+import zlib
+
+import ijson
+import openpyxl
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+from .reports import PROJECT_STATUS_DISPLAY
+
+
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+class _ExportRenderer(BaseRenderer):
+    """
+    Lets DRF accept ?format=xlsx|csv on export views, which return their own
+    streamed response. Anything DRF renders itself (auth/404 errors) is
+    emitted as JSON.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = 'application/json'
+        return json.dumps(data, ensure_ascii=False, cls=DjangoJSONEncoder).encode('utf-8')
+
+
+class XLSXRenderer(_ExportRenderer):
+    media_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    format = 'xlsx'
+    charset = None
+    render_style = 'binary'
+
+
+class CSVRenderer(_ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+# ============================================================================
+# SHEETS
+# ============================================================================
+def _project_rows(projects):
+    yield [
+        'الرقم', 'اسم المشروع', 'الفئة', 'الحالة', 'نسبة الإنجاز', 'عدد المتطوعين',
+        'المهام المكتملة', 'إجمالي المهام', 'المستفيدون', 'التبرعات (ريال)',
+        'تاريخ البدء', 'تاريخ الانتهاء',
+    ]
+    for index, project in enumerate(projects, 1):
+        yield [
+            index,
+            project.get('title'),
+            project.get('category'),
+            PROJECT_STATUS_DISPLAY.get(project.get('status'), project.get('status')),
+            project.get('progress'),
+            project.get('volunteers_assigned'),
+            project.get('tasks_completed'),
+            project.get('tasks_total'),
+            project.get('beneficiaries'),
+            project.get('donation_amount'),
+            project.get('start_date'),
+            project.get('end_date'),
+        ]
+
+
+def _volunteer_rows(volunteers):
+    yield [
+        'الرقم', 'اسم المتطوع', 'البريد الإلكتروني', 'الجوال', 'المدينة', 'إجمالي الساعات',
+        'المهام المكتملة', 'المهام الحالية', 'التقييم', 'تاريخ الانضمام', 'المشاريع الحالية',
+    ]
+    for index, volunteer in enumerate(volunteers, 1):
+        yield [
+            index,
+            volunteer.get('name'),
+            volunteer.get('email'),
+            volunteer.get('phone'),
+            volunteer.get('city'),
+            volunteer.get('total_hours'),
+            volunteer.get('tasks_completed'),
+            volunteer.get('tasks_in_progress'),
+            volunteer.get('rating'),
+            volunteer.get('join_date'),
+            '، '.join(volunteer.get('current_projects') or []),
+        ]
+
+
+def _task_rows(sections):
+    # A single item: the tasks counters (its overdue list holds at most 10 rows)
+    tasks = next(sections, {})
+    by_status = tasks.get('by_status', {})
+    by_priority = tasks.get('by_priority', {})
+
+    yield ['المؤشر', 'القيمة']
+    yield ['قيد التنفيذ', by_status.get('in_progress', 0)]
+    yield ['في الانتظار', by_status.get('waiting', 0)]
+    yield ['مكتملة', by_status.get('completed', 0)]
+    yield ['معلقة', by_status.get('on_hold', 0)]
+    yield ['أولوية عالية', by_priority.get('high', 0)]
+    yield ['أولوية متوسطة', by_priority.get('medium', 0)]
+    yield ['أولوية منخفضة', by_priority.get('low', 0)]
+    yield ['نسبة الإنجاز', tasks.get('completion_rate', 0)]
+
+
+def _overdue_rows(tasks):
+    yield ['الرقم', 'المهمة', 'المشروع', 'المتطوع', 'تاريخ الاستحقاق', 'الحالة', 'الأولوية']
+    for task in tasks:
+        yield [
+            task.get('id'),
+            task.get('title'),
+            task.get('project'),
+            task.get('volunteer'),
+            task.get('due_date'),
+            task.get('status'),
+            task.get('priority'),
+        ]
+
+
+# key -> (sheet title, ijson prefix of its items in report_data, row generator)
+SHEETS = {
+    'projects': ('المشاريع', 'projects.list.item', _project_rows),
+    'volunteers': ('المتطوعون', 'volunteers.list.item', _volunteer_rows),
+    'tasks': ('المهام', 'tasks', _task_rows),
+    'overdue': ('المهام المتأخرة', 'tasks.overdue.item', _overdue_rows),
+}
+
+
+class _DecompressedReader:
+    """Read-only file over a zlib blob, decompressed as it is read"""
+
+    def __init__(self, data):
+        self._data = memoryview(bytes(data))
+        self._offset = 0
+        self._decompressor = zlib.decompressobj()
+
+    def read(self, size=-1):
+        if size == 0:
+            return b''  # ijson probes the file type with read(0)
+        max_length = max(size, 0)
+        while True:
+            if self._decompressor.unconsumed_tail:
+                chunk = self._decompressor.decompress(self._decompressor.unconsumed_tail, max_length)
+            elif self._offset < len(self._data):
+                chunk = self._decompressor.decompress(self._data[self._offset:self._offset + EXPORT_CHUNK_SIZE], max_length)
+                self._offset += EXPORT_CHUNK_SIZE
+            else:
+                return self._decompressor.flush()
+            if chunk:
+                return chunk
+
+
+def sheet_rows(compressed_report_data, sheet):
+    """Rows of one sheet, parsed from the compressed report_data column"""
+    _, prefix, rows = SHEETS[sheet]
+    if compressed_report_data is None:
+        return rows(iter(()))
+    items = ijson.items(_DecompressedReader(compressed_report_data), prefix, use_float=True)
+    return rows(iter(items))
+
+
+# ============================================================================
+# WRITERS
+# ============================================================================
+def _read_chunks(file_obj):
+    try:
+        while True:
+            chunk = file_obj.read(EXPORT_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file_obj.close()
+
+
+def stream_xlsx(compressed_report_data):
+    """
+    Write every sheet with a write-only workbook (openpyxl spools rows to
+    disk) into a temporary file and yield the finished file in chunks.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet, (title, _, _) in SHEETS.items():
+        worksheet = workbook.create_sheet(title=title)
+        for row in sheet_rows(compressed_report_data, sheet):
+            worksheet.append(row)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return _read_chunks(output)
+
+
+class _Echo:
+    """File-like object whose write() returns the value instead of storing it"""
+    def write(self, value):
+        return value
+
+
+def stream_csv(compressed_report_data, sheet):
+    """Yield one sheet as UTF-8 CSV (with BOM so Excel shows Arabic correctly)"""
+    writer = csv.writer(_Echo())
+
+    yield '\ufeff'.encode('utf-8')
+    for row in sheet_rows(compressed_report_data, sheet):
+        yield writer.writerow(row).encode('utf-8')
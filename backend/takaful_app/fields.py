@@ -0,0 +1,52 @@
+"""
+Custom model fields for takaful_app.
+"""
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class CompressedJSONField(models.BinaryField):
+    """
+    JSON value stored as zlib-compressed UTF-8 bytes
+    Reads and writes plain Python objects, like JSONField, but keeps large
+    payloads (e.g. AdminReport.report_data) small on disk and on the wire
+    from the database. Database-side JSON lookups are not supported.
+    """
+    compression_level = 6
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('editable', True)
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def compress(cls, value):
+        payload = json.dumps(value, ensure_ascii=False, cls=DjangoJSONEncoder).encode('utf-8')
+        return zlib.compress(payload, cls.compression_level)
+
+    @staticmethod
+    def decompress(data):
+        return json.loads(zlib.decompress(bytes(data)).decode('utf-8'))
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return self.decompress(value)
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return self.decompress(value)
+        if isinstance(value, str):
+            # Serialized form produced by value_to_string (fixtures)
+            return json.loads(value)
+        return value
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return None
+        return connection.Database.Binary(self.compress(value))
+
+    def value_to_string(self, obj):
+        return json.dumps(self.value_from_object(obj), ensure_ascii=False, cls=DjangoJSONEncoder)
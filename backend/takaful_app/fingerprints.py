@@ -0,0 +1,64 @@
+"""
+Duplicate detection fingerprints for WaterSupplyRequest.
+The fingerprint is a sha256 over the normalized mobile number, mosque name,
+neighborhood and location link, so resubmissions that differ only in
+spelling variants (alef forms, ta marbuta, diacritics, spacing), phone
+formatting or URL noise map to the same indexed value.
+"""
+import hashlib
+import re
+import unicodedata
+from urllib.parse import urlsplit
+
+
+# Harakat, superscript alef, Quranic marks and tatweel
+_DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+_ARABIC_VARIANTS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ة': 'ه',
+    'ى': 'ي',
+    'ؤ': 'و', 'ئ': 'ي',
+})
+_DIGITS = str.maketrans('٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹', '01234567890123456789')
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize_arabic(text):
+    """Lowercased text with Arabic spelling variants, diacritics and punctuation folded"""
+    text = unicodedata.normalize('NFKC', text or '').translate(_DIGITS)
+    text = _DIACRITICS.sub('', text).translate(_ARABIC_VARIANTS)
+    return ' '.join(_NON_WORD.sub(' ', text.casefold()).split())
+
+
+def normalize_mobile(number):
+    """Local Saudi format: 00966 5x / +966 5x / 5x -> 05x"""
+    digits = re.sub(r'\D', '', (number or '').translate(_DIGITS))
+    if digits.startswith('00966'):
+        digits = digits[5:]
+    elif digits.startswith('966'):
+        digits = digits[3:]
+    if len(digits) == 9 and digits.startswith('5'):
+        digits = '0' + digits
+    return digits
+
+
+def normalize_link(url):
+    """Host + path + query without scheme, www., case in the host or trailing slashes"""
+    parts = urlsplit((url or '').strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    link = host + parts.path.rstrip('/')
+    if parts.query:
+        link += '?' + parts.query
+    return link
+
+
+def water_request_fingerprint(mobile_number, mosque_name, neighborhood, location_link):
+    key = '|'.join([
+        normalize_mobile(mobile_number),
+        normalize_arabic(mosque_name),
+        normalize_arabic(neighborhood),
+        normalize_link(location_link),
+    ])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
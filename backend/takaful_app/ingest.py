@@ -0,0 +1,154 @@
+"""
+Buffered ingestion of public form submissions.
+With PUBLIC_INGEST_MODE = 'spool', the public POST endpoints validate as usual
+but, instead of one INSERT per request, append the validated payload to a
+local append-only JSONL spool (fsync'ed before responding). The
+flush_submission_spool command moves the spool aside and bulk_creates it in
+batches. Every submission gets a submission_ref UUID up front, returned to
+the client as a stable reference in both modes. Re-flushing a segment is
+safe: rows whose submission_ref already exists are skipped.
+
+Note: created_at is set when the spool is flushed, not when it was received.
+"""
+import json
+import os
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from .models import Suggestion, ServiceRequest, WaterSupplyRequest
+from .versioning import bump_version, model_key
+from . import events
+
+
+SPOOL_MODELS = {
+    'suggestion': Suggestion,
+    'service_request': ServiceRequest,
+    'water_supply_request': WaterSupplyRequest,
+}
+
+ACTIVE_SEGMENT = 'spool.jsonl'
+FLUSHING_SUFFIX = '.flushing'
+
+
+def spool_enabled():
+    return getattr(settings, 'PUBLIC_INGEST_MODE', 'direct') == 'spool'
+
+
+def spool_dir():
+    return Path(getattr(settings, 'PUBLIC_INGEST_SPOOL_DIR', settings.BASE_DIR / 'spool'))
+
+
+def ingest_submission(kind, serializer):
+    """
+    Store a validated submission. Returns (submission_ref, instance); instance
+    is None when the submission was spooled for a later flush.
+    """
+    reference = uuid.uuid4()
+    if not spool_enabled():
+        return reference, serializer.save(submission_ref=reference)
+
+    data = {}
+    for name, value in serializer.validated_data.items():
+        if isinstance(value, models.Model):
+            data[f'{name}_id'] = value.pk
+        else:
+            data[name] = value
+
+    _append({'kind': kind, 'ref': str(reference), 'data': data})
+    return reference, None
+
+
+def _append(record):
+    import fcntl
+
+    directory = spool_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / ACTIVE_SEGMENT
+    line = (json.dumps(record, ensure_ascii=False, cls=DjangoJSONEncoder) + '\n').encode('utf-8')
+
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            # The flusher may have rotated the segment between open() and flock()
+            try:
+                current = os.fstat(fd).st_ino == os.stat(path).st_ino
+            except FileNotFoundError:
+                current = False
+            if current:
+                os.write(fd, line)
+                os.fsync(fd)
+                return
+        finally:
+            os.close(fd)
+
+
+def _read_segment(path):
+    """Parse a rotated segment once in-flight writers released it"""
+    import fcntl
+
+    records, skipped = [], 0
+    with open(path, 'rb') as segment:
+        fcntl.flock(segment.fileno(), fcntl.LOCK_EX)
+        for line in segment:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                skipped += 1  # Torn last line after a crash
+    return records, skipped
+
+
+def flush(batch_size=500):
+    """
+    Rotate the active segment and bulk_create every pending segment.
+    Returns ({kind: rows submitted}, skipped lines), or None if another
+    flusher holds the lock.
+    """
+    import fcntl
+
+    directory = spool_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    with open(directory / 'flush.lock', 'w') as lock:
+        try:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return None
+
+        active = directory / ACTIVE_SEGMENT
+        if active.exists():
+            os.replace(active, directory / f'spool.{time.time_ns()}{FLUSHING_SUFFIX}')
+
+        flushed, skipped = defaultdict(int), 0
+        # Includes segments left behind by an interrupted flush
+        for path in sorted(directory.glob(f'*{FLUSHING_SUFFIX}')):
+            records, segment_skipped = _read_segment(path)
+            skipped += segment_skipped
+
+            by_kind = defaultdict(list)
+            for record in records:
+                instance = SPOOL_MODELS[record['kind']](submission_ref=record['ref'], **record['data'])
+                if hasattr(instance, 'update_fingerprint'):
+                    instance.update_fingerprint()  # bulk_create skips save()
+                by_kind[record['kind']].append(instance)
+
+            for kind, objects in by_kind.items():
+                SPOOL_MODELS[kind].objects.bulk_create(objects, batch_size=batch_size, ignore_conflicts=True)
+                flushed[kind] += len(objects)
+                if kind == 'water_supply_request':
+                    # bulk_create skips the post_save event
+                    events.publish(events.WATER_SUPPLY_REQUEST, id=None, count=len(objects))
+
+            path.unlink()
+
+        # bulk_create skips the post_save version bumps
+        for kind in flushed:
+            bump_version(model_key(SPOOL_MODELS[kind]))
+
+    return dict(flushed), skipped
@@ -0,0 +1,120 @@
+"""
+Benchmark for CompressionMiddleware: response bytes and CPU time per request
+for identity, compressed-per-request and cached compressed bodies.
+Payloads are synthetic but shaped like our largest responses (volunteer
+list, report detail, project catalog); --rows scales them.
+
+Usage:
+    python manage.py benchmark_compression
+    python manage.py benchmark_compression --rows 2000 --requests 500
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from takaful_app import compression
+
+
+def volunteer_list(rows):
+    return [
+        {
+            'id': i,
+            'name': f'متطوع رقم {i}',
+            'email': f'volunteer{i}@takaful.com',
+            'phone': f'05{i:08d}',
+            'city': ['الرياض', 'جدة', 'مكة', 'الدمام'][i % 4],
+            'skills': ['تنظيم', 'تصميم', 'تسويق'][: i % 3 + 1],
+            'total_volunteer_hours': i * 3 % 200,
+            'rating': round(3 + (i % 20) / 10, 1),
+            'is_approved': i % 5 != 0,
+        }
+        for i in range(rows)
+    ]
+
+
+def project_catalog(rows):
+    return [
+        {
+            'id': i,
+            'title': f'مشروع تطوعي {i}',
+            'desc': 'مشروع يهدف إلى خدمة المجتمع المحلي وتمكين المتطوعين. ' * 4,
+            'category': ['أساسي', 'مجتمعي', 'مؤسسي'][i % 3],
+            'implementation_requirements': 'فريق عمل، أدوات، تنسيق مع الجهات. ' * 3,
+            'project_goals': 'رفع الوعي وزيادة المشاركة. ' * 3,
+            'status': 'ACTIVE',
+            'status_display': 'نشط',
+            'progress': i % 100,
+            'beneficiaries': i * 7,
+            'donation_amount': f'{i * 150}.00',
+            'created_at': '2026-01-10T09:30:00Z',
+        }
+        for i in range(rows // 4)
+    ]
+
+
+def report_detail(rows):
+    return {
+        'id': 1,
+        'title': 'تقرير شامل - 2026-01-10',
+        'report_data': {
+            'projects': {'total': rows // 4, 'list': project_catalog(rows)},
+            'volunteers': {'total': rows, 'list': volunteer_list(rows)},
+        },
+    }
+
+
+PAYLOADS = {
+    'volunteers': volunteer_list,
+    'report-detail': report_detail,
+    'projects': project_catalog,
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure response bytes and CPU per request with and without compression'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per synthetic payload')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        requests = options['requests']
+        factory = RequestFactory()
+
+        scenarios = [('identity', None, False)]
+        for encoding in compression.available_encodings():
+            scenarios.append((f'{encoding} (per request)', encoding, False))
+            scenarios.append((f'{encoding} (cached)', encoding, True))
+        if compression.brotli is None:
+            self.stdout.write(self.style.WARNING('brotli is not installed - gzip only'))
+
+        self.stdout.write(f'{"payload":<15}{"scenario":<22}{"bytes":>12}{"cpu ms/req":>12}')
+        for name, build in PAYLOADS.items():
+            body = json.dumps(build(rows), ensure_ascii=False).encode('utf-8')
+
+            def get_response(request):
+                response = HttpResponse(body, content_type='application/json')
+                response['ETag'] = f'"{name}"'
+                return response
+
+            middleware = compression.CompressionMiddleware(get_response)
+            for label, encoding, cached in scenarios:
+                request = factory.get('/', HTTP_ACCEPT_ENCODING=encoding or 'identity')
+                compression.body_cache.clear()
+                if cached:
+                    middleware(request)  # warm the cache
+
+                started = time.process_time()
+                for _ in range(requests):
+                    if not cached:
+                        compression.body_cache.clear()
+                    response = middleware(request)
+                cpu_ms = (time.process_time() - started) * 1000 / requests
+
+                self.stdout.write(f'{name:<15}{label:<22}{len(response.content):>12,}{cpu_ms:>12.3f}')
+
+        compression.body_cache.clear()
@@ -0,0 +1,67 @@
+"""
+Benchmark for the public write throttle: wall-clock cost of one
+TokenBucketThrottle.allow_request() check per storage backend, measured on
+the configured cache and on the ThrottleBucket table.
+Buckets use a dedicated "benchmark" scope, and only the cache keys and rows
+of that scope are removed, so live flood protection and other cache entries
+are left alone.
+
+Usage:
+    python manage.py benchmark_throttle
+    python manage.py benchmark_throttle --requests 5000 --clients 100
+"""
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from rest_framework.request import Request
+
+from takaful_app.models import ThrottleBucket
+from takaful_app.throttling import TokenBucketThrottle
+
+
+class BenchmarkThrottle(TokenBucketThrottle):
+    scope = 'benchmark'
+
+
+def cleanup(keys):
+    cache.delete_many(keys)
+    ThrottleBucket.objects.filter(key__in=keys).delete()
+
+
+class Command(BaseCommand):
+    help = 'Measure the per-request cost of the public write throttle'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Throttle checks per backend')
+        parser.add_argument('--clients', type=int, default=50, help='Distinct client IPs')
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        factory = RequestFactory()
+        addresses = [f'10.0.{i // 256}.{i % 256}' for i in range(options['clients'])]
+        requests = [
+            Request(factory.post('/api/public-suggestions/', REMOTE_ADDR=address))
+            for address in addresses
+        ]
+        keys = [f'throttle:{BenchmarkThrottle.scope}:{address}' for address in addresses]
+
+        self.stdout.write(f'{"backend":<10}{"checks":>8}{"allowed":>9}{"µs/check":>11}')
+        for backend in ('cache', 'db'):
+            config = {'BACKEND': backend, 'SCOPES': {
+                BenchmarkThrottle.scope: {'capacity': 10, 'refill_per_minute': 60},
+            }}
+            with override_settings(PUBLIC_THROTTLE=config):
+                cleanup(keys)
+
+                allowed = 0
+                started = time.perf_counter()
+                for i in range(total):
+                    if BenchmarkThrottle().allow_request(requests[i % len(requests)], None):
+                        allowed += 1
+                elapsed = time.perf_counter() - started
+
+            self.stdout.write(f'{backend:<10}{total:>8}{allowed:>9}{elapsed * 1e6 / total:>11.1f}')
+
+        cleanup(keys)
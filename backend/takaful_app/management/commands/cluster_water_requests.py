@@ -0,0 +1,57 @@
+"""
+Management command that (re)computes WaterSupplyRequest fingerprints and
+clusters existing duplicates: within each fingerprint the oldest request is
+kept as the original and every later one gets duplicate_of pointing to it.
+
+Usage:
+    python manage.py cluster_water_requests
+    python manage.py cluster_water_requests --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from takaful_app.fingerprints import water_request_fingerprint
+from takaful_app.models import WaterSupplyRequest
+
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Backfill water supply request fingerprints and link duplicates to the original request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report clusters without saving')
+
+    def handle(self, *args, **options):
+        requests = WaterSupplyRequest.objects.order_by('created_at', 'id').only(
+            'id', 'mobile_number', 'mosque_name', 'neighborhood', 'location_link',
+            'fingerprint', 'duplicate_of_id',
+        )
+
+        originals = {}
+        cluster_sizes = {}
+        changed = []
+        for request in requests.iterator(chunk_size=BATCH_SIZE):
+            fingerprint = water_request_fingerprint(
+                request.mobile_number, request.mosque_name, request.neighborhood, request.location_link,
+            )
+            original_id = originals.setdefault(fingerprint, request.id)
+            duplicate_of_id = None if original_id == request.id else original_id
+            cluster_sizes[fingerprint] = cluster_sizes.get(fingerprint, 0) + 1
+
+            if (request.fingerprint, request.duplicate_of_id) != (fingerprint, duplicate_of_id):
+                request.fingerprint = fingerprint
+                request.duplicate_of_id = duplicate_of_id
+                changed.append(request)
+
+        clusters = sum(1 for size in cluster_sizes.values() if size > 1)
+        duplicates = sum(size - 1 for size in cluster_sizes.values())
+        self.stdout.write(f'{clusters} duplicate clusters, {duplicates} duplicate requests, {len(changed)} rows to update')
+
+        if options['dry_run'] or not changed:
+            return
+
+        with transaction.atomic():
+            WaterSupplyRequest.objects.bulk_update(changed, ['fingerprint', 'duplicate_of'], batch_size=BATCH_SIZE)
+        self.stdout.write(self.style.SUCCESS(f'Updated {len(changed)} requests'))
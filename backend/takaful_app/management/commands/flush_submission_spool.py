@@ -0,0 +1,43 @@
+"""
+Management command that bulk-inserts spooled public submissions
+(PUBLIC_INGEST_MODE = 'spool', see takaful_app/ingest.py).
+
+Usage:
+    python manage.py flush_submission_spool                  # flush once (cron)
+    python manage.py flush_submission_spool --loop --interval 5
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from takaful_app.ingest import flush
+
+
+class Command(BaseCommand):
+    help = 'Bulk-insert spooled public form submissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows per INSERT')
+        parser.add_argument('--loop', action='store_true', help='Keep flushing instead of exiting')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between flushes with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            self.flush_once(options['batch_size'])
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def flush_once(self, batch_size):
+        result = flush(batch_size)
+        if result is None:
+            self.stdout.write(self.style.WARNING('Another flush is in progress'))
+            return
+
+        flushed, skipped = result
+        for kind, count in flushed.items():
+            self.stdout.write(self.style.SUCCESS(f'{kind}: {count} submissions'))
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'Skipped {skipped} unreadable spool lines'))
@@ -0,0 +1,73 @@
+"""
+Management command that pre-renders the anonymous endpoints to JSON files
+(see takaful_app/snapshots.py), served at /api/public-snapshots/<name>.json.
+Writes only bump the DataVersion counters; stale snapshots fall back to the
+live views until this command republishes them.
+
+Usage:
+    python manage.py publish_public_snapshots                      # deploy step
+    python manage.py publish_public_snapshots public-projects public-home-stats
+    python manage.py publish_public_snapshots --stale              # cron: only missing/stale ones
+    python manage.py publish_public_snapshots --stale --watch      # worker: poll forever
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from takaful_app.snapshots import SNAPSHOT_NAMES, publish, snapshot_dir, stale_names
+
+
+class Command(BaseCommand):
+    help = 'Publish pre-rendered JSON snapshots of the public endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help=f'Snapshots to publish (default: all of {", ".join(SNAPSHOT_NAMES)})',
+        )
+        parser.add_argument(
+            '--stale',
+            action='store_true',
+            help='Only publish snapshots that are missing or older than their data',
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Keep running and republish stale snapshots every --poll-interval seconds',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=30.0,
+            help='Seconds to wait between checks with --watch',
+        )
+
+    def handle(self, *args, **options):
+        names = options.get('names') or SNAPSHOT_NAMES
+        unknown = [name for name in names if name not in SNAPSHOT_NAMES]
+        if unknown:
+            raise CommandError(f'Unknown snapshot(s): {", ".join(unknown)}')
+
+        stale_only = options.get('stale', False) or options.get('watch', False)
+        while True:
+            close_old_connections()
+            self._publish(stale_names(names) if stale_only else names)
+            if not options.get('watch'):
+                break
+            time.sleep(options.get('poll_interval', 30.0))
+
+    def _publish(self, names):
+        if not names:
+            self.stdout.write('All snapshots are current')
+            return
+
+        published = publish(names)
+        for name in names:
+            if name in published:
+                self.stdout.write(self.style.SUCCESS(f'{name}: {published[name]}'))
+            else:
+                self.stdout.write(self.style.WARNING(f'{name}: nothing to publish, snapshot removed'))
+
+        self.stdout.write(f'Snapshots written to {snapshot_dir()}')
@@ -0,0 +1,19 @@
+"""
+Management command that recomputes the yearly/quarterly task rollups
+(VolunteerRollup, PeriodRollup) from completed tasks in bulk. Run after bulk
+imports/updates that bypass model signals, or to repair drift.
+
+Usage:
+    python manage.py rebuild_task_rollups
+"""
+from django.core.management.base import BaseCommand
+
+from takaful_app.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute the yearly/quarterly completed-task rollups'
+
+    def handle(self, *args, **options):
+        periods = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rollups for {periods} periods'))
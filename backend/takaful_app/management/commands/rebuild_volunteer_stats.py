@@ -0,0 +1,21 @@
+"""
+Management command that recomputes the VolunteerStatsSnapshot table from Task
+in bulk. Run after bulk imports/updates that bypass model signals, or to
+repair drift.
+
+Usage:
+    python manage.py rebuild_volunteer_stats
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from takaful_app.volunteer_stats import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute the materialized public volunteer stats from tasks'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {count} volunteers'))
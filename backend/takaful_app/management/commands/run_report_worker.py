@@ -0,0 +1,57 @@
+"""
+Management command that executes queued admin report jobs.
+Polls the ReportJob table, so no external broker is required.
+
+Usage:
+    python manage.py run_report_worker            # run forever
+    python manage.py run_report_worker --once     # drain the queue and exit
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from takaful_app.reports import claim_next_job, run_report_job
+
+
+class Command(BaseCommand):
+    help = 'Run the background worker that generates queued admin reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process all queued jobs and exit instead of polling',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between polls when the queue is empty',
+        )
+
+    def handle(self, *args, **options):
+        once = options.get('once', False)
+        poll_interval = options.get('poll_interval', 2.0)
+
+        self.stdout.write('Report worker started')
+
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+
+            if job is None:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            self.stdout.write(f'Running report job #{job.id}')
+            job = run_report_job(job)
+
+            if job.status == 'done':
+                self.stdout.write(self.style.SUCCESS(f'Report job #{job.id} done (report #{job.report_id})'))
+            else:
+                self.stderr.write(self.style.ERROR(f'Report job #{job.id} failed: {job.error}'))
+
+        self.stdout.write(self.style.SUCCESS('Report queue drained'))
@@ -0,0 +1,146 @@
+"""
+Management command for scheduled (cron) report snapshots.
+Creates the daily AdminReport snapshot through the same builder as
+generate_report, then applies the snapshot retention policy:
+    - daily snapshots are kept for 30 days
+    - one snapshot per week is kept for a year
+    - one snapshot per month is kept forever
+Everything else is deleted in bulk. Manually generated reports are never touched.
+
+Usage (daily cron):
+    python manage.py snapshot_reports
+    python manage.py snapshot_reports --compact      # also strip per-row lists from old snapshots
+    python manage.py snapshot_reports --retention-only
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from takaful_app.models import AdminReport
+from takaful_app.reports import create_report
+
+
+DAILY_DAYS = 30
+WEEKLY_DAYS = 365
+
+
+def snapshots_to_keep(snapshots, now):
+    """
+    Select the snapshot ids the retention policy keeps.
+    snapshots is an iterable of (id, generated_at) ordered newest first, so the
+    newest snapshot of each week/month is the one retained.
+    """
+    keep = set()
+    seen_weeks = set()
+    seen_months = set()
+
+    for snapshot_id, generated_at in snapshots:
+        age = now - generated_at
+        local = timezone.localtime(generated_at)
+
+        if age <= timedelta(days=DAILY_DAYS):
+            keep.add(snapshot_id)
+        elif age <= timedelta(days=WEEKLY_DAYS):
+            week = local.isocalendar()[:2]
+            if week not in seen_weeks:
+                seen_weeks.add(week)
+                keep.add(snapshot_id)
+        else:
+            month = (local.year, local.month)
+            if month not in seen_months:
+                seen_months.add(month)
+                keep.add(snapshot_id)
+
+    return keep
+
+
+def compact_report_data(report_data):
+    """Drop the per-project/per-volunteer lists, keeping the counters"""
+    compacted = dict(report_data)
+    for section in ('projects', 'volunteers'):
+        if isinstance(compacted.get(section), dict):
+            compacted[section] = {k: v for k, v in compacted[section].items() if k != 'list'}
+    compacted['compacted'] = True
+    return compacted
+
+
+class Command(BaseCommand):
+    help = 'Create the daily report snapshot and apply snapshot retention'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--admin',
+            help='Email of the admin the snapshot is attributed to (defaults to the first admin)',
+        )
+        parser.add_argument(
+            '--retention-only',
+            action='store_true',
+            help='Only apply the retention policy, do not create a snapshot',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Create a snapshot even if one already exists for today',
+        )
+        parser.add_argument(
+            '--compact',
+            action='store_true',
+            help='Strip per-row lists from retained snapshots older than the daily window',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+
+        if not options.get('retention_only'):
+            self.create_snapshot(now, options.get('admin'), options.get('force', False))
+
+        self.apply_retention(now, options.get('compact', False))
+
+    def get_admin(self, email):
+        admins = User.objects.filter(profile__role='admin')
+        if email:
+            admins = admins.filter(email=email)
+        admin = admins.order_by('id').first()
+        if admin is None:
+            raise CommandError('No admin user found to attribute the snapshot to')
+        return admin
+
+    def create_snapshot(self, now, admin_email, force):
+        today = timezone.localtime(now).date()
+
+        if not force and AdminReport.objects.filter(is_snapshot=True, generated_at__date=today).exists():
+            self.stdout.write(self.style.WARNING(f'Snapshot for {today} already exists'))
+            return
+
+        report = create_report(
+            self.get_admin(admin_email),
+            title=f"لقطة يومية - {today.isoformat()}",
+            is_snapshot=True,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Created snapshot report #{report.id}'))
+
+    def apply_retention(self, now, compact):
+        snapshots = AdminReport.objects.filter(is_snapshot=True).order_by('-generated_at')
+        keep = snapshots_to_keep(snapshots.values_list('id', 'generated_at').iterator(), now)
+
+        deleted, _ = snapshots.exclude(id__in=keep).delete()
+        self.stdout.write(f'Retention: kept {len(keep)} snapshots, deleted {deleted} rows')
+
+        if not compact:
+            return
+
+        compacted = 0
+        old_snapshots = snapshots.filter(
+            id__in=keep,
+            generated_at__lt=now - timedelta(days=DAILY_DAYS),
+        )
+        for report in old_snapshots.only('id', 'report_data').iterator(chunk_size=50):
+            if report.report_data.get('compacted'):
+                continue
+            report.report_data = compact_report_data(report.report_data)
+            report.save(update_fields=['report_data'])
+            compacted += 1
+
+        self.stdout.write(f'Compacted {compacted} snapshots')
@@ -0,0 +1,37 @@
+"""
+Management command that recounts the denormalized Project task / volunteer
+counters from Task and ProjectAssignment and reports drift, e.g. after bulk
+imports/updates that bypass model signals. With --repair the recounted
+values are saved.
+
+Usage:
+    python manage.py verify_project_counters
+    python manage.py verify_project_counters --repair
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from takaful_app.models import Project
+from takaful_app.project_counters import verify
+
+
+class Command(BaseCommand):
+    help = 'Verify (and optionally repair) the task and volunteer counters stored on projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true', help='Save the recounted values')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = verify(repair=options['repair'])
+
+        for project in drifted:
+            counters = ', '.join(f'{name}={getattr(project, name)}' for name in Project.COUNTER_FIELDS)
+            self.stdout.write(f'#{project.id} {project.title}: {counters}')
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All project counters are consistent'))
+        elif options['repair']:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {len(drifted)} projects'))
+        else:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} projects drifted, run with --repair to fix'))
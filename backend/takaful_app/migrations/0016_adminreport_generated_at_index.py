@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('takaful_app', '0015_reportjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adminreport',
+            index=models.Index(fields=['-generated_at'], name='adminreport_generated_idx'),
+        ),
+    ]
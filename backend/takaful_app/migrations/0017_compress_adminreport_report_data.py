@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:10
+
+from django.db import migrations
+
+import takaful_app.fields
+
+
+def copy_report_data(apps, schema_editor):
+    AdminReport = apps.get_model('takaful_app', 'AdminReport')
+    batch = []
+    for report in AdminReport.objects.only('id', 'report_data').iterator(chunk_size=100):
+        report.report_body = report.report_data
+        batch.append(report)
+        if len(batch) >= 100:
+            AdminReport.objects.bulk_update(batch, ['report_body'])
+            batch = []
+    if batch:
+        AdminReport.objects.bulk_update(batch, ['report_body'])
+
+
+def restore_report_data(apps, schema_editor):
+    AdminReport = apps.get_model('takaful_app', 'AdminReport')
+    batch = []
+    for report in AdminReport.objects.only('id', 'report_body').iterator(chunk_size=100):
+        report.report_data = report.report_body
+        batch.append(report)
+        if len(batch) >= 100:
+            AdminReport.objects.bulk_update(batch, ['report_data'])
+            batch = []
+    if batch:
+        AdminReport.objects.bulk_update(batch, ['report_data'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('takaful_app', '0016_adminreport_generated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adminreport',
+            name='report_body',
+            field=takaful_app.fields.CompressedJSONField(default=dict),
+        ),
+        migrations.RunPython(copy_report_data, restore_report_data),
+        migrations.RemoveField(
+            model_name='adminreport',
+            name='report_data',
+        ),
+        migrations.RenameField(
+            model_name='adminreport',
+            old_name='report_body',
+            new_name='report_data',
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('takaful_app', '0018_dataversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adminreport',
+            name='is_snapshot',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='adminreport',
+            index=models.Index(fields=['is_snapshot', 'generated_at'], name='adminreport_snapshot_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-18 08:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def populate_volunteer_stats(apps, schema_editor):
+    Task = apps.get_model('takaful_app', 'Task')
+    VolunteerStatsSnapshot = apps.get_model('takaful_app', 'VolunteerStatsSnapshot')
+    totals = (
+        Task.objects.filter(volunteer__isnull=False)
+        .order_by()
+        .values('volunteer_id')
+        .annotate(
+            total_hours=Sum('hours', filter=Q(status='مكتملة')),
+            participations_count=Count('id', filter=~Q(status='ملغاة')),
+            successes_count=Count('id', filter=Q(status='مكتملة')),
+        )
+    )
+    VolunteerStatsSnapshot.objects.bulk_create([
+        VolunteerStatsSnapshot(
+            user_id=row['volunteer_id'],
+            total_hours=row['total_hours'] or 0,
+            participations_count=row['participations_count'],
+            successes_count=row['successes_count'],
+        )
+        for row in totals
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('takaful_app', '0020_service_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VolunteerStatsSnapshot',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='volunteer_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_hours', models.IntegerField(default=0)),
+                ('participations_count', models.IntegerField(default=0)),
+                ('successes_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_volunteer_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_completed_at(apps, schema_editor):
+    # Best available completion time for tasks completed before the field existed
+    Task = apps.get_model('takaful_app', 'Task')
+    Task.objects.filter(status='مكتملة', completed_at__isnull=True).update(completed_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('takaful_app', '0021_volunteerstatssnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='PeriodRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('quarter', models.IntegerField()),
+                ('hours', models.IntegerField(default=0)),
+                ('tasks', models.IntegerField(default=0)),
+                ('volunteers', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['year', 'quarter'],
+                'unique_together': {('year', 'quarter')},
+            },
+        ),
+        migrations.CreateModel(
+            name='VolunteerRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('quarter', models.IntegerField()),
+                ('hours', models.IntegerField(default=0)),
+                ('tasks', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['year', 'quarter', '-hours'], name='volunteerrollup_top_idx')],
+                'unique_together': {('user', 'year', 'quarter')},
+            },
+        ),
+    ]
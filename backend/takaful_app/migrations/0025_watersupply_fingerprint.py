@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('takaful_app', '0024_submission_ref'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='watersupplyrequest',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='takaful_app.watersupplyrequest'),
+        ),
+        migrations.AddField(
+            model_name='watersupplyrequest',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='watersupplyrequest',
+            index=models.Index(fields=['fingerprint', 'status'], name='watersupply_fingerprint_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:17
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_project_counters(apps, schema_editor):
+    Project = apps.get_model('takaful_app', 'Project')
+    Task = apps.get_model('takaful_app', 'Task')
+    ProjectAssignment = apps.get_model('takaful_app', 'ProjectAssignment')
+
+    tasks = {
+        row['project']: row
+        for row in Task.objects.order_by().values('project').annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='مكتملة')),
+        )
+    }
+    volunteers = dict(
+        ProjectAssignment.objects.order_by().values('project').annotate(count=Count('id'))
+        .values_list('project', 'count')
+    )
+
+    projects = list(Project.objects.only('id'))
+    for project in projects:
+        counts = tasks.get(project.id, {})
+        project.tasks_total = counts.get('total', 0)
+        project.tasks_completed = counts.get('completed', 0)
+        project.volunteers_assigned = volunteers.get(project.id, 0)
+        project.task_progress = (
+            project.tasks_completed * 100 // project.tasks_total if project.tasks_total else 0
+        )
+    Project.objects.bulk_update(
+        projects, ['tasks_total', 'tasks_completed', 'volunteers_assigned', 'task_progress'], batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('takaful_app', '0025_watersupply_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='task_progress',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='tasks_completed',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='tasks_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='volunteers_assigned',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_project_counters, migrations.RunPython.noop),
+    ]
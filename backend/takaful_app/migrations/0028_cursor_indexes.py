@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('takaful_app', '0027_admin_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectassignment',
+            index=models.Index(fields=['assigned_at', 'id'], name='assignment_assigned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicerequest',
+            index=models.Index(fields=['created_at', 'id'], name='servicerequest_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicevolunteerapplication',
+            index=models.Index(fields=['applied_at', 'id'], name='service_application_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_at', 'id'], name='task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerapplication',
+            index=models.Index(fields=['applied_at', 'id'], name='application_applied_idx'),
+        ),
+        # auth.User is not ours to add Meta indexes to; users/volunteers pages sort on it
+        migrations.RunSQL(
+            'CREATE INDEX user_date_joined_idx ON auth_user (date_joined, id)',
+            'DROP INDEX user_date_joined_idx',
+        ),
+    ]
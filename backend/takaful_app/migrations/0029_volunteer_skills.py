@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_volunteer_skills(apps, schema_editor):
+    Profile = apps.get_model('accounts', 'Profile')
+    VolunteerSkill = apps.get_model('takaful_app', 'VolunteerSkill')
+    rows = []
+    for user_id, skills in Profile.objects.values_list('user_id', 'skills').iterator():
+        names = {str(skill).strip()[:200] for skill in skills or [] if str(skill).strip()}
+        rows.extend(VolunteerSkill(user_id=user_id, skill=name) for name in names)
+    VolunteerSkill.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_profile_filter_indexes'),
+        ('takaful_app', '0028_cursor_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VolunteerSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=200)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['volunteer', 'status'], name='task_volunteer_status_idx'),
+        ),
+        migrations.AddField(
+            model_name='volunteerskill',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_entries', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerskill',
+            index=models.Index(fields=['skill', 'user'], name='volunteerskill_skill_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='volunteerskill',
+            unique_together={('user', 'skill')},
+        ),
+        migrations.RunPython(populate_volunteer_skills, migrations.RunPython.noop),
+    ]
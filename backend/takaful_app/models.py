@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User 
+from django.utils import timezone
+
+from .fields import CompressedJSONField
 
 
 class Project(models.Model):
@@ -50,12 +53,35 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized counters, kept in step with Task / ProjectAssignment writes (see project_counters.py)
+    tasks_total = models.IntegerField(default=0, editable=False)
+    tasks_completed = models.IntegerField(default=0, editable=False)
+    volunteers_assigned = models.IntegerField(default=0, editable=False)
+    task_progress = models.IntegerField(default=0, editable=False)  # tasks_completed / tasks_total, 0-100
+
+    COUNTER_FIELDS = ['tasks_total', 'tasks_completed', 'volunteers_assigned', 'task_progress']
+
     class Meta:
         ordering = ['-created_at']
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Counters only change through F() updates; saving an instance loaded
+        # before a task write must not overwrite them with stale values
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def completion_progress(self):
+        """Progress from task completion, or the manual progress while there are no tasks"""
+        return self.task_progress if self.tasks_total else self.progress
+
 
 class Service(models.Model):
     STATUS_CHOICES = [
@@ -75,6 +101,7 @@ class Service(models.Model):
     service_type = models.CharField(max_length=20, choices=SERVICE_TYPE_CHOICES, default="للمتطوعين")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
@@ -94,6 +121,12 @@ class ServiceRequest(models.Model):
     details = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING")
     created_at = models.DateTimeField(auto_now_add=True)
+    submission_ref = models.UUIDField(null=True, blank=True, unique=True, editable=False)  # Public reference (see ingest.py)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='servicerequest_created_idx'),  # Cursor pages
+        ]
 
     def __str__(self):
         return f"{self.service.title} for {self.beneficiary_name}"
@@ -125,6 +158,9 @@ class ServiceVolunteerApplication(models.Model):
     class Meta:
         unique_together = ['volunteer', 'service']
         ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['applied_at', 'id'], name='service_application_idx'),  # Cursor pages
+        ]
 
     def __str__(self):
         return f"{self.volunteer.email} - {self.service.title} ({self.status})"
@@ -147,6 +183,7 @@ class Suggestion(models.Model):
     submitted_by = models.CharField(max_length=150, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     is_reviewed = models.BooleanField(default=False)
+    submission_ref = models.UUIDField(null=True, blank=True, unique=True, editable=False)  # Public reference (see ingest.py)
 
     def __str__(self):
         return self.title
@@ -178,10 +215,18 @@ class ProjectAssignment(models.Model):
     class Meta:
         unique_together = ['project', 'user']
         ordering = ['-assigned_at']
+        indexes = [
+            models.Index(fields=['assigned_at', 'id'], name='assignment_assigned_idx'),  # Cursor pages
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.project.title} ({self.status})"
 
+    def save(self, *args, **kwargs):
+        # Project.volunteers_assigned is updated by signals in the same transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Task(models.Model):
     """
@@ -216,12 +261,33 @@ class Task(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)  # Set when status becomes مكتملة
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='task_created_idx'),  # Cursor pages
+            models.Index(fields=['volunteer', 'status'], name='task_volunteer_status_idx'),  # Open task load
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.project.title}"
+
+    def save(self, *args, **kwargs):
+        # Completion time drives the yearly/quarterly rollups (see rollups.py)
+        if self.status == "مكتملة":
+            if self.completed_at is None:
+                self.completed_at = timezone.now()
+        else:
+            self.completed_at = None
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'completed_at'}
+
+        # Project counters, volunteer stats and rollups are updated by signals in the same transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
     
     def calculate_progress(self):
         """Calculate progress based on completed subtasks"""
@@ -252,6 +318,86 @@ class Subtask(models.Model):
         return f"{self.task.title} - {self.title}"
 
 
+class VolunteerStatsSnapshot(models.Model):
+    """
+    Materialized per-volunteer task counters for the public volunteers page
+    Updated incrementally by the Task signals (see signals.py) and rebuilt
+    from scratch with `python manage.py rebuild_volunteer_stats`
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="volunteer_stats")
+
+    total_hours = models.IntegerField(default=0)  # Hours of completed tasks
+    participations_count = models.IntegerField(default=0)  # Tasks that are not cancelled
+    successes_count = models.IntegerField(default=0)  # Completed tasks
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} - {self.total_hours}h"
+
+
+class VolunteerSkill(models.Model):
+    """
+    One row per entry of a volunteer's Profile.skills, kept in sync by the
+    Profile signal (see volunteer_filters.py)
+    Gives the admin volunteers list an indexed skill membership filter that
+    works on every database backend
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="skill_entries")
+    skill = models.CharField(max_length=200)
+
+    class Meta:
+        unique_together = ['user', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'user'], name='volunteerskill_skill_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.skill}"
+
+
+class VolunteerRollup(models.Model):
+    """
+    Completed-task hours per volunteer per period (quarter 0 = whole year)
+    Maintained incrementally from Task by rollups.py
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="task_rollups")
+    year = models.IntegerField()
+    quarter = models.IntegerField()  # 1-4, 0 = year
+
+    hours = models.IntegerField(default=0)
+    tasks = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['user', 'year', 'quarter']
+        indexes = [
+            models.Index(fields=['year', 'quarter', '-hours'], name='volunteerrollup_top_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.year} Q{self.quarter} - {self.hours}h"
+
+
+class PeriodRollup(models.Model):
+    """
+    Completed-task hours and distinct volunteers per period (quarter 0 = whole year)
+    Maintained incrementally from Task by rollups.py
+    """
+    year = models.IntegerField()
+    quarter = models.IntegerField()  # 1-4, 0 = year
+
+    hours = models.IntegerField(default=0)
+    tasks = models.IntegerField(default=0)
+    volunteers = models.IntegerField(default=0)  # Distinct volunteers with a completed task
+
+    class Meta:
+        unique_together = ['year', 'quarter']
+        ordering = ['year', 'quarter']
+
+    def __str__(self):
+        return f"{self.year} Q{self.quarter} - {self.hours}h / {self.volunteers}"
+
+
 class AdminReport(models.Model):
     """
     Generated reports for admin dashboard
@@ -267,8 +413,8 @@ class AdminReport(models.Model):
     date_from = models.DateField(null=True, blank=True)
     date_to = models.DateField(null=True, blank=True)
 
-    # Complete report data stored as JSON
-    report_data = models.JSONField(default=dict)
+    # Complete report data stored as zlib-compressed JSON
+    report_data = CompressedJSONField(default=dict)
 
     # Quick stats for listing (duplicated for performance)
     total_projects = models.IntegerField(default=0)
@@ -277,16 +423,110 @@ class AdminReport(models.Model):
     total_beneficiaries = models.IntegerField(default=0)
     total_donations = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
+    # DataVersion('reports') value the report was built from (None = unknown)
+    data_version = models.BigIntegerField(null=True, blank=True)
+
+    # Created by the snapshot_reports cron command (subject to retention)
+    is_snapshot = models.BooleanField(default=False)
+
     # Timestamps
     generated_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-generated_at']
+        indexes = [
+            models.Index(fields=['-generated_at'], name='adminreport_generated_idx'),
+            models.Index(fields=['is_snapshot', 'generated_at'], name='adminreport_snapshot_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.generated_at.strftime('%Y-%m-%d %H:%M')}"
 
 
+class DataVersion(models.Model):
+    """
+    Monotonic change counter per data domain (e.g. "reports")
+    Bumped by model signals (see signals.py) so cached results can be reused
+    while their version still matches
+    """
+    key = models.CharField(max_length=50, unique=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+
+class ThrottleBucket(models.Model):
+    """
+    Token bucket for the public write throttle (see throttling.py)
+    Used when the cache is unavailable; a missing row is a full bucket,
+    so rows can be deleted at any time
+    """
+    key = models.CharField(max_length=200, unique=True)  # throttle:<scope>:<ip>
+    tokens = models.FloatField(default=0)
+    updated_at = models.FloatField(default=0)  # Unix timestamp of the last refill
+
+    def __str__(self):
+        return f"{self.key} ({self.tokens:.2f})"
+
+
+class AdminEvent(models.Model):
+    """
+    Live admin dashboard event (see events.py)
+    Append-only log shared by every worker; the id is the SSE event id
+    clients resume from. Rows older than the retention period are pruned.
+    """
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"#{self.id} {self.kind}"
+
+
+class ReportJob(models.Model):
+    """
+    Queued AdminReport generation job
+    Created by generate_report in job mode and executed by the
+    run_report_worker management command (no external broker needed)
+    """
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    admin = models.ForeignKey(User, on_delete=models.CASCADE, related_name="report_jobs")
+
+    # Report parameters
+    date_from = models.DateField(null=True, blank=True)
+    date_to = models.DateField(null=True, blank=True)
+
+    # Execution state
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="queued")
+    progress = models.IntegerField(default=0)  # 0-100
+    error = models.TextField(blank=True)
+    report = models.ForeignKey(AdminReport, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Report job #{self.id} ({self.status})"
+
+
 class VolunteerApplication(models.Model):
     """
     Volunteer applications to projects
@@ -314,6 +554,9 @@ class VolunteerApplication(models.Model):
     class Meta:
         unique_together = ['volunteer', 'project']  # One application per volunteer per project
         ordering = ['-applied_at']
+        indexes = [
+            models.Index(fields=['applied_at', 'id'], name='application_applied_idx'),  # Cursor pages
+        ]
 
     def __str__(self):
         return f"{self.volunteer.email} -> {self.project.title} ({self.status})"
@@ -455,9 +698,33 @@ class WaterSupplyRequest(models.Model):
     admin_notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    submission_ref = models.UUIDField(null=True, blank=True, unique=True, editable=False)  # Public reference (see ingest.py)
+
+    # Duplicate detection (see fingerprints.py)
+    fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+    duplicate_of = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="duplicates")
+
+    # Requests that are still being handled; a resubmission of one of these is a duplicate
+    OPEN_STATUSES = ["PENDING", "APPROVED"]
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['fingerprint', 'status'], name='watersupply_fingerprint_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.mosque_name} - {self.applicant_name}"
\ No newline at end of file
+        return f"{self.mosque_name} - {self.applicant_name}"
+
+    def update_fingerprint(self):
+        from .fingerprints import water_request_fingerprint
+        self.fingerprint = water_request_fingerprint(
+            self.mobile_number, self.mosque_name, self.neighborhood, self.location_link,
+        )
+
+    def save(self, *args, **kwargs):
+        self.update_fingerprint()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'fingerprint'}
+        super().save(*args, **kwargs)
\ No newline at end of file
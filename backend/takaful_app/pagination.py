@@ -0,0 +1,189 @@
+"""
+Pagination classes for takaful_app list endpoints.
+"""
+import json
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from decimal import Decimal
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .cache import cached_count
+from .versioning import model_key
+
+
+class ReportCursorPagination(CursorPagination):
+    """
+    Keyset pagination over AdminReport.generated_at (newest first)
+    GET /api/admin/reports/?lite=1&page_size=20&cursor=...
+    """
+    ordering = '-generated_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Cursor pagination that only applies when the client asks for it with
+    ?cursor= or ?page_size=, so existing clients keep receiving full lists.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class ProjectCursorPagination(OptionalCursorPagination):
+    """
+    Keyset pagination over Project.created_at (newest first)
+    GET /api/public-projects/?page_size=20&fields=id,title,category,status,progress
+    """
+    ordering = '-created_at'
+
+
+# Sort value and id of the row a page starts after; reverse walks backwards (previous pages)
+Keyset = namedtuple('Keyset', ['reverse', 'position', 'last_id'])
+
+
+def _position(value):
+    """JSON-safe sort value; lookups convert it back through the field"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class KeysetCursorPagination(OptionalCursorPagination):
+    """
+    Optional keyset pagination over a (field, id) ordering, e.g.
+    ('-created_at', '-id'). A page continues after the last row seen with
+    `field < value OR (field = value AND id < last_id)` (> when ascending),
+    so any number of rows sharing the same field value is paged correctly
+    and every page is an index range scan, however deep.
+    ?count=1 adds the total number of rows, served from a cached count that
+    is invalidated by the DataVersion of each model in count_models (the
+    paginated model is always included).
+    """
+    ordering = ('-created_at', '-id')
+    count_query_param = 'count'
+    count_models = ()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        if params.get(self.count_query_param) in ('1', 'true'):
+            models = [queryset.model, *self.count_models]
+            self.count = cached_count(queryset, [model_key(model) for model in models])
+
+        field, id_field = self.ordering
+        self.field, self.id_field = field.lstrip('-'), id_field.lstrip('-')
+        reverse = cursor is not None and cursor.reverse
+        descending = field.startswith('-') != reverse
+        direction = '-' if descending else ''
+        queryset = queryset.order_by(direction + self.field, direction + self.id_field)
+
+        if cursor is not None:
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': cursor.position})
+                | Q(**{self.field: cursor.position, f'{self.id_field}__{lookup}': cursor.last_id})
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.display_page_controls = self.has_next or self.has_previous
+        return self.page
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            reverse, position, last_id = json.loads(b64decode(encoded.encode('ascii')))
+            return Keyset(bool(reverse), position, int(last_id))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, keyset):
+        token = b64encode(json.dumps(list(keyset), separators=(',', ':')).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def _link(self, row, reverse):
+        return self.encode_cursor(Keyset(reverse, _position(getattr(row, self.field)), getattr(row, self.id_field)))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Walked back past the first row - start over
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[-1], False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], True)
+
+    def get_paginated_response(self, data):
+        payload = {'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data}
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+
+class UserCursorPagination(KeysetCursorPagination):
+    """GET /api/admin/users/ and /api/admin/volunteers/ (filtered on the profile)"""
+    ordering = ('-date_joined', '-id')
+
+    @property
+    def count_models(self):
+        from accounts.models import Profile
+        return (Profile,)
+
+
+class VolunteerCursorPagination(UserCursorPagination):
+    """
+    GET /api/admin/volunteers/; the ordering follows ?ordering= (see
+    volunteer_filters.py) and the status filter depends on tasks
+    """
+
+    @property
+    def count_models(self):
+        from accounts.models import Profile
+        from .models import Task
+        return (Profile, Task)
+
+
+class AssignmentCursorPagination(KeysetCursorPagination):
+    ordering = ('-assigned_at', '-id')
+
+
+class ApplicationCursorPagination(KeysetCursorPagination):
+    """Project and service volunteer applications"""
+    ordering = ('-applied_at', '-id')
@@ -0,0 +1,97 @@
+"""
+Maintenance of the denormalized Project counters.
+Each Task adds one to its project's tasks_total (and tasks_completed when
+completed); each ProjectAssignment adds one to volunteers_assigned. Task and
+assignment saves/deletes apply the difference with F() updates inside the
+writing transaction, and task_progress is recomputed from the new counters
+in the same UPDATE, so reading a project's progress needs no recount.
+verify() recounts everything to report and repair drift.
+"""
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.lookups import GreaterThan
+
+from .models import Project, ProjectAssignment, Task
+from .reports import TASK_COMPLETED
+
+
+def task_counts(project_id, status):
+    """(project_id, tasks, completed) a task adds to its project's counters"""
+    return project_id, 1, 1 if status == TASK_COMPLETED else 0
+
+
+def progress_expression(completed, total):
+    # Integer division, same as int(completed / total * 100)
+    return Case(When(GreaterThan(total, 0), then=completed * 100 / total), default=Value(0))
+
+
+def apply_delta(project_id, tasks=0, completed=0, volunteers=0):
+    """Add the given amounts to a project's counters"""
+    if project_id is None or not (tasks or completed or volunteers):
+        return
+
+    total = F('tasks_total') + tasks
+    done = F('tasks_completed') + completed
+    Project.objects.filter(id=project_id).update(
+        tasks_total=total,
+        tasks_completed=done,
+        volunteers_assigned=F('volunteers_assigned') + volunteers,
+        task_progress=progress_expression(done, total),
+    )
+
+
+def apply_task_change(old, new):
+    """Move a task's counts from old to new (either may be None)"""
+    if old == new:
+        return
+    if old is not None:
+        project_id, tasks, completed = old
+        apply_delta(project_id, -tasks, -completed)
+    if new is not None:
+        apply_delta(*new)
+
+
+def counter_values(tasks_total, tasks_completed, volunteers_assigned):
+    return {
+        'tasks_total': tasks_total,
+        'tasks_completed': tasks_completed,
+        'volunteers_assigned': volunteers_assigned,
+        'task_progress': tasks_completed * 100 // tasks_total if tasks_total else 0,
+    }
+
+
+def verify(repair=False):
+    """
+    Recount every project in two grouped queries. Returns the projects whose
+    stored counters drifted, with the recounted values set on them; with
+    repair, also saves those values. Call repair inside a transaction: the
+    projects are locked first so concurrent deltas land on the repaired rows.
+    """
+    projects = Project.objects.only('id', 'title', *Project.COUNTER_FIELDS).order_by('id')
+    if repair:
+        projects = projects.select_for_update()
+    projects = list(projects)
+
+    tasks = {
+        row['project']: row
+        for row in Task.objects.order_by().values('project').annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status=TASK_COMPLETED)),
+        )
+    }
+    volunteers = dict(
+        ProjectAssignment.objects.order_by().values('project').annotate(count=Count('id'))
+        .values_list('project', 'count')
+    )
+
+    drifted = []
+    for project in projects:
+        counts = tasks.get(project.id, {})
+        expected = counter_values(counts.get('total', 0), counts.get('completed', 0), volunteers.get(project.id, 0))
+        if any(getattr(project, name) != value for name, value in expected.items()):
+            for name, value in expected.items():
+                setattr(project, name, value)
+            drifted.append(project)
+
+    if repair and drifted:
+        Project.objects.bulk_update(drifted, Project.COUNTER_FIELDS, batch_size=500)
+    return drifted
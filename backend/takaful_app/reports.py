@@ -0,0 +1,482 @@
+"""
+Admin report builder.
+Collects the platform snapshot stored in AdminReport.report_data using a fixed
+number of grouped/conditional aggregate queries, independent of data size.
+"""
+import json
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Sum, Count, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Project, Task, AdminReport, ReportJob
+from .versioning import REPORTS, get_version
+
+
+TASK_COMPLETED = 'مكتملة'
+
+PROJECT_STATUS_DISPLAY = {
+    'ACTIVE': 'نشط',
+    'COMPLETED': 'مكتمل',
+    'PLANNED': 'متوقف',
+    'CANCELLED': 'ملغي'
+}
+
+
+def valid_report_range(date_from, date_to):
+    """True when both optional bounds are YYYY-MM-DD dates"""
+    try:
+        return all(parse_date(str(value)) for value in (date_from, date_to) if value)
+    except ValueError:  # Well formed but impossible, e.g. 2026-02-30
+        return False
+
+
+def _date_filters(date_from, date_to):
+    """Build the (project, task, volunteer) Q filters for a report date range"""
+    project_filter = Q()
+    task_filter = Q()
+    volunteer_filter = Q()
+
+    if date_from:
+        project_filter &= Q(created_at__gte=date_from)
+        task_filter &= Q(created_at__gte=date_from)
+        volunteer_filter &= Q(date_joined__gte=date_from)
+
+    if date_to:
+        project_filter &= Q(created_at__lte=date_to)
+        task_filter &= Q(created_at__lte=date_to)
+        volunteer_filter &= Q(date_joined__lte=date_to)
+
+    return project_filter, task_filter, volunteer_filter
+
+
+def _collect_projects(projects):
+    """Project counters and per-project rows (3 queries)"""
+    totals = projects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status='ACTIVE')),
+        completed=Count('id', filter=Q(status='COMPLETED')),
+        planned=Count('id', filter=Q(status='PLANNED')),
+        cancelled=Count('id', filter=Q(status='CANCELLED')),
+        beneficiaries=Sum('beneficiaries'),
+        donations=Sum('donation_amount'),
+    )
+
+    projects_by_category = {
+        row['category']: row['count']
+        for row in projects.exclude(category='').order_by('category')
+        .values('category').annotate(count=Count('id'))
+    }
+
+    projects_list = []
+    for project in projects:
+        # Task counts are stored on the project (see project_counters.py);
+        # progress falls back to the manual field while there are no tasks
+        automatic_progress = project.completion_progress
+
+        projects_list.append({
+            'id': project.id,
+            'title': project.title,
+            'category': project.category,
+            'status': project.status,
+            'status_display': PROJECT_STATUS_DISPLAY.get(project.status, project.status),
+            'progress': automatic_progress,
+            'beneficiaries': project.beneficiaries,
+            'donation_amount': float(project.donation_amount),
+            'start_date': project.start_date.isoformat() if project.start_date else None,
+            'end_date': project.end_date.isoformat() if project.end_date else None,
+            'volunteers_assigned': project.volunteers_assigned,
+            'tasks_total': project.tasks_total,
+            'tasks_completed': project.tasks_completed,
+            'completion_rate': automatic_progress,
+        })
+
+    return totals, projects_by_category, projects_list
+
+
+def _collect_volunteers(volunteers):
+    """Volunteer totals and per-volunteer rows (3 queries)"""
+    totals = volunteers.aggregate(
+        total=Count('id'),
+        hours=Sum('profile__total_volunteer_hours'),
+    )
+
+    # Titles of projects each volunteer still has open tasks in
+    current_projects = {}
+    open_tasks = Task.objects.filter(volunteer__in=volunteers).exclude(status=TASK_COMPLETED)
+    for volunteer_id, title in open_tasks.order_by().values_list('volunteer', 'project__title').distinct():
+        current_projects.setdefault(volunteer_id, []).append(title)
+
+    rows = volunteers.annotate(
+        tasks_completed_count=Count('assigned_tasks', filter=Q(assigned_tasks__status=TASK_COMPLETED)),
+        tasks_open_count=Count('assigned_tasks', filter=~Q(assigned_tasks__status=TASK_COMPLETED)),
+    )
+
+    volunteers_list = []
+    for volunteer in rows:
+        profile = volunteer.profile
+        volunteers_list.append({
+            'id': volunteer.id,
+            'name': profile.name,
+            'email': volunteer.email,
+            'phone': profile.phone,
+            'city': profile.city,
+            'skills': profile.skills,
+            'qualification': profile.qualification,
+            'university': profile.university,
+            'total_hours': profile.total_volunteer_hours,
+            'tasks_completed': volunteer.tasks_completed_count,
+            'tasks_in_progress': volunteer.tasks_open_count,
+            'rating': float(profile.rating),
+            'join_date': volunteer.date_joined.isoformat(),
+            'current_projects': current_projects.get(volunteer.id, []),
+        })
+
+    return totals, volunteers_list
+
+
+def _collect_tasks(tasks):
+    """Task counters and the top overdue tasks (2 queries)"""
+    totals = tasks.aggregate(
+        total=Count('id'),
+        in_progress=Count('id', filter=Q(status='قيد التنفيذ')),
+        waiting=Count('id', filter=Q(status='في الانتظار')),
+        completed=Count('id', filter=Q(status=TASK_COMPLETED)),
+        on_hold=Count('id', filter=Q(status='معلقة')),
+        high=Count('id', filter=Q(priority='عالية')),
+        medium=Count('id', filter=Q(priority='متوسطة')),
+        low=Count('id', filter=Q(priority='منخفضة')),
+    )
+
+    # Overdue tasks (past due date and not completed)
+    overdue_tasks = tasks.filter(
+        due_date__lt=timezone.now().date(),
+        status__in=['قيد التنفيذ', 'في الانتظار', 'معلقة']
+    ).select_related('project', 'volunteer__profile')
+    overdue_tasks_list = [{
+        'id': task.id,
+        'title': task.title,
+        'project': task.project.title,
+        'volunteer': task.volunteer.profile.name if task.volunteer else None,
+        'due_date': task.due_date.isoformat() if task.due_date else None,
+        'status': task.status,
+        'priority': task.priority,
+    } for task in overdue_tasks[:10]]  # Top 10 overdue
+
+    return totals, overdue_tasks_list
+
+
+def build_report_data(date_from=None, date_to=None, on_progress=None):
+    """
+    Build the report_data payload and quick stats for an AdminReport.
+    Returns (report_data, quick_stats) where quick_stats holds the
+    total_* values duplicated on the AdminReport row.
+    on_progress(percent) is called after each section when provided.
+    """
+    def progress(percent):
+        if on_progress:
+            on_progress(percent)
+
+    project_filter, task_filter, volunteer_filter = _date_filters(date_from, date_to)
+
+    projects = Project.objects.filter(project_filter)
+    volunteers = User.objects.filter(
+        profile__role='user',
+        profile__is_approved=True
+    ).filter(volunteer_filter).select_related('profile')
+    tasks = Task.objects.filter(task_filter)
+
+    project_totals, projects_by_category, projects_list = _collect_projects(projects)
+    progress(40)
+    volunteer_totals, volunteers_list = _collect_volunteers(volunteers)
+    progress(70)
+    task_totals, overdue_tasks_list = _collect_tasks(tasks)
+    progress(90)
+
+    total_projects = project_totals['total']
+    total_volunteers = volunteer_totals['total']
+    total_tasks = task_totals['total']
+    total_beneficiaries = project_totals['beneficiaries'] or 0
+    total_donations = project_totals['donations'] or 0
+    total_volunteer_hours = volunteer_totals['hours'] or 0
+
+    report_data = {
+        'summary': {
+            'total_projects': total_projects,
+            'total_volunteers': total_volunteers,
+            'total_tasks': total_tasks,
+            'total_beneficiaries': total_beneficiaries,
+            'total_donations': float(total_donations),
+            'total_volunteer_hours': total_volunteer_hours,
+            'date_from': date_from,
+            'date_to': date_to,
+        },
+        'projects': {
+            'by_status': {
+                'active': project_totals['active'],
+                'completed': project_totals['completed'],
+                'planned': project_totals['planned'],
+                'cancelled': project_totals['cancelled'],
+            },
+            'by_category': projects_by_category,
+            'list': projects_list,
+        },
+        'volunteers': {
+            'total': total_volunteers,
+            'list': volunteers_list,
+        },
+        'tasks': {
+            'by_status': {
+                'in_progress': task_totals['in_progress'],
+                'waiting': task_totals['waiting'],
+                'completed': task_totals['completed'],
+                'on_hold': task_totals['on_hold'],
+            },
+            'by_priority': {
+                'high': task_totals['high'],
+                'medium': task_totals['medium'],
+                'low': task_totals['low'],
+            },
+            'overdue': overdue_tasks_list,
+            'total_completed': task_totals['completed'],
+            'completion_rate': int((task_totals['completed'] / total_tasks) * 100) if total_tasks > 0 else 0,
+        },
+    }
+
+    quick_stats = {
+        'total_projects': total_projects,
+        'total_volunteers': total_volunteers,
+        'total_tasks': total_tasks,
+        'total_beneficiaries': total_beneficiaries,
+        'total_donations': total_donations,
+    }
+    return report_data, quick_stats
+
+
+def report_title(date_from=None, date_to=None):
+    """Default Arabic title for a generated report"""
+    if date_from and date_to:
+        return f"تقرير شامل ({date_from} - {date_to})"
+    return f"تقرير شامل - {timezone.now().strftime('%Y-%m-%d %H:%M')}"
+
+
+def create_report(admin, date_from=None, date_to=None, on_progress=None, title=None, is_snapshot=False):
+    """Build and persist a new AdminReport for the given date range"""
+    # Read the version first so changes made while building invalidate the result
+    data_version = get_version(REPORTS)
+    report_data, quick_stats = build_report_data(date_from, date_to, on_progress)
+    return AdminReport.objects.create(
+        admin=admin,
+        title=title or report_title(date_from, date_to),
+        date_from=date_from,
+        date_to=date_to,
+        report_data=report_data,
+        data_version=data_version,
+        is_snapshot=is_snapshot,
+        **quick_stats
+    )
+
+
+def find_reusable_report(date_from=None, date_to=None):
+    """
+    Latest report for the same date range that was built from the current
+    data version today (overdue tasks depend on the current date).
+    Returns None when the report has to be recomputed.
+    """
+    return AdminReport.objects.filter(
+        date_from=date_from or None,
+        date_to=date_to or None,
+        data_version=get_version(REPORTS),
+        generated_at__date=timezone.now().date(),
+        is_snapshot=False,
+    ).order_by('-generated_at').first()
+
+
+def get_or_create_report(admin, date_from=None, date_to=None, on_progress=None):
+    """
+    Reuse an up-to-date report for the same parameters, or build a new one.
+    A reusable report generated by another admin is cloned for this admin.
+    Returns (report, created).
+    """
+    report = find_reusable_report(date_from, date_to)
+    if report is None:
+        return create_report(admin, date_from, date_to, on_progress), True
+
+    if report.admin_id != admin.id:
+        report.pk = None
+        report._state.adding = True
+        report.admin = admin
+        report.save()
+    return report, False
+
+
+def stream_report_json(metadata, compressed_report_data, chunk_size=64 * 1024):
+    """
+    Yield a report detail JSON document chunk by chunk.
+    metadata is the serialized report without report_data; the compressed
+    report_data column is decompressed incrementally into the output.
+    """
+    head = json.dumps(metadata, ensure_ascii=False, cls=DjangoJSONEncoder)
+    yield (head[:-1] + (', ' if metadata else '') + '"report_data": ').encode('utf-8')
+
+    if compressed_report_data is None:
+        yield b'null'
+    else:
+        data = memoryview(bytes(compressed_report_data))
+        decompressor = zlib.decompressobj()
+        for offset in range(0, len(data), chunk_size):
+            chunk = decompressor.decompress(data[offset:offset + chunk_size])
+            if chunk:
+                yield chunk
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    yield b'}'
+
+
+# ============================================================================
+# REPORT DIFF
+# ============================================================================
+def _index_by_id(rows):
+    return {row['id']: row for row in rows if 'id' in row}
+
+
+def diff_report_data(old_data, new_data):
+    """
+    Compare two stored report_data payloads with keyed joins on id.
+    Returns only what changed between the snapshots: projects whose
+    status/progress moved, volunteers whose completed task count moved,
+    newly overdue tasks and the summary counter deltas.
+    """
+    old_projects = _index_by_id(old_data.get('projects', {}).get('list', []))
+    new_projects = _index_by_id(new_data.get('projects', {}).get('list', []))
+
+    projects_changed = []
+    for project_id, project in new_projects.items():
+        previous = old_projects.get(project_id)
+        if previous is None:
+            continue
+        if previous.get('status') != project.get('status') or previous.get('progress') != project.get('progress'):
+            projects_changed.append({
+                'id': project_id,
+                'title': project.get('title'),
+                'status_before': previous.get('status'),
+                'status_after': project.get('status'),
+                'progress_before': previous.get('progress'),
+                'progress_after': project.get('progress'),
+            })
+
+    old_volunteers = _index_by_id(old_data.get('volunteers', {}).get('list', []))
+    new_volunteers = _index_by_id(new_data.get('volunteers', {}).get('list', []))
+
+    volunteers_changed = []
+    for volunteer_id, volunteer in new_volunteers.items():
+        before = old_volunteers.get(volunteer_id, {}).get('tasks_completed', 0)
+        after = volunteer.get('tasks_completed', 0)
+        if before != after:
+            volunteers_changed.append({
+                'id': volunteer_id,
+                'name': volunteer.get('name'),
+                'tasks_completed_before': before,
+                'tasks_completed_after': after,
+                'delta': after - before,
+            })
+
+    old_overdue_ids = {task.get('id') for task in old_data.get('tasks', {}).get('overdue', [])}
+    newly_overdue = [
+        task for task in new_data.get('tasks', {}).get('overdue', [])
+        if task.get('id') not in old_overdue_ids
+    ]
+
+    old_summary = old_data.get('summary', {})
+    new_summary = new_data.get('summary', {})
+    summary_delta = {
+        key: value - (old_summary.get(key) or 0)
+        for key, value in new_summary.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+    return {
+        'summary_delta': summary_delta,
+        'projects': {
+            'changed': projects_changed,
+            'added': [{'id': p['id'], 'title': p.get('title')} for pid, p in new_projects.items() if pid not in old_projects],
+            'removed': [{'id': p['id'], 'title': p.get('title')} for pid, p in old_projects.items() if pid not in new_projects],
+        },
+        'volunteers': {
+            'changed': volunteers_changed,
+        },
+        'tasks': {
+            'newly_overdue': newly_overdue,
+        },
+    }
+
+
+# ============================================================================
+# REPORT JOBS (executed by the run_report_worker command)
+# ============================================================================
+def fail_stale_jobs():
+    """
+    Fail running jobs started more than REPORT_JOB_TIMEOUT seconds ago: their
+    worker died mid-job, so they would otherwise stay running forever.
+    They are not re-queued, so a job that kills its worker runs only once.
+    """
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'REPORT_JOB_TIMEOUT', 1800))
+    return ReportJob.objects.filter(status='running', started_at__lt=cutoff).update(
+        status='failed',
+        error='انتهت مهلة إنشاء التقرير، يرجى المحاولة مرة أخرى',
+        finished_at=timezone.now(),
+    )
+
+
+def claim_next_job():
+    """
+    Atomically claim the oldest queued ReportJob.
+    Uses a conditional UPDATE so concurrent workers never run the same job.
+    Returns the claimed job or None when the queue is empty.
+    """
+    fail_stale_jobs()
+    while True:
+        job_id = ReportJob.objects.filter(status='queued').values_list('id', flat=True).first()
+        if job_id is None:
+            return None
+
+        claimed = ReportJob.objects.filter(id=job_id, status='queued').update(
+            status='running',
+            started_at=timezone.now(),
+        )
+        if claimed:
+            return ReportJob.objects.select_related('admin').get(id=job_id)
+        # Another worker took it first - try the next one
+
+
+def run_report_job(job):
+    """Execute a claimed ReportJob, recording progress and the outcome"""
+    def on_progress(percent):
+        ReportJob.objects.filter(id=job.id).update(progress=percent)
+
+    # report_data stores the range as ISO strings, like the synchronous request body
+    date_from = job.date_from.isoformat() if job.date_from else None
+    date_to = job.date_to.isoformat() if job.date_to else None
+
+    try:
+        report, _ = get_or_create_report(job.admin, date_from, date_to, on_progress)
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        return job
+
+    job.status = 'done'
+    job.progress = 100
+    job.report = report
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'progress', 'report', 'finished_at'])
+    return job
@@ -0,0 +1,188 @@
+"""
+Yearly / quarterly rollups of completed tasks.
+A completed Task with a volunteer contributes its hours to the period of its
+completed_at (local time): VolunteerRollup keeps per-volunteer totals and
+PeriodRollup the platform totals, including distinct volunteers. Quarter 0
+is the whole year. Task signals apply changes incrementally; rebuild()
+recomputes everything from Task.
+
+public_volunteer_statistics overlays these live actuals on the uploaded
+VolunteerStatistics of the same year.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractQuarter, ExtractYear
+from django.utils import timezone
+
+from .models import PeriodRollup, Task, VolunteerRollup, VolunteerStatistics
+from .reports import TASK_COMPLETED
+from .versioning import VOLUNTEER_STATISTICS, bump_version
+
+
+TOP_VOLUNTEERS = 10
+
+
+def rollup_contribution(volunteer_id, status, hours, completed_at):
+    """(volunteer_id, year, quarter, hours) a task adds to the rollups, or None"""
+    if status != TASK_COMPLETED or volunteer_id is None or completed_at is None:
+        return None
+    local = timezone.localtime(completed_at)
+    return volunteer_id, local.year, (local.month - 1) // 3 + 1, hours or 0
+
+
+class _StatisticsTouch:
+    """on_commit callback invalidating the statistics of the years a transaction changed"""
+
+    def __init__(self):
+        self.years = set()
+        self.done = False
+
+    def add(self, years):
+        # None: every year
+        self.years = None if years is None or self.years is None else self.years | set(years)
+
+    def __call__(self):
+        self.done = True
+        statistics = VolunteerStatistics.objects.all()
+        if self.years is not None:
+            statistics = statistics.filter(year__in=self.years)
+        # Invalidates cached/ETagged statistics responses and marks the snapshot stale
+        statistics.update(updated_at=timezone.now())
+        bump_version(VOLUNTEER_STATISTICS)
+
+
+def _touch_statistics(years=None):
+    """
+    Touch VolunteerStatistics of the given years (None: all) once the current
+    transaction commits. Changes of the same transaction share one callback,
+    so a batch of task updates costs one UPDATE and one version bump.
+    """
+    pending = transaction.get_connection().run_on_commit
+    touch = next((func for _, func, _ in pending if isinstance(func, _StatisticsTouch) and not func.done), None)
+    if touch is not None:
+        touch.add(years)
+        return
+    touch = _StatisticsTouch()
+    touch.add(years)
+    # Runs immediately when not inside a transaction
+    transaction.on_commit(touch)
+
+
+def _apply(contribution, sign):
+    user_id, year, quarter, hours = contribution
+
+    for period in (quarter, 0):
+        row, _ = VolunteerRollup.objects.select_for_update().get_or_create(
+            user_id=user_id, year=year, quarter=period,
+        )
+        had_tasks = row.tasks > 0
+        row.tasks += sign
+        row.hours += sign * hours
+        if row.tasks > 0:
+            row.save(update_fields=['tasks', 'hours'])
+        else:
+            row.delete()
+
+        # Distinct volunteers change when a volunteer enters or leaves the period
+        volunteers = int(row.tasks > 0) - int(had_tasks)
+        PeriodRollup.objects.get_or_create(year=year, quarter=period)
+        PeriodRollup.objects.filter(year=year, quarter=period).update(
+            hours=F('hours') + sign * hours,
+            tasks=F('tasks') + sign,
+            volunteers=F('volunteers') + volunteers,
+        )
+        if sign < 0:
+            PeriodRollup.objects.filter(year=year, quarter=period, tasks__lte=0).delete()
+
+
+def apply_rollup_change(old, new):
+    """Move a task's rollup contribution from old to new (either may be None)"""
+    if old == new:
+        return
+
+    with transaction.atomic():
+        if old is not None:
+            _apply(old, -1)
+        if new is not None:
+            _apply(new, 1)
+
+    _touch_statistics({c[1] for c in (old, new) if c is not None})
+
+
+def rebuild():
+    """Recompute both rollup tables from Task with one grouped query. Returns the period count"""
+    rows = (
+        Task.objects.filter(status=TASK_COMPLETED, volunteer__isnull=False, completed_at__isnull=False)
+        .annotate(year=ExtractYear('completed_at'), quarter=ExtractQuarter('completed_at'))
+        .order_by()
+        .values('volunteer_id', 'year', 'quarter')
+        .annotate(hours=Sum('hours'), tasks=Count('id'))
+    )
+
+    volunteer_totals = defaultdict(lambda: [0, 0])
+    for row in rows:
+        for period in (row['quarter'], 0):
+            totals = volunteer_totals[(row['volunteer_id'], row['year'], period)]
+            totals[0] += row['hours'] or 0
+            totals[1] += row['tasks']
+
+    period_totals = defaultdict(lambda: [0, 0, 0])
+    for (_, year, period), (hours, tasks) in volunteer_totals.items():
+        totals = period_totals[(year, period)]
+        totals[0] += hours
+        totals[1] += tasks
+        totals[2] += 1
+
+    with transaction.atomic():
+        VolunteerRollup.objects.all().delete()
+        PeriodRollup.objects.all().delete()
+        VolunteerRollup.objects.bulk_create([
+            VolunteerRollup(user_id=user_id, year=year, quarter=period, hours=hours, tasks=tasks)
+            for (user_id, year, period), (hours, tasks) in volunteer_totals.items()
+        ], batch_size=500)
+        PeriodRollup.objects.bulk_create([
+            PeriodRollup(year=year, quarter=period, hours=hours, tasks=tasks, volunteers=volunteers)
+            for (year, period), (hours, tasks, volunteers) in period_totals.items()
+        ], batch_size=500)
+
+    _touch_statistics()
+    return len(period_totals)
+
+
+def _display_name(user):
+    profile = getattr(user, 'profile', None)
+    return (profile and profile.name) or user.get_full_name() or user.username
+
+
+def live_actuals(year):
+    """
+    Actuals for a year from the rollups (two queries), or None when the
+    platform recorded no completed tasks that year.
+    """
+    periods = {p.quarter: p for p in PeriodRollup.objects.filter(year=year)}
+    if 0 not in periods:
+        return None
+
+    top = (
+        VolunteerRollup.objects.filter(year=year, quarter=0)
+        .select_related('user__profile')
+        .order_by('-hours', 'user_id')[:TOP_VOLUNTEERS]
+    )
+    return {
+        'total_hours': periods[0].hours,
+        'total_volunteers': periods[0].volunteers,
+        'quarters': {
+            quarter: {'hours': period.hours, 'volunteers': period.volunteers}
+            for quarter, period in periods.items() if quarter
+        },
+        'top_volunteers': [
+            {
+                'rank': rank,
+                'name': _display_name(row.user),
+                'hours': row.hours,
+            }
+            for rank, row in enumerate(top, 1)
+        ],
+    }
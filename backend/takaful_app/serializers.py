@@ -1,14 +1,60 @@
 from rest_framework import serializers
 from .models import (
     Project, Service, ServiceRequest, ServiceVolunteerApplication, Volunteer, Suggestion,
-    ProjectAssignment, Task, Subtask, AdminReport, VolunteerApplication,
+    ProjectAssignment, Task, Subtask, AdminReport, ReportJob, VolunteerApplication,
     VolunteerStatistics, QuarterlyTarget, DepartmentHours, TopVolunteer,
     WaterSupplyRequest
 )
 from django.contrib.auth.models import User
 
+from .volunteer_filters import volunteer_status
 
-class ProjectSerializer(serializers.ModelSerializer):
+
+def requested_fields(request):
+    """Field names from a ?fields=a,b,c query parameter on reads (None when absent)"""
+    if request is None or request.method not in ('GET', 'HEAD'):
+        return None
+    fields = request.query_params.get('fields', '')
+    return [name.strip() for name in fields.split(',') if name.strip()] or None
+
+
+class FieldsProjectionMixin:
+    """
+    Sparse field projection for a ModelSerializer.
+    Pass fields=[...] or a request with ?fields=a,b,c in the context; every
+    other field is dropped (unknown names are ignored). Meta.projection_sources
+    lists the model fields that source='*' fields (method fields) read.
+    """
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is None:
+            fields = requested_fields(self.context.get('request'))
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def model_fields(cls, fields):
+        """
+        Model field names needed to serialize the given fields, for
+        queryset.only(). None when no projection applies.
+        """
+        if not fields:
+            return None
+
+        sources = getattr(cls.Meta, 'projection_sources', {})
+        model_fields = {cls.Meta.model._meta.pk.name}
+        for name, field in cls(fields=fields).fields.items():
+            if field.source == '*':
+                model_fields.update(sources.get(name, []))
+            else:
+                model_fields.add(field.source.split('.')[0])
+        return sorted(model_fields)
+
+
+class ProjectSerializer(FieldsProjectionMixin, serializers.ModelSerializer):
     status_display = serializers.SerializerMethodField()
     description = serializers.CharField(source='desc', read_only=True)  # Alias for frontend compatibility
 
@@ -42,6 +88,7 @@ class ProjectSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['created_at', 'updated_at', 'description', 'status_display']
+        projection_sources = {'status_display': ['status']}
 
     def get_status_display(self, obj):
         """Return Arabic status display"""
@@ -75,6 +122,7 @@ class ServiceRequestSerializer(serializers.ModelSerializer):
             'details',
             'status',
             'created_at',
+            'submission_ref',
         ]
         read_only_fields = ['created_at']
 
@@ -115,7 +163,7 @@ class VolunteerSerializer(serializers.ModelSerializer):
 class SuggestionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Suggestion
-        fields = ['id', 'title', 'description', 'submitted_by', 'created_at', 'is_reviewed']
+        fields = ['id', 'title', 'description', 'submitted_by', 'created_at', 'is_reviewed', 'submission_ref']
         read_only_fields = ['created_at']
 
 
@@ -277,22 +325,25 @@ class VolunteerDetailSerializer(serializers.ModelSerializer):
             'current_projects',
         ]
     
+    # list_volunteers annotates the task load in SQL (volunteer_filters.with_task_load)
+    # and prefetches open_tasks; other callers fall back to per-volunteer queries
+
     def get_current_tasks(self, obj):
+        if hasattr(obj, 'current_tasks_count'):
+            return obj.current_tasks_count
         return obj.assigned_tasks.exclude(status='مكتملة').count()
     
     def get_current_projects(self, obj):
         # Get unique project titles from current task assignments
-        tasks = obj.assigned_tasks.exclude(status='مكتملة')
+        tasks = getattr(obj, 'open_tasks', None)
+        if tasks is None:
+            tasks = obj.assigned_tasks.exclude(status='مكتملة').select_related('project')
         return list(set([task.project.title for task in tasks]))
     
     def get_status(self, obj):
-        current_tasks_count = self.get_current_tasks(obj)
-        if current_tasks_count == 0:
-            return "غير نشط"
-        elif current_tasks_count >= 5:
-            return "مشغول"
-        else:
-            return "نشط"
+        if hasattr(obj, 'volunteer_status'):
+            return obj.volunteer_status
+        return volunteer_status(self.get_current_tasks(obj))
 
 
 class VolunteerRequestSerializer(serializers.ModelSerializer):
@@ -333,6 +384,7 @@ class AdminReportSerializer(serializers.ModelSerializer):
     """
     admin_name = serializers.CharField(source='admin.profile.name', read_only=True)
     admin_email = serializers.EmailField(source='admin.email', read_only=True)
+    report_data = serializers.JSONField(required=False)  # Stored compressed, see CompressedJSONField
 
     class Meta:
         model = AdminReport
@@ -355,6 +407,54 @@ class AdminReportSerializer(serializers.ModelSerializer):
         read_only_fields = ['generated_at', 'admin_name', 'admin_email']
 
 
+class AdminReportListSerializer(serializers.ModelSerializer):
+    """
+    Lightweight AdminReport listing - quick stats only, never report_data
+    """
+    admin_name = serializers.CharField(source='admin.profile.name', read_only=True)
+    admin_email = serializers.EmailField(source='admin.email', read_only=True)
+
+    class Meta:
+        model = AdminReport
+        fields = [
+            'id',
+            'admin',
+            'admin_name',
+            'admin_email',
+            'title',
+            'date_from',
+            'date_to',
+            'total_projects',
+            'total_volunteers',
+            'total_tasks',
+            'total_beneficiaries',
+            'total_donations',
+            'generated_at',
+        ]
+        read_only_fields = fields
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    """
+    Status of a queued report generation job
+    """
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id',
+            'status',
+            'progress',
+            'error',
+            'date_from',
+            'date_to',
+            'report',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+
 class VolunteerApplicationSerializer(serializers.ModelSerializer):
     """
     Serializer for VolunteerApplication model
@@ -471,5 +571,7 @@ class WaterSupplyRequestSerializer(serializers.ModelSerializer):
             'admin_notes',
             'created_at',
             'updated_at',
+            'submission_ref',
+            'duplicate_of',
         ]
-        read_only_fields = ['created_at', 'updated_at', 'status', 'admin_notes']
\ No newline at end of file
+        read_only_fields = ['created_at', 'updated_at', 'status', 'admin_notes', 'duplicate_of']
\ No newline at end of file
@@ -0,0 +1,246 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.auth.models import User
+
+from accounts.models import Profile
+from .models import (
+    Project, Task, ProjectAssignment, Service, ServiceRequest,
+    VolunteerStatistics, QuarterlyTarget, DepartmentHours, TopVolunteer,
+    VolunteerApplication, ServiceVolunteerApplication, WaterSupplyRequest, Suggestion
+)
+from .versioning import (
+    REPORTS, PROJECTS, SERVICES, VOLUNTEER_STATISTICS, VOLUNTEERS, VOLUNTEER_REQUESTS, bump_version, model_key
+)
+from .volunteer_stats import task_contribution, apply_change
+from .rollups import rollup_contribution, apply_rollup_change
+from .project_counters import task_counts, apply_task_change, apply_delta as apply_project_delta
+from .reports import TASK_COMPLETED
+from .volunteer_filters import sync_skills
+from . import events
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=ProjectAssignment)
+@receiver(post_delete, sender=ProjectAssignment)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=User)
+def bump_reports_version(sender, **kwargs):
+    """Any change to report source data invalidates previously built reports"""
+    bump_version(REPORTS)
+
+
+@receiver(post_save, sender=User)
+def bump_reports_version_for_user(sender, update_fields=None, **kwargs):
+    # Logins only touch last_login, which reports never read
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_version(REPORTS)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def bump_projects_version(sender, **kwargs):
+    bump_version(PROJECTS)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def bump_services_version(sender, **kwargs):
+    bump_version(SERVICES)
+
+
+@receiver(post_save, sender=VolunteerStatistics)
+@receiver(post_delete, sender=VolunteerStatistics)
+@receiver(post_save, sender=QuarterlyTarget)
+@receiver(post_delete, sender=QuarterlyTarget)
+@receiver(post_save, sender=DepartmentHours)
+@receiver(post_delete, sender=DepartmentHours)
+@receiver(post_save, sender=TopVolunteer)
+@receiver(post_delete, sender=TopVolunteer)
+def bump_volunteer_statistics_version(sender, **kwargs):
+    bump_version(VOLUNTEER_STATISTICS)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def bump_volunteers_version(sender, **kwargs):
+    """Profiles and tasks feed the public volunteer distributions"""
+    bump_version(VOLUNTEERS)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=User)
+def bump_volunteer_requests_version(sender, **kwargs):
+    """Pending volunteer requests list profile and user fields"""
+    bump_version(VOLUNTEER_REQUESTS)
+
+
+@receiver(post_save, sender=User)
+def bump_volunteer_requests_version_for_user(sender, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_version(VOLUNTEER_REQUESTS)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=ProjectAssignment)
+@receiver(post_delete, sender=ProjectAssignment)
+@receiver(post_save, sender=ServiceRequest)
+@receiver(post_delete, sender=ServiceRequest)
+@receiver(post_save, sender=VolunteerApplication)
+@receiver(post_delete, sender=VolunteerApplication)
+@receiver(post_save, sender=ServiceVolunteerApplication)
+@receiver(post_delete, sender=ServiceVolunteerApplication)
+@receiver(post_save, sender=Suggestion)
+@receiver(post_delete, sender=Suggestion)
+@receiver(post_save, sender=WaterSupplyRequest)
+@receiver(post_delete, sender=WaterSupplyRequest)
+def bump_model_version(sender, **kwargs):
+    """
+    Invalidates the cached counts of paginated admin lists (see pagination.py)
+    Spooled public submissions are bulk-inserted; ingest.flush bumps their keys
+    """
+    bump_version(model_key(sender))
+
+
+@receiver(post_save, sender=User)
+def bump_user_model_version(sender, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_version(model_key(sender))
+
+
+# Task fields VolunteerStatsSnapshot, the period rollups and the project counters depend on
+TASK_TRACKED_FIELDS = {'volunteer', 'volunteer_id', 'status', 'hours', 'completed_at', 'project', 'project_id'}
+
+
+def _task_state(task):
+    return task.volunteer_id, task.status, task.hours, task.completed_at, task.project_id
+
+
+def _apply_task_change(previous, current):
+    """Move a task from its previous to its current state (either may be None)"""
+    apply_change(
+        task_contribution(*previous[:3]) if previous else None,
+        task_contribution(*current[:3]) if current else None,
+    )
+    apply_rollup_change(
+        rollup_contribution(*previous[:4]) if previous else None,
+        rollup_contribution(*current[:4]) if current else None,
+    )
+    apply_task_change(
+        task_counts(previous[4], previous[1]) if previous else None,
+        task_counts(current[4], current[1]) if current else None,
+    )
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the task's tracked fields as stored before this save"""
+    instance._stats_skip = raw or bool(update_fields and not TASK_TRACKED_FIELDS & set(update_fields))
+    instance._stats_previous = None
+    if instance._stats_skip or instance.pk is None:
+        return
+
+    instance._stats_previous = Task.objects.filter(pk=instance.pk).values_list(
+        'volunteer_id', 'status', 'hours', 'completed_at', 'project_id'
+    ).first()
+
+
+@receiver(post_save, sender=Task)
+def update_volunteer_stats(sender, instance, **kwargs):
+    if getattr(instance, '_stats_skip', False):
+        return
+    _apply_task_change(getattr(instance, '_stats_previous', None), _task_state(instance))
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_from_volunteer_stats(sender, instance, **kwargs):
+    _apply_task_change(_task_state(instance), None)
+
+
+@receiver(pre_save, sender=ProjectAssignment)
+def remember_assignment_project(sender, instance, raw=False, **kwargs):
+    instance._counters_previous = None
+    if not raw and instance.pk is not None:
+        instance._counters_previous = ProjectAssignment.objects.filter(pk=instance.pk).values_list(
+            'project_id', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=ProjectAssignment)
+def count_assigned_volunteer(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_counters_previous', None)
+    if raw or previous == instance.project_id:
+        return
+    apply_project_delta(previous, volunteers=-1)
+    apply_project_delta(instance.project_id, volunteers=1)
+
+
+@receiver(post_delete, sender=ProjectAssignment)
+def uncount_assigned_volunteer(sender, instance, **kwargs):
+    apply_project_delta(instance.project_id, volunteers=-1)
+
+
+@receiver(post_save, sender=Profile)
+def sync_volunteer_skills(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the indexed VolunteerSkill rows in step with Profile.skills"""
+    if raw or (update_fields and 'skills' not in update_fields):
+        return
+    sync_skills(instance.user_id, instance.skills)
+
+
+# ----------------------------------------------------------------------------
+# Live admin dashboard events (see events.py)
+# ----------------------------------------------------------------------------
+@receiver(post_save, sender=Profile)
+def publish_pending_volunteer(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and instance.role == 'user' and not instance.is_approved:
+        events.publish(events.VOLUNTEER_PENDING, user_id=instance.user_id)
+
+
+@receiver(post_save, sender=VolunteerApplication)
+def publish_project_application(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        events.publish(
+            events.PROJECT_APPLICATION,
+            id=instance.id, project_id=instance.project_id, volunteer_id=instance.volunteer_id,
+        )
+
+
+@receiver(post_save, sender=ServiceVolunteerApplication)
+def publish_service_application(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        events.publish(
+            events.SERVICE_APPLICATION,
+            id=instance.id, service_id=instance.service_id, volunteer_id=instance.volunteer_id,
+        )
+
+
+@receiver(post_save, sender=Task)
+def publish_task_completed(sender, instance, **kwargs):
+    if getattr(instance, '_stats_skip', False) or instance.status != TASK_COMPLETED:
+        return
+    previous = getattr(instance, '_stats_previous', None)
+    if previous is None or previous[1] != TASK_COMPLETED:
+        events.publish(
+            events.TASK_COMPLETED,
+            id=instance.id, project_id=instance.project_id, volunteer_id=instance.volunteer_id, hours=instance.hours,
+        )
+
+
+@receiver(post_save, sender=WaterSupplyRequest)
+def publish_water_supply_request(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        events.publish(events.WATER_SUPPLY_REQUEST, id=instance.id, count=1)
@@ -0,0 +1,160 @@
+"""
+Pre-rendered JSON snapshots of the anonymous endpoints.
+publish() renders each endpoint through its normal view once and writes the
+body to PUBLIC_SNAPSHOT_DIR as an immutable versioned file (plus a
+precompressed .gz), then flips a small "<name>.current" pointer to it. The
+pointer also records the DataVersion values the body was rendered from.
+views.public_snapshot answers requests from those files, kept in memory until the
+pointer changes, without DRF; a single versions query tells whether the
+snapshot is still current, and stale snapshots fall back to the live view.
+Writes never render here; `publish_public_snapshots --stale` (cron/worker)
+republishes the snapshots whose versions moved.
+"""
+import gzip
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.test import RequestFactory
+
+from .versioning import PROJECTS, SERVICES, VOLUNTEER_STATISTICS, get_versions
+
+
+# Files kept per endpoint (current + previous, for in-flight readers)
+KEEP_VERSIONS = 2
+
+_memory = {}
+_memory_lock = threading.Lock()
+
+
+def endpoint_views():
+    # Imported lazily to avoid a circular import with views
+    from . import views
+    return {
+        'public-projects': (views.public_projects, '/api/public-projects/'),
+        'public-home-stats': (views.public_home_stats, '/api/public-home-stats/'),
+        'public-services': (views.public_services_list, '/api/public-services/'),
+        'beneficiary-services': (views.beneficiary_services_list, '/api/beneficiary-services/'),
+        'public-volunteer-statistics': (views.public_volunteer_statistics, '/api/public-volunteer-statistics/'),
+    }
+
+
+SNAPSHOT_NAMES = [
+    'public-projects',
+    'public-home-stats',
+    'public-services',
+    'beneficiary-services',
+    'public-volunteer-statistics',
+]
+
+# Snapshot -> DataVersion keys of the data it is rendered from
+SNAPSHOT_VERSION_KEYS = {
+    'public-projects': [PROJECTS],
+    'public-home-stats': [PROJECTS],
+    'public-services': [SERVICES],
+    'beneficiary-services': [SERVICES],
+    'public-volunteer-statistics': [VOLUNTEER_STATISTICS],
+}
+
+def snapshot_dir():
+    return Path(getattr(settings, 'PUBLIC_SNAPSHOT_DIR', settings.BASE_DIR / 'public_snapshots'))
+
+
+def _write_atomic(path, data):
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _render(name):
+    """Render an endpoint through its view; None if it has nothing to publish"""
+    view, path = endpoint_views()[name]
+    response = view(RequestFactory().get(path))
+    if response.status_code != 200:
+        return None
+    response.render()
+    return response.content
+
+
+def publish(names=None):
+    """Render and write the given snapshots (all by default). Returns {name: version}"""
+    directory = snapshot_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    published = {}
+    for name in names or SNAPSHOT_NAMES:
+        # Read first so changes made while rendering leave the snapshot stale
+        source = source_versions(name)
+        body = _render(name)
+        pointer = directory / f'{name}.current'
+
+        if body is None:
+            # Endpoint currently returns nothing (e.g. 404) - stop serving the old file
+            pointer.unlink(missing_ok=True)
+            continue
+
+        version = hashlib.sha1(body).hexdigest()[:16]
+        _write_atomic(directory / f'{name}.{version}.json', body)
+        _write_atomic(directory / f'{name}.{version}.json.gz', gzip.compress(body, 9, mtime=0))
+        _write_atomic(pointer, f'{version} {source}'.encode('ascii'))
+        published[name] = version
+
+        _prune(directory, name, version)
+
+    return published
+
+
+def _prune(directory, name, current_version):
+    versions = sorted(
+        (p for p in directory.glob(f'{name}.*.json') if p.name.count('.') == 2),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for old in versions[KEEP_VERSIONS:]:
+        if old.name != f'{name}.{current_version}.json':
+            old.unlink(missing_ok=True)
+            old.with_name(old.name + '.gz').unlink(missing_ok=True)
+
+
+def source_versions(name):
+    """The current DataVersion values a snapshot depends on, as a string"""
+    return '.'.join(map(str, get_versions(*SNAPSHOT_VERSION_KEYS[name])))
+
+
+def load(name):
+    """
+    (version, body, gzip_body, source) for a published snapshot, or None.
+    Cached in memory; only the pointer file is stat()ed per call.
+    """
+    pointer = snapshot_dir() / f'{name}.current'
+    try:
+        mtime = pointer.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _memory.get(name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with _memory_lock:
+        try:
+            version, _, source = pointer.read_text().strip().partition(' ')
+            body = (snapshot_dir() / f'{name}.{version}.json').read_bytes()
+            gzip_body = (snapshot_dir() / f'{name}.{version}.json.gz').read_bytes()
+        except FileNotFoundError:
+            return None
+        _memory[name] = (mtime, (version, body, gzip_body, source))
+        return version, body, gzip_body, source
+
+
+def is_current(name, snapshot):
+    """True if the data a loaded snapshot was rendered from has not changed since"""
+    return snapshot[3] == source_versions(name)
+
+
+def stale_names(names):
+    """The given snapshots that are missing or no longer current"""
+    return [name for name in names if (snapshot := load(name)) is None or not is_current(name, snapshot)]
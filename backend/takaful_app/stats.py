@@ -0,0 +1,164 @@
+"""
+Shared statistics queries for dashboard and public endpoints.
+"""
+from django.db.models import Sum, Count, Q, Value, Exists, OuterRef
+from django.db.models.functions import Coalesce
+
+from .models import Project, Task
+from .reports import TASK_COMPLETED
+
+
+# Tasks that make their volunteer count as active
+ACTIVE_TASK_STATUSES = ['قيد التنفيذ', 'في الانتظار']
+
+
+def project_totals():
+    """
+    Every Project counter and sum used by admin_stats and public_home_stats,
+    computed in a single aggregate() query with filtered expressions.
+    """
+    totals = Project.objects.aggregate(
+        total_projects=Count('id'),
+        active_projects=Count('id', filter=Q(status='ACTIVE')),
+        completed_projects=Count('id', filter=Q(status='COMPLETED')),
+        potential_projects=Count('id', filter=~Q(status='CANCELLED')),
+        total_donations=Sum('donation_amount'),
+        total_beneficiaries=Sum('beneficiaries'),
+    )
+    totals['total_donations'] = totals['total_donations'] or 0
+    totals['total_beneficiaries'] = totals['total_beneficiaries'] or 0
+    return totals
+
+
+def volunteer_totals():
+    """
+    Approved volunteer counters used by volunteer_stats and the admin
+    dashboard: one aggregate over profiles (active = has an open task, as an
+    EXISTS subquery so the join does not inflate the hours sum) and one task
+    count.
+    """
+    from accounts.models import Profile
+
+    open_tasks = Task.objects.filter(volunteer=OuterRef('user'), status__in=ACTIVE_TASK_STATUSES)
+    totals = Profile.objects.filter(role='user', is_approved=True).aggregate(
+        total_volunteers=Count('id'),
+        active_volunteers=Count('id', filter=Q(Exists(open_tasks))),
+        total_hours=Sum('total_volunteer_hours'),
+    )
+    totals['total_hours'] = totals['total_hours'] or 0
+    totals['completed_tasks'] = Task.objects.filter(status=TASK_COMPLETED).count()
+    return totals
+
+
+# (label, lower bound inclusive, upper bound exclusive); None = unbounded
+AGE_BUCKETS = [
+    ('أقل من 18', None, 18),
+    ('18-24', 18, 25),
+    ('25-34', 25, 35),
+    ('35-44', 35, 45),
+    ('45-54', 45, 55),
+    ('55+', 55, None),
+]
+HOURS_BUCKETS = [
+    ('0', None, 1),
+    ('1-10', 1, 11),
+    ('11-50', 11, 51),
+    ('51-100', 51, 101),
+    ('101+', 101, None),
+]
+PARTICIPATION_BUCKETS = [
+    ('0', None, 1),
+    ('1-2', 1, 3),
+    ('3-5', 3, 6),
+    ('6-10', 6, 11),
+    ('11+', 11, None),
+]
+GENDERS = ['ذكر', 'أنثى']
+
+# Cities beyond the most common ones are folded into OTHER
+CITY_LIMIT = 10
+UNSPECIFIED = 'غير محدد'
+OTHER = 'أخرى'
+
+
+def _range_q(field, lower, upper):
+    q = Q()
+    if lower is not None:
+        q &= Q(**{f'{field}__gte': lower})
+    if upper is not None:
+        q &= Q(**{f'{field}__lt': upper})
+    return q
+
+
+def _bucket_counts(prefix, buckets, field):
+    return {
+        f'{prefix}_{index}': Count('id', filter=_range_q(field, lower, upper))
+        for index, (_, lower, upper) in enumerate(buckets)
+    }
+
+
+def _histogram(totals, prefix, buckets):
+    return [
+        {'label': label, 'count': totals[f'{prefix}_{index}']}
+        for index, (label, _, _) in enumerate(buckets)
+    ]
+
+
+def volunteer_distributions():
+    """
+    Volunteer histograms for the public volunteers page: gender, age, city,
+    completed hours and participations. Fixed buckets come from one aggregate
+    query and cities from one grouped query, so the payload size does not
+    depend on the number of volunteers.
+    """
+    from accounts.models import Profile
+
+    volunteers = Profile.objects.filter(role='user')
+
+    totals = volunteers.annotate(
+        hours=Coalesce('user__volunteer_stats__total_hours', Value(0)),
+        participations=Coalesce('user__volunteer_stats__participations_count', Value(0)),
+    ).aggregate(
+        total=Count('id'),
+        age_unspecified=Count('id', filter=Q(age__isnull=True)),
+        **{f'gender_{index}': Count('id', filter=Q(gender=gender)) for index, gender in enumerate(GENDERS)},
+        **_bucket_counts('age', AGE_BUCKETS, 'age'),
+        **_bucket_counts('hours', HOURS_BUCKETS, 'hours'),
+        **_bucket_counts('participations', PARTICIPATION_BUCKETS, 'participations'),
+    )
+
+    gender = [
+        {'label': label, 'count': totals[f'gender_{index}']}
+        for index, label in enumerate(GENDERS)
+    ]
+    gender.append({'label': UNSPECIFIED, 'count': totals['total'] - sum(item['count'] for item in gender)})
+
+    age = _histogram(totals, 'age', AGE_BUCKETS)
+    age.append({'label': UNSPECIFIED, 'count': totals['age_unspecified']})
+
+    cities = (
+        volunteers.order_by()
+        .values('city')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'city')
+    )
+    city = []
+    other = unspecified = 0
+    for row in cities:
+        if not row['city'].strip():
+            unspecified += row['count']
+        elif len(city) < CITY_LIMIT:
+            city.append({'label': row['city'], 'count': row['count']})
+        else:
+            other += row['count']
+    city.append({'label': OTHER, 'count': other})
+    city.append({'label': UNSPECIFIED, 'count': unspecified})
+
+    return {
+        'total_volunteers': totals['total'],
+        'gender': gender,
+        'age': age,
+        'city': city,
+        'hours': _histogram(totals, 'hours', HOURS_BUCKETS),
+        'participations': _histogram(totals, 'participations', PARTICIPATION_BUCKETS),
+    }
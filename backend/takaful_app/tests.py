@@ -1,3 +1,1098 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import tempfile
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import openpyxl
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.core.management import call_command
+from django.utils import timezone
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import BinaryField, ExpressionWrapper, F
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Profile
+
+from .models import AdminEvent, AdminReport, ReportJob, ThrottleBucket, Project, ProjectAssignment, Service, Suggestion, Task, WaterSupplyRequest, VolunteerStatistics, QuarterlyTarget
+from .rollups import _StatisticsTouch, rebuild as rebuild_rollups
+from .snapshots import load as load_snapshot, publish
+from .compression import body_cache, negotiate_encoding
+from .ingest import flush as flush_spool
+from .throttling import consume as consume_token
+from .versioning import VOLUNTEER_STATISTICS, get_version, model_key
+from .exports import XLSXRenderer
+from .fields import CompressedJSONField
+from .serializers import AdminReportSerializer
+from .reports import build_report_data, claim_next_job, create_report
+from . import events
+
+
+def seed_report_data(size):
+    """size approved volunteers and projects, each project with assignments and tasks"""
+    volunteers = []
+    for i in range(size):
+        user = User.objects.create_user(f'volunteer{i}', f'volunteer{i}@takaful.com', 'pass123')
+        user.profile.name = f'متطوع {i}'
+        user.profile.is_approved = True
+        user.profile.total_volunteer_hours = i
+        user.profile.save()
+        volunteers.append(user)
+
+    statuses = ['قيد التنفيذ', 'مكتملة', 'في الانتظار', 'معلقة']
+    priorities = ['عالية', 'متوسطة', 'منخفضة']
+    for j in range(size):
+        project = Project.objects.create(
+            title=f'مشروع {j}', category=['تعليم', 'صحة', ''][j % 3],
+            status=['ACTIVE', 'COMPLETED', 'PLANNED', 'CANCELLED'][j % 4],
+            beneficiaries=j, donation_amount=j * 10, progress=j,
+        )
+        for user in volunteers[:j % 3]:
+            ProjectAssignment.objects.create(project=project, user=user)
+        for k in range(j % 4):
+            Task.objects.create(
+                title=f'مهمة {j}-{k}', project=project, volunteer=volunteers[(j + k) % size] if k else None,
+                status=statuses[(j + k) % 4], priority=priorities[k % 3], due_date=date(2020, 1, 1),
+            )
+
+
+def reference_report_data():
+    """The report sections computed row by row, as generate_report originally did"""
+    projects = Project.objects.all()
+    projects_list = []
+    for project in projects:
+        tasks = Task.objects.filter(project=project)
+        total, completed = tasks.count(), tasks.filter(status='مكتملة').count()
+        progress = int(completed / total * 100) if total else project.progress
+        projects_list.append({
+            'id': project.id, 'progress': progress, 'completion_rate': progress, 'tasks_total': total,
+            'tasks_completed': completed, 'volunteers_assigned': project.assignments.count(),
+        })
+
+    volunteers = User.objects.filter(profile__role='user', profile__is_approved=True)
+    volunteers_list = []
+    for volunteer in volunteers:
+        open_tasks = volunteer.assigned_tasks.exclude(status='مكتملة')
+        volunteers_list.append({
+            'id': volunteer.id,
+            'tasks_completed': volunteer.assigned_tasks.filter(status='مكتملة').count(),
+            'tasks_in_progress': open_tasks.count(),
+            'current_projects': sorted({task.project.title for task in open_tasks}),
+        })
+
+    return {
+        'by_status': {
+            status.lower(): projects.filter(status=status).count()
+            for status in ['ACTIVE', 'COMPLETED', 'PLANNED', 'CANCELLED']
+        },
+        'by_category': {
+            category: projects.filter(category=category).count()
+            for category in projects.exclude(category='').values_list('category', flat=True).distinct()
+        },
+        'projects': projects_list,
+        'volunteers': volunteers_list,
+        'overdue': set(Task.objects.exclude(status='مكتملة').values_list('id', flat=True)),
+    }
+
+
+class ReportBuilderTests(TestCase):
+    """build_report_data matches the row-by-row builder with a fixed number of queries"""
+
+    def build(self):
+        with self.assertNumQueries(8):  # 3 project, 3 volunteer and 2 task queries
+            report_data, _ = build_report_data()
+        by_id = lambda rows: sorted(rows, key=lambda row: row['id'])
+        reference = reference_report_data()
+
+        self.assertEqual(report_data['projects']['by_status'], reference['by_status'])
+        self.assertEqual(report_data['projects']['by_category'], reference['by_category'])
+        self.assertEqual(
+            [{key: row[key] for key in reference['projects'][0]} for row in by_id(report_data['projects']['list'])],
+            by_id(reference['projects']),
+        )
+        self.assertEqual(
+            [
+                {**{key: row[key] for key in reference['volunteers'][0]}, 'current_projects': sorted(row['current_projects'])}
+                for row in by_id(report_data['volunteers']['list'])
+            ],
+            by_id(reference['volunteers']),
+        )
+        overdue = {task['id'] for task in report_data['tasks']['overdue']}
+        self.assertEqual(len(overdue), min(len(reference['overdue']), 10))  # Top 10
+        self.assertLessEqual(overdue, reference['overdue'])
+        return report_data
+
+    def test_matches_row_by_row_builder(self):
+        seed_report_data(6)
+        report_data = self.build()
+        self.assertEqual(report_data['summary']['total_projects'], 6)
+        self.assertEqual(report_data['summary']['total_volunteer_hours'], sum(range(6)))
+
+    def test_query_count_does_not_grow_with_data(self):
+        seed_report_data(12)
+        self.build()
+
+
+class ReportJobTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        self.admin.profile.role = 'admin'
+        self.admin.profile.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_queued_job_is_run_by_worker(self):
+        Project.objects.create(title='مشروع', beneficiaries=7)
+        response = self.client.post('/api/admin/reports/generate/', {'async': True, 'date_from': '2020-01-01'}, format='json')
+        self.assertEqual(response.status_code, 202)
+        job_url = f"/api/admin/reports/jobs/{response.data['job_id']}/"
+        self.assertEqual(self.client.get(job_url).data['status'], 'queued')
+
+        call_command('run_report_worker', once=True, stdout=StringIO())
+        job = self.client.get(job_url).data
+        self.assertEqual((job['status'], job['progress']), ('done', 100))
+        self.assertEqual(AdminReport.objects.get(id=job['report']).report_data['summary']['total_beneficiaries'], 7)
+
+    def test_abandoned_running_job_is_failed(self):
+        job = ReportJob.objects.create(admin=self.admin, status='running', started_at=timezone.now() - timedelta(hours=1))
+        self.assertIsNone(claim_next_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIsNotNone(job.finished_at)
+
+    def test_invalid_dates_are_rejected(self):
+        for body in ({'date_from': 'أمس', 'async': True}, {'date_to': '2026-02-30'}):
+            self.assertEqual(self.client.post('/api/admin/reports/generate/', body, format='json').status_code, 400)
+        self.assertFalse(ReportJob.objects.exists())
+
+
+class LiteReportListingTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        self.admin.profile.role = 'admin'
+        self.admin.profile.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        for i in range(5):
+            create_report(self.admin, title=f'تقرير {i}')
+
+    def test_lite_pages_skip_report_data(self):
+        with CaptureQueriesContext(connection) as queries:
+            page = self.client.get('/api/admin/reports/?lite=1&page_size=2').data
+        self.assertNotIn('report_data', ' '.join(query['sql'] for query in queries.captured_queries))
+        self.assertEqual([report['title'] for report in page['results']], ['تقرير 4', 'تقرير 3'])
+        self.assertNotIn('report_data', page['results'][0])
+
+        titles = [report['title'] for report in page['results']]
+        while page['next']:
+            page = self.client.get(page['next']).data
+            titles += [report['title'] for report in page['results']]
+        self.assertEqual(titles, [f'تقرير {i}' for i in reversed(range(5))])
+
+    def test_full_list_by_default(self):
+        reports = self.client.get('/api/admin/reports/').data['results']
+        self.assertEqual(len(reports), 5)
+        self.assertIn('summary', reports[0]['report_data'])
+
+
+class CompressedReportDataTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        self.admin.profile.role = 'admin'
+        self.admin.profile.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_report_data_round_trip(self):
+        data = {'summary': {'title': 'تقرير', 'total': 3}, 'list': [{'id': 1, 'value': 1.5}, None]}
+        report = AdminReport.objects.create(admin=self.admin, title='تقرير', report_data=data)
+        self.assertEqual(AdminReport.objects.get(id=report.id).report_data, data)
+
+        stored = AdminReport.objects.filter(id=report.id).values_list(
+            ExpressionWrapper(F('report_data'), output_field=BinaryField()), flat=True
+        ).get()
+        self.assertEqual(CompressedJSONField.decompress(stored), data)
+
+    def test_detail_is_streamed_from_the_compressed_column(self):
+        Project.objects.create(title='مشروع')
+        report = create_report(self.admin)
+        response = self.client.get(f'/api/admin/reports/{report.id}/')
+        self.assertTrue(response.streaming)
+        body = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(body, json.loads(json.dumps(AdminReportSerializer(report).data)))
+        self.assertEqual(body['report_data']['summary']['total_projects'], 1)
+
+        self.assertEqual(self.client.get('/api/admin/reports/999/').status_code, 404)
+
+
+class ReportReuseTests(TestCase):
+    def setUp(self):
+        self.admins = []
+        for name in ('admin', 'admin2'):
+            admin = User.objects.create_user(name, f'{name}@takaful.com', 'admin123')
+            admin.profile.role = 'admin'
+            admin.profile.save()
+            self.admins.append(admin)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admins[0])
+
+    def generate(self, **body):
+        return self.client.post('/api/admin/reports/generate/', {'date_from': '2020-01-01', **body}, format='json')
+
+    def test_unchanged_data_reuses_report(self):
+        first = self.generate()
+        second = self.generate()
+        self.assertEqual((first.status_code, second.status_code), (201, 200))
+        self.assertEqual(first.data['report']['id'], second.data['report']['id'])
+        self.assertTrue(second.data['reused'])
+
+        # A different range is a different report
+        self.assertEqual(self.generate(date_to='2030-01-01').status_code, 201)
+
+    def test_other_admin_gets_a_clone(self):
+        first = self.generate()
+        self.client.force_authenticate(self.admins[1])
+        clone = self.generate()
+        self.assertTrue(clone.data['reused'])
+        self.assertNotEqual(clone.data['report']['id'], first.data['report']['id'])
+        self.assertEqual(clone.data['report']['admin'], self.admins[1].id)
+
+    def test_data_change_rebuilds_report(self):
+        self.generate()
+        Project.objects.create(title='مشروع جديد')
+        response = self.generate()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['report']['total_projects'], 1)
+
+
+class ReportExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        cls.admin.profile.role = 'admin'
+        cls.admin.profile.save()
+        seed_report_data(4)
+        cls.report = create_report(cls.admin)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, query):
+        # Rows are parsed from the compressed column; report_data is never decoded whole
+        with mock.patch.object(CompressedJSONField, 'decompress', side_effect=AssertionError):
+            response = self.client.get(f'/api/admin/reports/{self.report.id}/export/{query}')
+            return response, b''.join(response.streaming_content)
+
+    def test_csv_sheet(self):
+        response, body = self.export('?format=csv&sheet=volunteers')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(StringIO(body.decode('utf-8-sig'))))
+        self.assertEqual(rows[0][1], 'اسم المتطوع')
+        names = [volunteer['name'] for volunteer in self.report.report_data['volunteers']['list']]
+        self.assertEqual([row[1] for row in rows[1:]], names)
+
+    def test_xlsx_workbook(self):
+        response, body = self.export('?format=xlsx')
+        self.assertEqual(response['Content-Type'], XLSXRenderer.media_type)
+        workbook = openpyxl.load_workbook(BytesIO(body))
+        self.assertEqual(workbook.sheetnames, ['المشاريع', 'المتطوعون', 'المهام', 'المهام المتأخرة'])
+        self.assertEqual(workbook['المشاريع'].max_row, 5)  # Header + 4 projects
+        self.assertEqual(workbook['المهام']['B4'].value, self.report.report_data['tasks']['by_status']['completed'])
+
+    def test_errors_are_json(self):
+        self.assertEqual(self.client.get(f'/api/admin/reports/{self.report.id}/export/?format=csv&sheet=x').status_code, 400)
+        response = self.client.get('/api/admin/reports/999/export/?format=csv')
+        self.assertEqual((response.status_code, response['Content-Type']), (404, 'application/json'))
+
+
+class ReportDiffTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        self.admin.profile.role = 'admin'
+        self.admin.profile.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.project = Project.objects.create(title='مشروع', status='ACTIVE')
+        self.task = Task.objects.create(title='مهمة', project=self.project, due_date=date(2020, 1, 1))
+
+    def test_changes_since_previous_report_of_the_same_kind(self):
+        base = create_report(self.admin)
+        create_report(self.admin, date_from='2020-01-01')  # Other range
+        create_report(self.admin, is_snapshot=True)  # Scheduled snapshot
+        Task.objects.create(title='مهمة متأخرة', project=self.project, due_date=date(2020, 1, 1))
+        self.project.status = 'COMPLETED'
+        self.project.save()
+        report = create_report(self.admin)
+
+        diff = self.client.get(f'/api/admin/reports/{report.id}/diff/').data
+        self.assertEqual(diff['base']['id'], base.id)
+        changes = diff['changes']
+        self.assertEqual(changes['summary_delta']['total_tasks'], 1)
+        self.assertEqual(
+            [(p['status_before'], p['status_after']) for p in changes['projects']['changed']],
+            [('ACTIVE', 'COMPLETED')],
+        )
+        self.assertEqual([task['title'] for task in changes['tasks']['newly_overdue']], ['مهمة متأخرة'])
+
+    def test_missing_or_invalid_base(self):
+        report = create_report(self.admin)
+        self.assertEqual(self.client.get(f'/api/admin/reports/{report.id}/diff/').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/admin/reports/{report.id}/diff/?base=abc').status_code, 400)
+        self.assertEqual(self.client.get(f'/api/admin/reports/{report.id}/diff/?base={report.id}').status_code, 200)
+
+
+class ReportSnapshotRetentionTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        self.admin.profile.role = 'admin'
+        self.admin.profile.save()
+        self.noon = timezone.localtime().replace(hour=12, minute=0, second=0, microsecond=0)
+
+    def report(self, days_ago, hour=12, is_snapshot=True):
+        report = AdminReport.objects.create(admin=self.admin, title='لقطة', report_data={}, is_snapshot=is_snapshot)
+        generated_at = self.noon.replace(hour=hour) - timedelta(days=days_ago)
+        AdminReport.objects.filter(id=report.id).update(generated_at=generated_at)
+        return report.id
+
+    def test_daily_weekly_and_monthly_snapshots_are_kept(self):
+        kept = {self.report(days) for days in (1, 2, 29)}
+        kept |= {self.report(100), self.report(400), self.report(800)}
+        kept.add(self.report(800, is_snapshot=False))  # Manual reports are never deleted
+        dropped = {self.report(100, hour=11), self.report(400, hour=11)}  # Older in the same week / month
+
+        call_command('snapshot_reports', stdout=StringIO())
+        today = AdminReport.objects.filter(is_snapshot=True).exclude(id__in=kept | dropped).get()
+        self.assertEqual(set(AdminReport.objects.values_list('id', flat=True)), kept | {today.id})
+
+        # Today's snapshot is created once
+        call_command('snapshot_reports', stdout=StringIO())
+        self.assertEqual(AdminReport.objects.count(), len(kept) + 1)
+
+
+class ProjectStatsQueryTests(TestCase):
+    """admin_stats and public_home_stats compute every counter in one aggregate query"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        cls.admin.profile.role = 'admin'
+        cls.admin.profile.save()
+
+        statuses = ['ACTIVE', 'COMPLETED', 'PLANNED', 'CANCELLED']
+        Project.objects.bulk_create([
+            Project(title=f'مشروع {i}', status=statuses[i % 4], beneficiaries=10, donation_amount=100)
+            for i in range(40)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def test_admin_stats_single_query(self):
+        self.client.force_authenticate(self.admin)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/admin/stats/')
+
+        self.assertEqual(response.data, {
+            'total_donations': 4000.0,
+            'total_beneficiaries': 400,
+            'active_projects': 10,
+            'completed_projects': 10,
+            'total_projects': 40,
+        })
+
+    def test_public_home_stats_single_query(self):
+        # Version lookup + aggregate when cold, version lookup only when cached
+        with self.assertNumQueries(2):
+            self.client.get('/api/public-home-stats/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/public-home-stats/')
+
+        self.assertEqual(response.data, {
+            'beneficiaries': 400,
+            'potential_projects': 30,
+            'donations': 4000.0,
+        })
+
+
+class PublicCacheTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def test_service_change_invalidates_cached_list(self):
+        Service.objects.create(title='خدمة 1', service_type='للمستفيدين')
+        self.assertEqual(len(self.client.get('/api/beneficiary-services/').data['results']), 1)
+
+        Service.objects.create(title='خدمة 2', service_type='للمستفيدين')
+        self.assertEqual(len(self.client.get('/api/beneficiary-services/').data['results']), 2)
+
+    def test_project_change_invalidates_home_stats(self):
+        self.client.get('/api/public-home-stats/')
+        Project.objects.create(title='مشروع', beneficiaries=5)
+
+        response = self.client.get('/api/public-home-stats/')
+        self.assertEqual(response.data['beneficiaries'], 5)
+
+    def test_volunteer_statistics_year_validation_and_etag(self):
+        VolunteerStatistics.objects.create(year=2024, total_hours=10)
+        latest = self.client.get('/api/public-volunteer-statistics/')
+        by_year = self.client.get('/api/public-volunteer-statistics/?year=2024')
+        self.assertEqual(latest.data['total_hours'], by_year.data['total_hours'])
+        self.assertNotEqual(latest['ETag'], by_year['ETag'])  # Different cache entries
+
+        self.assertEqual(self.client.get('/api/public-volunteer-statistics/?year=abc').status_code, 400)
+
+
+class PublicSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.snapshot_dir.cleanup)
+        Project.objects.create(title='مشروع', status='ACTIVE', beneficiaries=5)
+
+    def test_serves_published_snapshot(self):
+        with override_settings(PUBLIC_SNAPSHOT_DIR=self.snapshot_dir.name):
+            publish(['public-projects'])
+
+            response = self.client.get('/api/public-snapshots/public-projects.json', HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(json.loads(gzip.decompress(response.content))[0]['title'], 'مشروع')
+
+            response = self.client.get('/api/public-snapshots/public-projects.json', HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+    def test_falls_back_to_live_endpoint(self):
+        with override_settings(PUBLIC_SNAPSHOT_DIR=self.snapshot_dir.name):
+            response = self.client.get('/api/public-snapshots/public-projects.json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data[0]['title'], 'مشروع')
+
+            self.assertEqual(self.client.get('/api/public-snapshots/unknown.json').status_code, 404)
+
+    def test_stale_snapshot_is_not_served(self):
+        with override_settings(PUBLIC_SNAPSHOT_DIR=self.snapshot_dir.name):
+            publish(['public-projects'])
+            Project.objects.create(title='مشروع جديد', status='ACTIVE')
+
+            response = self.client.get('/api/public-snapshots/public-projects.json', HTTP_ACCEPT_ENCODING='gzip;q=0')
+            self.assertNotIn('Content-Encoding', response)
+            self.assertEqual(len(response.json()), 2)
+
+    def test_stale_command_republishes_only_stale_snapshots(self):
+        with override_settings(PUBLIC_SNAPSHOT_DIR=self.snapshot_dir.name):
+            publish(['public-projects', 'public-services'])
+            services = load_snapshot('public-services')
+            with self.captureOnCommitCallbacks(execute=True):
+                Project.objects.create(title='مشروع جديد', status='ACTIVE')
+            self.assertEqual(len(json.loads(load_snapshot('public-projects')[1])), 1)  # Writes never render
+
+            call_command('publish_public_snapshots', 'public-projects', 'public-services', '--stale', stdout=StringIO())
+
+            self.assertEqual(len(json.loads(load_snapshot('public-projects')[1])), 2)
+            self.assertEqual(load_snapshot('public-services')[0], services[0])
+            response = self.client.get('/api/public-snapshots/public-projects.json', HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+class VolunteerStatsSnapshotTests(TestCase):
+    def setUp(self):
+        self.volunteer = User.objects.create_user('volunteer', 'volunteer@takaful.com', 'pass123')
+        self.project = Project.objects.create(title='مشروع')
+
+    def get_stats(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/public-volunteers-stats/')
+        return response.json()[0]
+
+    def test_counters_follow_task_changes(self):
+        task = Task.objects.create(title='مهمة', project=self.project, volunteer=self.volunteer, hours=4)
+        Task.objects.create(title='ملغاة', project=self.project, volunteer=self.volunteer, status='ملغاة')
+        self.assertEqual(self.get_stats()['participations_count'], 1)
+
+        task.status = 'مكتملة'
+        task.save()
+        stats = self.get_stats()
+        self.assertEqual((stats['total_hours'], stats['successes_count']), (4, 1))
+
+        task.delete()
+        stats = self.get_stats()
+        self.assertEqual((stats['total_hours'], stats['participations_count'], stats['successes_count']), (0, 0, 0))
+
+
+class VolunteerDistributionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for index, (gender, age, city) in enumerate([('ذكر', 20, 'الرياض'), ('أنثى', 30, 'الرياض'), ('', None, '')]):
+            user = User.objects.create_user(f'volunteer{index}', f'volunteer{index}@takaful.com', 'pass123')
+            user.profile.gender, user.profile.age, user.profile.city = gender, age, city
+            user.profile.save()
+
+    def test_histograms(self):
+        data = self.client.get('/api/public-volunteers-distribution/').json()
+
+        self.assertEqual(data['total_volunteers'], 3)
+        self.assertEqual([item['count'] for item in data['gender']], [1, 1, 1])
+        self.assertEqual(data['city'][0], {'label': 'الرياض', 'count': 2})
+        self.assertEqual(data['hours'][0]['count'], 3)
+        for histogram in ('gender', 'age', 'city', 'hours', 'participations'):
+            self.assertEqual(sum(item['count'] for item in data[histogram]), 3)
+
+
+class ProjectListingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Project.objects.bulk_create([
+            Project(title=f'مشروع {i}', desc='وصف طويل ' * 50, progress=i)
+            for i in range(5)
+        ])
+
+    def test_full_list_by_default(self):
+        data = self.client.get('/api/public-projects/').json()
+        self.assertEqual(len(data), 5)
+        self.assertIn('desc', data[0])
+
+    def test_fields_projection_with_cursor_pagination(self):
+        with self.assertNumQueries(2):  # ETag aggregate + page
+            response = self.client.get('/api/public-projects/?fields=id,title,progress&page_size=2')
+
+        data = response.json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertEqual(set(data['results'][0]), {'id', 'title', 'progress'})
+        self.assertIsNotNone(data['next'])
+
+
+class CompressionMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Project.objects.bulk_create([Project(title=f'مشروع {i}', desc='وصف ' * 100) for i in range(10)])
+
+    def setUp(self):
+        cache.clear()
+        body_cache.clear()
+
+    def test_negotiation(self):
+        self.assertEqual(negotiate_encoding('gzip;q=0'), None)
+        self.assertEqual(negotiate_encoding('deflate, gzip'), 'gzip')
+        self.assertEqual(negotiate_encoding(''), None)
+
+    def test_gzip_body_compressed_once(self):
+        response = self.client.get('/api/public-projects/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 10)
+        self.assertEqual(len(body_cache), 1)
+
+        self.client.get('/api/public-projects/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(len(body_cache), 1)
+
+    def test_small_bodies_not_compressed(self):
+        response = self.client.get('/api/public-home-stats/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @override_settings(COMPRESSION_MIN_LENGTH=1)
+    def test_token_responses_not_compressed(self):
+        User.objects.create_user('volunteer@takaful.com', 'volunteer@takaful.com', 'pass123')
+        response = self.client.post(
+            '/api/accounts/auth/token/', {'username': 'volunteer@takaful.com', 'password': 'pass123'},
+            HTTP_ACCEPT_ENCODING='gzip',
+        )
+        self.assertIn('no-store', response['Cache-Control'])
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.client.post(
+            '/api/accounts/auth/token/refresh/', {'refresh': response.json()['refresh']},
+            HTTP_ACCEPT_ENCODING='gzip',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class TaskRollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(title='مشروع')
+        self.volunteers = [
+            User.objects.create_user(f'volunteer{i}', f'volunteer{i}@takaful.com', 'pass123')
+            for i in range(2)
+        ]
+
+    def test_live_actuals_follow_task_completion(self):
+        year = timezone.localtime().year
+        quarter = (timezone.localtime().month - 1) // 3 + 1
+        statistics = VolunteerStatistics.objects.create(year=year, total_hours=999)
+        QuarterlyTarget.objects.create(statistics=statistics, quarter=quarter, hours_target=100)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first = Task.objects.create(title='مهمة 1', project=self.project, volunteer=self.volunteers[0], hours=3)
+            Task.objects.create(title='مهمة 2', project=self.project, volunteer=self.volunteers[0], hours=2, status='مكتملة')
+            Task.objects.create(title='مهمة 3', project=self.project, volunteer=self.volunteers[1], hours=4, status='مكتملة')
+            first.status = 'مكتملة'
+            first.save()
+
+        data = self.client.get('/api/public-volunteer-statistics/').json()
+        self.assertEqual((data['total_hours'], data['total_volunteers']), (9, 2))
+        self.assertEqual(data['quarterly_targets'][0]['hours_actual'], 9)
+        self.assertEqual(data['top_volunteers'][0]['hours'], 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        data = self.client.get('/api/public-volunteer-statistics/').json()
+        self.assertEqual(data['total_hours'], 6)
+
+        rebuild_rollups()
+        self.assertEqual(self.client.get('/api/public-volunteer-statistics/').json()['total_hours'], 6)
+
+    def test_statistics_touched_once_per_transaction(self):
+        VolunteerStatistics.objects.create(year=timezone.localtime().year)
+        version = get_version(VOLUNTEER_STATISTICS)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            for i in range(3):
+                Task.objects.create(title=f'مهمة {i}', project=self.project, volunteer=self.volunteers[0], hours=1, status='مكتملة')
+
+        self.assertEqual(sum(isinstance(c, _StatisticsTouch) for c in callbacks), 1)
+        self.assertEqual(get_version(VOLUNTEER_STATISTICS), version + 1)
+
+
+class PublicWriteThrottleTests(TestCase):
+    THROTTLE = {'SCOPES': {'public-suggestion': {'capacity': 2, 'refill_per_minute': 1}}}
+
+    def setUp(self):
+        cache.clear()
+
+    def submit(self, ip='10.0.0.1'):
+        return self.client.post(
+            '/api/public-suggestions/',
+            {'title': 'اقتراح', 'description': 'وصف'},
+            content_type='application/json',
+            REMOTE_ADDR=ip,
+        )
+
+    def test_bucket_exhaustion_returns_429(self):
+        for backend in ('cache', 'db'):
+            cache.clear()
+            with override_settings(PUBLIC_THROTTLE={**self.THROTTLE, 'BACKEND': backend}):
+                ip = f'10.0.0.{len(backend)}'
+                self.assertEqual(self.submit(ip).status_code, 201)
+                self.assertEqual(self.submit(ip).status_code, 201)
+
+                response = self.submit(ip)
+                self.assertEqual(response.status_code, 429)
+                self.assertEqual(response['Retry-After'], '60')
+
+                # Buckets are per client
+                self.assertEqual(self.submit(f'10.0.1.{len(backend)}').status_code, 201)
+
+    def test_spoofed_forwarded_for_does_not_reset_bucket(self):
+        # The proxy appends the real client address to whatever the client sent
+        with override_settings(PUBLIC_THROTTLE={**self.THROTTLE, 'BACKEND': 'db'}):
+            statuses = [
+                self.client.post(
+                    '/api/public-suggestions/', {'title': 'اقتراح', 'description': 'وصف'},
+                    content_type='application/json', REMOTE_ADDR='10.1.0.1',
+                    HTTP_X_FORWARDED_FOR=f'203.0.113.{i}, 198.51.100.7',
+                ).status_code
+                for i in range(4)
+            ]
+        self.assertEqual(statuses, [201, 201, 429, 429])
+        self.assertEqual(
+            list(ThrottleBucket.objects.values_list('key', flat=True)),
+            ['throttle:public-suggestion:198.51.100.7'],
+        )
+
+    def test_cache_failure_warns_once_per_interval(self):
+        with mock.patch('takaful_app.throttling.cache.get', side_effect=ConnectionError), \
+                mock.patch('takaful_app.throttling._last_cache_warning', 0.0), \
+                self.assertLogs('takaful_app.throttling', 'WARNING') as logs:
+            for _ in range(3):
+                self.assertTrue(consume_token('throttle:test:10.0.0.9', 5, 1.0)[0])
+        self.assertEqual(len(logs.records), 1)
+
+    def test_benchmark_only_removes_its_own_buckets(self):
+        cache.set('throttle:public-suggestion:10.0.0.1', (0, 0))
+        ThrottleBucket.objects.create(key='throttle:public-suggestion:10.0.0.1')
+        call_command('benchmark_throttle', requests=20, clients=2, stdout=StringIO())
+        self.assertIsNotNone(cache.get('throttle:public-suggestion:10.0.0.1'))
+        self.assertEqual(list(ThrottleBucket.objects.values_list('key', flat=True)), ['throttle:public-suggestion:10.0.0.1'])
+
+
+class SpooledIngestionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        spool = tempfile.TemporaryDirectory()
+        self.addCleanup(spool.cleanup)
+        self.spool_dir = spool.name
+
+    def test_spooled_submissions_are_flushed_in_bulk(self):
+        with override_settings(PUBLIC_INGEST_MODE='spool', PUBLIC_INGEST_SPOOL_DIR=self.spool_dir):
+            references = [
+                self.client.post(
+                    '/api/public-suggestions/',
+                    {'title': f'اقتراح {i}', 'description': 'وصف'},
+                    content_type='application/json',
+                    REMOTE_ADDR=f'10.1.0.{i}',
+                ).json()['reference']
+                for i in range(3)
+            ]
+            self.assertFalse(Suggestion.objects.exists())
+
+            version = get_version(model_key(Suggestion))
+            flushed, skipped = flush_spool()
+            self.assertEqual(get_version(model_key(Suggestion)), version + 1)  # Cached counts are invalidated
+
+        self.assertEqual((flushed, skipped), ({'suggestion': 3}, 0))
+        self.assertEqual(
+            sorted(str(ref) for ref in Suggestion.objects.values_list('submission_ref', flat=True)),
+            sorted(references),
+        )
+
+
+class WaterSupplyDuplicateTests(TestCase):
+    PAYLOAD = {
+        'applicantName': 'أحمد',
+        'mobileNumber': '0551234567',
+        'applicantRole': 'إمام',
+        'mosqueName': 'مسجد الإمام أحمد',
+        'neighborhood': 'حي الروضة',
+        'locationLink': 'https://maps.google.com/?q=24.7,46.6',
+        'worshippersCount': '100',
+        'donorExists': 'لا',
+    }
+
+    def setUp(self):
+        cache.clear()
+
+    def submit(self, **overrides):
+        return self.client.post(
+            '/api/public-water-supply-request/', {**self.PAYLOAD, **overrides}, content_type='application/json',
+        )
+
+    def test_open_duplicate_returns_original_reference(self):
+        first = self.submit()
+        self.assertEqual(first.status_code, 201)
+
+        # Same request with spelling variants, diacritics and another phone format
+        second = self.submit(mosqueName='مَسجد الامام احمد', neighborhood='حي الروضه', mobileNumber='+966 55 123 4567')
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(second.json()['duplicate'])
+        self.assertEqual(second.json()['reference'], first.json()['reference'])
+        self.assertEqual(WaterSupplyRequest.objects.count(), 1)
+
+        WaterSupplyRequest.objects.update(status='COMPLETED')
+        self.assertEqual(self.submit().status_code, 201)
+
+    def test_cluster_command_links_existing_duplicates(self):
+        self.submit()
+        WaterSupplyRequest.objects.update(status='COMPLETED', fingerprint='')
+        self.submit(mosqueName='مسجد الأمام أحمد')
+
+        call_command('cluster_water_requests', stdout=StringIO())
+
+        original, duplicate = WaterSupplyRequest.objects.order_by('created_at', 'id')
+        self.assertIsNone(original.duplicate_of_id)
+        self.assertEqual(duplicate.duplicate_of_id, original.id)
+        self.assertEqual(original.fingerprint, duplicate.fingerprint)
+
+
+class AdminDashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        cls.admin.profile.role = 'admin'
+        cls.admin.profile.save()
+        User.objects.create_user('pending', 'pending@takaful.com', 'pass123')
+        Project.objects.create(title='مخطط', status='PLANNED', beneficiaries=3)
+        Project.objects.create(title='نشط', status='ACTIVE', beneficiaries=5)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_sections_match_standalone_endpoints(self):
+        # Version lookup + 5 section queries when cold, version lookup only when cached
+        with self.assertNumQueries(6):
+            self.client.get('/api/admin/dashboard/')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/admin/dashboard/')
+
+        self.assertEqual(response.data['stats'], self.client.get('/api/admin/stats/').data)
+        self.assertEqual(response.data['volunteer_stats'], self.client.get('/api/admin/volunteer-stats/').data)
+        self.assertEqual(
+            response.data['volunteer_requests'], self.client.get('/api/admin/volunteer-requests/?limit=4').data,
+        )
+        self.assertEqual(response.data['active_project']['title'], 'نشط')
+
+        response = self.client.get('/api/admin/dashboard/?status=متوقف')
+        self.assertEqual(response.data['active_project']['title'], 'مخطط')
+
+    def test_sections_invalidate_independently(self):
+        self.client.get('/api/admin/dashboard/')
+
+        Project.objects.create(title='جديد', status='ACTIVE', beneficiaries=2)
+        # Only the two project sections are recomputed
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/admin/dashboard/')
+        self.assertEqual(response.data['stats']['total_beneficiaries'], 10)
+        self.assertEqual(response.data['active_project']['title'], 'جديد')
+
+        User.objects.create_user('pending2', 'pending2@takaful.com', 'pass123')
+        response = self.client.get('/api/admin/dashboard/')
+        self.assertEqual(len(response.data['volunteer_requests']['results']), 2)
+
+
+class ProjectCountersTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(title='مشروع', progress=40)
+        self.volunteer = User.objects.create_user('volunteer', 'volunteer@takaful.com', 'pass123')
+
+    def counters(self, project=None):
+        project = Project.objects.get(pk=(project or self.project).pk)
+        return [getattr(project, name) for name in Project.COUNTER_FIELDS]
+
+    def test_counters_follow_task_and_assignment_writes(self):
+        self.assertEqual(Project.objects.get(pk=self.project.pk).completion_progress, 40)
+
+        tasks = [Task.objects.create(title=f'مهمة {i}', project=self.project) for i in range(3)]
+        tasks[0].status = 'مكتملة'
+        tasks[0].save()
+        assignment = ProjectAssignment.objects.create(project=self.project, user=self.volunteer)
+        self.assertEqual(self.counters(), [3, 1, 1, 33])
+
+        # Saving a stale instance keeps the counters
+        self.project.title = 'مشروع معدل'
+        self.project.save()
+        self.assertEqual(self.counters(), [3, 1, 1, 33])
+
+        other = Project.objects.create(title='آخر')
+        tasks[1].project = other
+        tasks[1].save()
+        tasks[2].delete()
+        assignment.delete()
+        self.assertEqual(self.counters(), [1, 1, 0, 100])
+        self.assertEqual(self.counters(other), [1, 0, 0, 0])
+
+    def test_verify_command_repairs_drift(self):
+        Task.objects.create(title='مهمة', project=self.project, status='مكتملة')
+        Task.objects.bulk_create([Task(title='جماعية', project=self.project)])  # Bypasses signals
+
+        out = StringIO()
+        call_command('verify_project_counters', stdout=out)
+        self.assertIn('1 projects drifted', out.getvalue())
+        self.assertEqual(self.counters(), [1, 1, 0, 100])
+
+        call_command('verify_project_counters', '--repair', stdout=StringIO())
+        self.assertEqual(self.counters(), [2, 1, 0, 50])
+
+    def test_progress_report_keeps_manual_progress(self):
+        admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        admin.profile.role = 'admin'
+        admin.profile.save()
+        self.project.status = 'ACTIVE'
+        self.project.save()
+        Task.objects.create(title='مهمة', project=self.project, status='مكتملة')
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = client.get('/api/admin/reports/projects-progress/')
+        self.assertEqual(response.data['projects'], [{'name': 'مشروع', 'progress': 40}])
+
+
+@override_settings(ADMIN_EVENTS={'POLL_INTERVAL': 0.05, 'HEARTBEAT': 0.2, 'WSGI_RETRY': 5})
+class AdminEventStreamTests(TransactionTestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        self.admin.profile.role = 'admin'
+        self.admin.profile.save()
+        self.project = Project.objects.create(title='مشروع')
+
+    def poll(self, last_id=None):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        headers = {'HTTP_LAST_EVENT_ID': str(last_id)} if last_id is not None else {}
+        response = client.get('/api/admin/events/', HTTP_ACCEPT='text/event-stream', **headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_wsgi_short_poll_returns_missed_events(self):
+        body = self.poll()
+        self.assertTrue(body.startswith('retry: 5000\n\n'))
+        last_id = int(body.split('id: ')[1])
+
+        task = Task.objects.create(title='مهمة', project=self.project)
+        task.status = 'مكتملة'
+        task.save()
+        with mock.patch.object(events.broker, 'subscribe') as subscribe:
+            body = self.poll(last_id)
+        self.assertIn(f'event: task_completed\ndata: {{"id":{task.id},', body)
+        subscribe.assert_not_called()  # Short polls never start the poller
+
+    def test_publish_prunes_expired_events(self):
+        expired = AdminEvent.objects.create(kind='task_completed')
+        AdminEvent.objects.filter(id=expired.id).update(created_at=timezone.now() - timedelta(days=2))
+
+        with mock.patch('takaful_app.events._last_prune', None):
+            events.publish('task_completed', id=1)
+        self.assertFalse(AdminEvent.objects.filter(id=expired.id).exists())
+
+    def test_requires_admin(self):
+        response = self.client.get('/api/admin/events/', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_asgi_stream_is_async(self):
+        admin = await User.objects.aget(username='admin')
+        response = await self.async_client.get(
+            '/api/admin/events/',
+            headers={'Accept': 'text/event-stream', 'Authorization': f'Bearer {AccessToken.for_user(admin)}'},
+        )
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b'retry: 1000\n\n')
+
+        await Task.objects.acreate(title='مهمة', project=self.project, status='مكتملة')
+        chunk = await anext(chunks)
+        while chunk.startswith(b':'):
+            chunk = await anext(chunks)
+        self.assertIn(b'event: task_completed', chunk)
+        await chunks.aclose()
+
+
+class AdminListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        cls.admin.profile.role = 'admin'
+        cls.admin.profile.save()
+        cls.project = Project.objects.create(title='مشروع')
+        # Identical timestamps: the id keeps the order stable
+        Task.objects.bulk_create([Task(title=f'مهمة {i}', project=cls.project) for i in range(5)])
+        Task.objects.update(created_at=timezone.now())
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_cursor_pages_cover_every_row_once(self):
+        self.assertEqual(len(self.client.get('/api/admin/tasks/').data), 5)  # Unpaginated by default
+
+        ids, url = [], '/api/admin/tasks/?page_size=2&count=1'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.data['count'], 5)
+            ids += [task['id'] for task in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(ids, sorted(Task.objects.values_list('id', flat=True), reverse=True))
+
+    def test_keyset_pages_past_the_offset_cutoff(self):
+        # More rows sharing one timestamp than DRF's offset cursor can skip (1000)
+        Task.objects.bulk_create([Task(title=f'مهمة {i}', project=self.project) for i in range(1100)])
+        Task.objects.update(created_at=timezone.now())
+        expected = list(Task.objects.order_by('-id').values_list('id', flat=True))
+
+        ids, url, pages = [], '/api/admin/tasks/?page_size=100', []
+        while url:
+            response = self.client.get(url)
+            ids += [task['id'] for task in response.data['results']]
+            pages.append(response.data)
+            url = response.data['next']
+            self.assertLessEqual(len(pages), 12)
+        self.assertEqual(ids, expected)
+
+        previous = self.client.get(pages[-1]['previous']).data
+        self.assertEqual(previous['results'], pages[-2]['results'])
+        self.assertEqual(self.client.get('/api/admin/tasks/?cursor=bad').status_code, 404)
+
+    def test_count_is_cached_until_the_model_changes(self):
+        self.client.get('/api/admin/tasks/?page_size=2&count=1')
+        with self.assertNumQueries(3):  # Page, subtasks, count version (no COUNT)
+            self.client.get('/api/admin/tasks/?page_size=2&count=1')
+
+        Task.objects.create(title='جديدة', project=self.project)
+        self.assertEqual(self.client.get('/api/admin/tasks/?page_size=2&count=1').data['count'], 6)
+
+        response = self.client.get('/api/admin/volunteers/?page_size=10&count=1')
+        self.assertEqual((response.data['count'], response.data['results']), (0, []))
+
+
+class VolunteerFilterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', 'admin@takaful.com', 'admin123')
+        cls.admin.profile.role = 'admin'
+        cls.admin.profile.save()
+        project = Project.objects.create(title='مشروع')
+
+        # (city, skills, hours, open tasks)
+        for i, (city, skills, hours, open_tasks) in enumerate([
+            ('الرياض', ['تصميم', 'برمجة'], 10, 0),
+            ('الرياض', ['تسويق'], 40, 2),
+            ('جدة', ['برمجة'], 25, 5),
+        ]):
+            user = User.objects.create_user(f'v{i}', f'v{i}@takaful.com', 'pass123')
+            profile = user.profile
+            profile.name, profile.city, profile.skills = f'متطوع {i}', city, skills
+            profile.total_volunteer_hours, profile.is_approved = hours, True
+            profile.save()
+            for _ in range(open_tasks):
+                Task.objects.create(title='مهمة', project=project, volunteer=user)
+            Task.objects.create(title='منجزة', project=project, volunteer=user, status='مكتملة')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def names(self, query=''):
+        response = self.client.get(f'/api/admin/volunteers/{query}')
+        return [volunteer['name'] for volunteer in response.data['results']]
+
+    def test_filters_and_ordering(self):
+        self.assertEqual(self.names('?city=الرياض&ordering=hours'), ['متطوع 0', 'متطوع 1'])
+        self.assertEqual(self.names('?skills=برمجة,تسويق&ordering=-hours'), ['متطوع 1', 'متطوع 2', 'متطوع 0'])
+        self.assertEqual(self.names('?status=مشغول'), ['متطوع 2'])
+        self.assertEqual(self.names('?min_hours=20&max_hours=30'), ['متطوع 2'])
+        self.assertEqual(self.client.get('/api/admin/volunteers/?ordering=email').status_code, 400)
+
+        page = self.client.get('/api/admin/volunteers/?ordering=-current_tasks&page_size=2').data
+        self.assertEqual([v['current_tasks'] for v in page['results']], [5, 2])
+        self.assertEqual(self.client.get(page['next']).data['results'][0]['status'], 'غير نشط')
+
+    def test_tied_orderings_page_through_every_volunteer(self):
+        users = User.objects.bulk_create([
+            User(username=f'bulk{i}', email=f'bulk{i}@takaful.com') for i in range(1300)
+        ])
+        Profile.objects.bulk_create([Profile(user=user, name='متطوع', is_approved=True) for user in users])
+
+        for ordering in ('current_tasks', '-rating', 'name'):
+            ids, url, pages = [], f'/api/admin/volunteers/?ordering={ordering}&page_size=100', 0
+            while url:
+                page = self.client.get(url).data
+                ids += [volunteer['id'] for volunteer in page['results']]
+                url, pages = page['next'], pages + 1
+                self.assertLessEqual(pages, 14)
+            self.assertEqual(len(ids), 1303)
+            self.assertEqual(len(set(ids)), 1303)
+
+    def test_status_and_projects_computed_without_per_volunteer_queries(self):
+        with self.assertNumQueries(2):  # Volunteers with task load + open tasks prefetch
+            response = self.client.get('/api/admin/volunteers/')
+        by_name = {volunteer['name']: volunteer for volunteer in response.data['results']}
+        self.assertEqual(
+            [(by_name[f'متطوع {i}']['status'], by_name[f'متطوع {i}']['current_projects']) for i in range(3)],
+            [('غير نشط', []), ('نشط', ['مشروع']), ('مشغول', ['مشروع'])],
+        )
+
+        # Skill rows follow profile edits
+        profile = User.objects.get(username='v0').profile
+        profile.skills = ['تسويق']
+        profile.save()
+        self.assertEqual(self.names('?skills=برمجة'), ['متطوع 2'])
@@ -0,0 +1,133 @@
+"""
+Token-bucket write throttling for the public (anonymous) POST endpoints.
+Each client IP gets one bucket per endpoint scope holding up to `capacity`
+tokens, refilled at `refill_per_minute`; every request spends one token.
+Buckets live in the Django cache and fall back to the ThrottleBucket table
+when the cache is unavailable (or always, with BACKEND = 'db').
+
+Settings (PUBLIC_THROTTLE):
+    BACKEND  'cache' (default) or 'db'
+    SCOPES   {scope: {'capacity': int, 'refill_per_minute': float}}
+Rejected requests get DRF's 429 response with a Retry-After header.
+
+Clients are identified by DRF's get_ident(), which trusts only the last
+REST_FRAMEWORK['NUM_PROXIES'] X-Forwarded-For entries (the ones added by our
+own proxy), so a client cannot pick a fresh bucket by spoofing the header.
+"""
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+from .models import ThrottleBucket
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between two "cache unavailable" warnings of a process
+CACHE_WARNING_INTERVAL = 60
+_last_cache_warning = 0.0
+
+DEFAULT_SCOPES = {
+    'public-suggestion': {'capacity': 5, 'refill_per_minute': 1},
+    'public-service-request': {'capacity': 5, 'refill_per_minute': 1},
+    'public-water-supply-request': {'capacity': 3, 'refill_per_minute': 0.5},
+}
+
+
+def throttle_settings():
+    return getattr(settings, 'PUBLIC_THROTTLE', {})
+
+
+def scope_config(scope):
+    scopes = {**DEFAULT_SCOPES, **throttle_settings().get('SCOPES', {})}
+    config = scopes[scope]
+    return config['capacity'], config['refill_per_minute'] / 60.0
+
+
+def refill(tokens, updated_at, now, capacity, rate):
+    """Bucket content at `now` after refilling since updated_at"""
+    return min(capacity, tokens + (now - updated_at) * rate)
+
+
+def take_token(tokens, capacity, rate):
+    """(allowed, tokens_left, wait_seconds) for one request against a refilled bucket"""
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / rate if rate else math.inf
+
+
+def _consume_cache(key, now, capacity, rate):
+    # get/set is not atomic: concurrent requests may over-admit by a token,
+    # which is acceptable for flood protection
+    tokens, updated_at = cache.get(key) or (capacity, now)
+    allowed, tokens, wait = take_token(refill(tokens, updated_at, now, capacity, rate), capacity, rate)
+    # A bucket that has been idle long enough is full again, so let it expire
+    timeout = math.ceil((capacity - tokens) / rate) + 1 if rate else None
+    cache.set(key, (tokens, now), timeout)
+    return allowed, wait
+
+
+def _consume_db(key, now, capacity, rate):
+    with transaction.atomic():
+        bucket, _ = ThrottleBucket.objects.select_for_update().get_or_create(
+            key=key, defaults={'tokens': capacity, 'updated_at': now},
+        )
+        allowed, bucket.tokens, wait = take_token(
+            refill(bucket.tokens, bucket.updated_at, now, capacity, rate), capacity, rate,
+        )
+        bucket.updated_at = now
+        bucket.save(update_fields=['tokens', 'updated_at'])
+    return allowed, wait
+
+
+def consume(key, capacity, rate, now=None):
+    """Spend a token from the bucket at key. Returns (allowed, wait_seconds)"""
+    now = time.time() if now is None else now
+    if throttle_settings().get('BACKEND', 'cache') != 'db':
+        try:
+            return _consume_cache(key, now, capacity, rate)
+        except Exception:
+            _warn_cache_unavailable(now)
+    return _consume_db(key, now, capacity, rate)
+
+
+def _warn_cache_unavailable(now):
+    global _last_cache_warning
+    if now - _last_cache_warning >= CACHE_WARNING_INTERVAL:
+        _last_cache_warning = now
+        logger.warning('Throttle cache unavailable, using the database', exc_info=True)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Per-IP token bucket for one endpoint scope (set `scope` on subclasses)"""
+    scope = None
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+
+        capacity, rate = scope_config(self.scope)
+        key = f'throttle:{self.scope}:{self.get_ident(request)}'
+        allowed, self.wait_seconds = consume(key, capacity, rate)
+        return allowed
+
+    def wait(self):
+        return math.ceil(self.wait_seconds) if self.wait_seconds != math.inf else None
+
+
+class PublicSuggestionThrottle(TokenBucketThrottle):
+    scope = 'public-suggestion'
+
+
+class PublicServiceRequestThrottle(TokenBucketThrottle):
+    scope = 'public-service-request'
+
+
+class PublicWaterSupplyRequestThrottle(TokenBucketThrottle):
+    scope = 'public-water-supply-request'
@@ -16,6 +16,7 @@ urlpatterns = [
     # Public endpoints (no auth required) - MUST come before router
     path('public-projects/', views.public_projects, name='public-projects'),
     path('public-volunteers-stats/', views.public_volunteers_stats, name='public-volunteers-stats'),
+    path('public-volunteers-distribution/', views.public_volunteers_distribution, name='public-volunteers-distribution'),  # Volunteer chart histograms
     path('public-suggestions/', views.public_submit_suggestion, name='public-suggestions'),
     path('public-home-stats/', views.public_home_stats, name='public-home-stats'),
     path('public-services/', views.public_services_list, name='public-services'),  # Volunteer opportunity services (/services page)
@@ -23,6 +24,7 @@ urlpatterns = [
     path('public-service-request/', views.public_submit_service_request, name='public-service-request'),  # Submit service request
     path('public-volunteer-statistics/', views.public_volunteer_statistics, name='public-volunteer-statistics'),  # Volunteer statistics for home page
     path('public-water-supply-request/', views.public_water_supply_request, name='public-water-supply-request'),  # Water supply request
+    path('public-snapshots/<str:name>.json', views.public_snapshot, name='public-snapshot'),  # Pre-rendered public endpoint snapshots
 
     # Admin statistics management
     path('admin/volunteer-statistics/', views.admin_volunteer_statistics, name='admin-volunteer-statistics'),
@@ -38,6 +40,8 @@ urlpatterns = [
     path('stats/', views.admin_stats, name='admin-stats'),
     path('volunteer-stats/', views.volunteer_stats, name='volunteer-stats'),  # NEW
     path('my-active-project/', views.get_my_active_project, name='my-active-project'),  # 🔥 ADD THIS LINE
+    path('dashboard/', views.admin_dashboard, name='admin-dashboard'),  # All main page sections in one request
+    path('events/', views.admin_events, name='admin-events'),  # Live dashboard deltas (SSE)
 
     # Volunteer management (NEW)
     path('volunteers/', views.list_volunteers, name='list-volunteers'),
@@ -67,8 +71,11 @@ urlpatterns = [
 
     # Reports endpoints
     path('reports/generate/', views.generate_report, name='generate-report'),
+    path('reports/jobs/<int:job_id>/', views.report_job_status, name='report-job-status'),
     path('reports/', views.list_reports, name='list-reports'),
     path('reports/<int:report_id>/', views.get_report_detail, name='report-detail'),
+    path('reports/<int:report_id>/export/', views.export_report, name='export-report'),
+    path('reports/<int:report_id>/diff/', views.diff_reports, name='diff-reports'),
     path('reports/<int:report_id>/delete/', views.delete_report, name='delete-report'),
 
     # ============================================================================
@@ -0,0 +1,43 @@
+"""
+Data version counters backed by the DataVersion table.
+A version is bumped whenever data in its domain changes, so anything computed
+from that data can be reused for as long as the version it was built from
+is still current. Shared by every worker because it lives in the database.
+"""
+from django.db.models import F
+
+from .models import DataVersion
+
+
+REPORTS = 'reports'
+PROJECTS = 'projects'
+SERVICES = 'services'
+VOLUNTEER_STATISTICS = 'volunteer_statistics'
+VOLUNTEERS = 'volunteers'
+VOLUNTEER_REQUESTS = 'volunteer_requests'
+
+
+def model_key(model):
+    """Version key covering every row of a model (cached list counts)"""
+    return f'model:{model._meta.label_lower}'
+
+
+def get_version(key):
+    """Current version for a key (0 if it was never bumped)"""
+    version = DataVersion.objects.filter(key=key).values_list('version', flat=True).first()
+    return version or 0
+
+
+def get_versions(*keys):
+    """Current versions for several keys in one query, in the order given"""
+    versions = dict(DataVersion.objects.filter(key__in=keys).values_list('key', 'version'))
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_version(key):
+    """Increment the version for a key"""
+    updated = DataVersion.objects.filter(key=key).update(version=F('version') + 1)
+    if not updated:
+        _, created = DataVersion.objects.get_or_create(key=key, defaults={'version': 1})
+        if not created:
+            DataVersion.objects.filter(key=key).update(version=F('version') + 1)
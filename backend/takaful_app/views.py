@@ -1,16 +1,20 @@
 from rest_framework import viewsets, status
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
+from rest_framework.renderers import JSONRenderer
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from django.db.models import Sum, Count, Q
+from django.db.models import F, ExpressionWrapper, BinaryField, Prefetch
+from django.http import StreamingHttpResponse, HttpResponse, HttpResponseNotModified, Http404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import require_GET
 from django.utils import timezone
 
 from .models import (
     Project, Service, ServiceRequest, ServiceVolunteerApplication, Volunteer, Suggestion,
-    ProjectAssignment, Task, Subtask, AdminReport, VolunteerApplication,
+    ProjectAssignment, Task, Subtask, AdminReport, ReportJob, VolunteerApplication,
     VolunteerStatistics, QuarterlyTarget, DepartmentHours, TopVolunteer, WaterSupplyRequest
 )
 import openpyxl
@@ -20,9 +24,30 @@ from .serializers import (
     ProjectSerializer, ServiceSerializer, ServiceRequestSerializer, ServiceVolunteerApplicationSerializer,
     VolunteerSerializer, SuggestionSerializer, ProjectAssignmentSerializer,
     TaskSerializer, SubtaskSerializer, VolunteerDetailSerializer,
-    VolunteerRequestSerializer, AdminReportSerializer, VolunteerApplicationSerializer,
-    VolunteerStatisticsSerializer, WaterSupplyRequestSerializer
+    VolunteerRequestSerializer, AdminReportSerializer, AdminReportListSerializer, ReportJobSerializer, VolunteerApplicationSerializer,
+    VolunteerStatisticsSerializer, WaterSupplyRequestSerializer, requested_fields
 )
+from .reports import get_or_create_report, stream_report_json, diff_report_data, valid_report_range
+from .pagination import (
+    ReportCursorPagination, ProjectCursorPagination, KeysetCursorPagination, UserCursorPagination, VolunteerCursorPagination,
+    AssignmentCursorPagination, ApplicationCursorPagination
+)
+from .stats import project_totals, volunteer_totals, volunteer_distributions
+from .dashboard import (
+    DEFAULT_REQUESTS_LIMIT, project_stats, pending_volunteer_requests, active_project, dashboard_sections
+)
+from .rollups import live_actuals
+from .cache import cached_payload
+from .conditional import conditional_get
+from .snapshots import SNAPSHOT_NAMES, load as load_snapshot, is_current as snapshot_is_current, endpoint_views as public_snapshot_views
+from .compression import negotiate_encoding
+from .versioning import PROJECTS, SERVICES, VOLUNTEER_STATISTICS, VOLUNTEERS
+from .ingest import ingest_submission
+from .fingerprints import water_request_fingerprint
+from .throttling import PublicSuggestionThrottle, PublicServiceRequestThrottle, PublicWaterSupplyRequestThrottle
+from .volunteer_filters import with_task_load, filter_volunteers, volunteer_ordering
+from .exports import SHEETS, XLSXRenderer, CSVRenderer, stream_xlsx, stream_csv
+from .events import EventStreamRenderer, open_stream as open_event_stream
 
 
 # Custom permission to check if user is admin
@@ -44,25 +69,7 @@ def admin_stats(request):
     GET /api/admin/stats/
     Returns aggregated statistics for admin dashboard (main.tsx)
     """
-    active_projects_count = Project.objects.filter(status='ACTIVE').count()
-    completed_projects_count = Project.objects.filter(status='COMPLETED').count()
-    total_projects_count = Project.objects.count()
-    
-    total_donations = Project.objects.aggregate(
-        total=Sum('donation_amount')
-    )['total'] or 0
-    
-    total_beneficiaries = Project.objects.aggregate(
-        total=Sum('beneficiaries')
-    )['total'] or 0
-    
-    return Response({
-        'total_donations': float(total_donations),
-        'total_beneficiaries': total_beneficiaries,
-        'active_projects': active_projects_count,
-        'completed_projects': completed_projects_count,
-        'total_projects': total_projects_count,
-    })
+    return Response(project_stats())
 
 
 @api_view(['GET'])
@@ -72,36 +79,8 @@ def volunteer_stats(request):
     GET /api/admin/volunteer-stats/
     Returns volunteer statistics for VolunteerManagement page
     """
-    # ✅ UPDATED: Count only APPROVED volunteers
-    total_volunteers = User.objects.filter(
-        profile__role='user',
-        profile__is_approved=True
-    ).count()
-    
-    # Active volunteers: those with current tasks
-    active_volunteers = User.objects.filter(
-        profile__role='user',
-        profile__is_approved=True,
-        assigned_tasks__status__in=['قيد التنفيذ', 'في الانتظار']
-    ).distinct().count()
-    
-    # Total volunteer hours (only approved)
-    total_hours = User.objects.filter(
-        profile__role='user',
-        profile__is_approved=True
-    ).aggregate(
-        total=Sum('profile__total_volunteer_hours')
-    )['total'] or 0
-    
-    # Completed tasks
-    completed_tasks = Task.objects.filter(status='مكتملة').count()
-    
-    return Response({
-        'total_volunteers': total_volunteers,
-        'active_volunteers': active_volunteers,
-        'total_hours': total_hours,
-        'completed_tasks': completed_tasks,
-    })
+    # Approved volunteers only; active = has a task in progress or waiting
+    return Response(volunteer_totals())
 
 
 @api_view(['GET'])
@@ -119,71 +98,114 @@ def get_my_active_project(request):
     Independent from top tabs section - used for filtering projects in bottom section
     """
     try:
-        project_id = request.query_params.get('project_id')
-        status_filter = request.query_params.get('status')
-
-        # Status mapping from Arabic to English
-        status_map = {
-            'نشط': 'ACTIVE',
-            'متوقف': 'PLANNED',
-            'مكتمل': 'COMPLETED',
-            'ملغي': 'CANCELLED'
-        }
-
-        # If specific project requested, return it (highest priority)
-        if project_id:
-            try:
-                project = Project.objects.get(id=project_id)
-                serializer = ProjectSerializer(project)
-                return Response(serializer.data)
-            except Project.DoesNotExist:
-                pass
-
-        # If status filter provided, return most recent project with that status
-        if status_filter:
-            # Convert Arabic status to English if needed
-            english_status = status_map.get(status_filter, status_filter)
-
-            project = Project.objects.filter(
-                status=english_status
-            ).order_by('-updated_at').first()
-
-            if project:
-                serializer = ProjectSerializer(project)
-                return Response(serializer.data)
-            else:
-                # No project found with this status
-                return Response(None, status=200)
-
-        # Default: Return most recent active project, fallback to any recent project
-        project = Project.objects.filter(status='ACTIVE').order_by('-updated_at').first()
-
-        if not project:
-            project = Project.objects.all().order_by('-updated_at').first()
-
-        if project:
-            serializer = ProjectSerializer(project)
-            return Response(serializer.data)
-
-        # Return null only if there are absolutely no projects
-        return Response(None, status=200)
-
+        return Response(active_project(
+            request.query_params.get('status'),
+            request.query_params.get('project_id'),
+        ))
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def admin_dashboard(request):
+    """
+    GET /api/admin/dashboard/?limit=4&status=ACTIVE&project_id=123
+    Returns every admin main page section in one response:
+    stats (admin-stats), volunteer_stats (volunteer-stats),
+    volunteer_requests (volunteer-requests?limit=) and active_project
+    (my-active-project?status=&project_id=). Each section is cached and
+    invalidated independently.
+    """
+    try:
+        limit = max(int(request.query_params.get('limit', DEFAULT_REQUESTS_LIMIT)), 0)
+    except ValueError:
+        limit = DEFAULT_REQUESTS_LIMIT
+
+    project_id = request.query_params.get('project_id')
+    if project_id and not project_id.isdigit():
+        return Response({'error': 'رقم المشروع غير صالح'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(dashboard_sections(limit, request.query_params.get('status'), project_id))
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+def admin_events(request):
+    """
+    GET /api/admin/events/
+    Server-Sent Events stream of live dashboard deltas, replacing polling:
+    volunteer_pending, project_application, service_application,
+    task_completed and water_supply_request. Each event carries its id;
+    reconnecting clients resume with the Last-Event-ID header (sent by
+    EventSource) or ?last_event_id=. Over WSGI each request is a short poll
+    that returns the missed events and closes; EventSource reconnects.
+    """
+    last_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+    try:
+        last_id = int(last_id) if last_id else None
+    except ValueError:
+        last_id = None
+
+    response = StreamingHttpResponse(open_event_stream(request._request, last_id), content_type='text/event-stream')
+    # no-transform keeps CompressionMiddleware (and proxies) from buffering the stream
+    response['Cache-Control'] = 'no-cache, no-transform'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 # ============================================================================
 # PROJECT VIEWSET (Enhanced) - CORRECTED VERSION
 # ============================================================================
+def project_projection(request, queryset):
+    """Load only the columns the ?fields= projection serializes"""
+    only = ProjectSerializer.model_fields(requested_fields(request))
+    if not only:
+        return queryset
+    # created_at is the pagination cursor
+    return queryset.only(*only, 'created_at')
+
+
+def project_listing(request, queryset):
+    """
+    Serialize a project list with ?fields= projection and optional cursor
+    pagination. Returns (data, paginator); paginator is None when the full
+    list was returned.
+    """
+    queryset = project_projection(request, queryset)
+    paginator = ProjectCursorPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    if page is None:
+        return ProjectSerializer(queryset, many=True, context={'request': request}).data, None
+    return ProjectSerializer(page, many=True, context={'request': request}).data, paginator
+
+
+def paginate_listing(request, queryset, pagination_class, ordering=None):
+    """
+    Optional cursor page of an admin list. Returns (rows, paginator);
+    paginator is None and rows the whole queryset when no page was asked for.
+    ordering overrides the pagination class ordering.
+    """
+    paginator = pagination_class()
+    if ordering:
+        paginator.ordering = ordering
+    page = paginator.paginate_queryset(queryset, request)
+    if page is None:
+        return queryset, None
+    return page, paginator
+
+
 class ProjectViewSet(viewsets.ModelViewSet):
     """
     Admin endpoint for managing projects
-    Returns all projects (no pagination) filtered by status
+    Returns all projects filtered by status; cursor-paginated on request
+    (?page_size=) and projected with ?fields=
     """
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [IsAdmin]
-    pagination_class = None  # Disable pagination to return all projects
+    pagination_class = ProjectCursorPagination  # Only paginates when ?cursor= / ?page_size= is sent
 
     STATUS_MAPPING = {
         'نشط': 'ACTIVE',
@@ -204,6 +226,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
         elif status_param == 'completed':
             queryset = queryset.filter(status='COMPLETED')
 
+        if self.action == 'list':
+            queryset = project_projection(self.request, queryset)
+
         return queryset.order_by('-created_at')  # Most recent first
 
     def create(self, request, *args, **kwargs):
@@ -344,16 +369,17 @@ class ProjectViewSet(viewsets.ModelViewSet):
 class TaskViewSet(viewsets.ModelViewSet):
     """
     Admin endpoint for managing tasks
-    GET /api/admin/tasks/ - List all tasks
+    GET /api/admin/tasks/ - List all tasks (?page_size=&cursor=&count=1 for pages)
     POST /api/admin/tasks/ - Create new task
     PUT /api/admin/tasks/{id}/ - Update task (including subtasks)
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsAdmin]
+    pagination_class = KeysetCursorPagination  # Only paginates when ?cursor= / ?page_size= is sent
     
     def get_queryset(self):
-        queryset = super().get_queryset().select_related('project', 'volunteer__profile')
+        queryset = super().get_queryset().select_related('project', 'volunteer__profile').prefetch_related('subtasks')
         
         # Filter by volunteer
         volunteer_id = self.request.query_params.get('volunteer_id')
@@ -415,16 +441,32 @@ class TaskViewSet(viewsets.ModelViewSet):
 @permission_classes([IsAdmin])
 def list_volunteers(request):
     """
-    GET /api/admin/volunteers/
-    Returns detailed list of APPROVED volunteers for VolunteerManagement page
+    GET /api/admin/volunteers/?city=&skills=a,b&status=نشط&min_hours=&max_hours=&ordering=-hours
+    Returns detailed list of APPROVED volunteers for VolunteerManagement page,
+    filtered and sorted in SQL (see volunteer_filters.py)
+    (?page_size=&cursor=&count=1 for cursor pages)
     """
     # ✅ UPDATED: Only show approved volunteers
     volunteers = User.objects.filter(
         profile__role='user',
         profile__is_approved=True
-    ).select_related('profile').prefetch_related('assigned_tasks')
+    ).select_related('profile').prefetch_related(
+        Prefetch(
+            'assigned_tasks',
+            queryset=Task.objects.exclude(status='مكتملة').select_related('project').only('volunteer', 'project__title'),
+            to_attr='open_tasks',
+        )
+    )
+    volunteers = filter_volunteers(with_task_load(volunteers), request.query_params)
+    ordering = volunteer_ordering(request.query_params)
+
+    page, paginator = paginate_listing(request, volunteers, VolunteerCursorPagination, ordering)
+    if paginator is None:
+        page = volunteers.order_by(*ordering)
     
-    serializer = VolunteerDetailSerializer(volunteers, many=True)
+    serializer = VolunteerDetailSerializer(page, many=True)
+    if paginator:
+        return paginator.get_paginated_response(serializer.data)
     return Response({
         'results': serializer.data
     })
@@ -438,23 +480,15 @@ def volunteer_requests_list(request):
     Returns list of PENDING volunteer approval requests
     For VolunteerRequests.tsx page and admin main page
     """
-    # ✅ UPDATED: Only show pending (not approved) volunteers
-    pending_volunteers = User.objects.filter(
-        profile__role='user',
-        profile__is_approved=False
-    ).select_related('profile').order_by('-date_joined')
-
     # Support limit parameter
     limit = request.query_params.get('limit')
-    if limit:
-        try:
-            pending_volunteers = pending_volunteers[:int(limit)]
-        except ValueError:
-            pass  # Ignore invalid limit values
+    try:
+        limit = int(limit) if limit else None
+    except ValueError:
+        limit = None  # Ignore invalid limit values
 
-    serializer = VolunteerRequestSerializer(pending_volunteers, many=True)
     return Response({
-        'results': serializer.data
+        'results': pending_volunteer_requests(limit)
     })
 
 
@@ -609,10 +643,12 @@ class ServiceRequestViewSet(viewsets.ModelViewSet):
     Admin endpoint for managing service requests
     GET /api/service-requests/ - List all service requests
     GET /api/service-requests/?status=PENDING - Filter by status
+    GET /api/service-requests/?page_size=50&count=1 - Cursor pages
     """
     queryset = ServiceRequest.objects.all()
     serializer_class = ServiceRequestSerializer
     permission_classes = [IsAdmin]
+    pagination_class = KeysetCursorPagination
 
     def get_queryset(self):
         queryset = super().get_queryset().select_related('service')
@@ -622,7 +658,7 @@ class ServiceRequestViewSet(viewsets.ModelViewSet):
         if status_param:
             queryset = queryset.filter(status=status_param)
 
-        return queryset.order_by('-created_at')
+        return queryset.order_by('-created_at', '-id')
 
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
@@ -715,6 +751,7 @@ class ProjectAssignmentViewSet(viewsets.ModelViewSet):
     queryset = ProjectAssignment.objects.all()
     serializer_class = ProjectAssignmentSerializer
     permission_classes = [IsAdmin]
+    pagination_class = AssignmentCursorPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -733,8 +770,10 @@ def list_users(request):
     """
     GET /api/admin/users/
     Returns list of all registered users with their profiles
+    (?page_size=&cursor=&count=1 for cursor pages)
     """
     users = User.objects.select_related('profile').all()
+    users, paginator = paginate_listing(request, users, UserCursorPagination)
     
     data = []
     for user in users:
@@ -749,6 +788,8 @@ def list_users(request):
             'completed_tasks_count': user.profile.completed_tasks_count,
         })
     
+    if paginator:
+        return paginator.get_paginated_response(data)
     return Response(data)
 
 
@@ -840,202 +881,64 @@ def generate_report(request):
     """
     POST /api/admin/reports/generate/
     Generate a comprehensive platform report
-    Body: { "date_from": "2026-01-01", "date_to": "2026-01-31" } (optional)
-    """
-    from datetime import datetime
+    Body: { "date_from": "2026-01-01", "date_to": "2026-01-31", "async": true } (all optional)
+    Data is collected with a fixed number of aggregate queries (see reports.py)
+
+    An existing report for the same range is returned (or cloned for another
+    admin) when no Project/Task/Profile/ProjectAssignment changed since.
 
+    With "async": true the report is queued as a ReportJob for the
+    run_report_worker command and the job id is returned immediately.
+    Poll GET /api/admin/reports/jobs/{job_id}/ for its progress.
+    """
     date_from = request.data.get('date_from')
     date_to = request.data.get('date_to')
 
-    # Query filters based on date range
-    project_filter = Q()
-    task_filter = Q()
-    volunteer_filter = Q()
-
-    if date_from:
-        project_filter &= Q(created_at__gte=date_from)
-        task_filter &= Q(created_at__gte=date_from)
-        volunteer_filter &= Q(date_joined__gte=date_from)
-
-    if date_to:
-        project_filter &= Q(created_at__lte=date_to)
-        task_filter &= Q(created_at__lte=date_to)
-        volunteer_filter &= Q(date_joined__lte=date_to)
-
-    # ========== COLLECT DATA ==========
-
-    # Projects data
-    projects = Project.objects.filter(project_filter)
-    projects_by_status = {
-        'active': projects.filter(status='ACTIVE').count(),
-        'completed': projects.filter(status='COMPLETED').count(),
-        'planned': projects.filter(status='PLANNED').count(),
-        'cancelled': projects.filter(status='CANCELLED').count(),
-    }
-    projects_by_category = {}
-    for category in projects.values_list('category', flat=True).distinct():
-        if category:
-            projects_by_category[category] = projects.filter(category=category).count()
-
-    # Projects list with details
-    projects_list = []
-    for project in projects:
-        volunteers_count = ProjectAssignment.objects.filter(project=project).count()
-        tasks_count = Task.objects.filter(project=project).count()
-        tasks_completed = Task.objects.filter(project=project, status='مكتملة').count()
-
-        # Calculate automatic progress based on task completion
-        # If no tasks exist, use manual progress field as fallback
-        if tasks_count > 0:
-            automatic_progress = int((tasks_completed / tasks_count) * 100)
-        else:
-            automatic_progress = project.progress  # Fallback to manual progress
-
-        projects_list.append({
-            'id': project.id,
-            'title': project.title,
-            'category': project.category,
-            'status': project.status,
-            'status_display': {
-                'ACTIVE': 'نشط',
-                'COMPLETED': 'مكتمل',
-                'PLANNED': 'متوقف',
-                'CANCELLED': 'ملغي'
-            }.get(project.status, project.status),
-            'progress': automatic_progress,  # ✅ Now using task-based calculation
-            'beneficiaries': project.beneficiaries,
-            'donation_amount': float(project.donation_amount),
-            'start_date': project.start_date.isoformat() if project.start_date else None,
-            'end_date': project.end_date.isoformat() if project.end_date else None,
-            'volunteers_assigned': volunteers_count,
-            'tasks_total': tasks_count,
-            'tasks_completed': tasks_completed,
-            'completion_rate': automatic_progress,  # Same value for consistency
-        })
-
-    # Volunteers data
-    volunteers = User.objects.filter(
-        profile__role='user',
-        profile__is_approved=True
-    ).filter(volunteer_filter).select_related('profile')
-
-    volunteers_list = []
-    for volunteer in volunteers:
-        tasks = volunteer.assigned_tasks.all()
-        tasks_completed = tasks.filter(status='مكتملة').count()
-        tasks_in_progress = tasks.exclude(status='مكتملة').count()
-        current_projects = list(set([task.project.title for task in tasks.exclude(status='مكتملة')]))
-
-        volunteers_list.append({
-            'id': volunteer.id,
-            'name': volunteer.profile.name,
-            'email': volunteer.email,
-            'phone': volunteer.profile.phone,
-            'city': volunteer.profile.city,
-            'skills': volunteer.profile.skills,
-            'qualification': volunteer.profile.qualification,
-            'university': volunteer.profile.university,
-            'total_hours': volunteer.profile.total_volunteer_hours,
-            'tasks_completed': tasks_completed,
-            'tasks_in_progress': tasks_in_progress,
-            'rating': float(volunteer.profile.rating),
-            'join_date': volunteer.date_joined.isoformat(),
-            'current_projects': current_projects,
-        })
-
-    # Tasks data
-    tasks = Task.objects.filter(task_filter).select_related('project', 'volunteer')
-    tasks_by_status = {
-        'in_progress': tasks.filter(status='قيد التنفيذ').count(),
-        'waiting': tasks.filter(status='في الانتظار').count(),
-        'completed': tasks.filter(status='مكتملة').count(),
-        'on_hold': tasks.filter(status='معلقة').count(),
-    }
-    tasks_by_priority = {
-        'high': tasks.filter(priority='عالية').count(),
-        'medium': tasks.filter(priority='متوسطة').count(),
-        'low': tasks.filter(priority='منخفضة').count(),
-    }
+    if not valid_report_range(date_from, date_to):
+        return Response(
+            {'error': 'صيغة التاريخ غير صحيحة، استخدم YYYY-MM-DD'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-    # Overdue tasks (past due date and not completed)
-    from django.utils import timezone
-    overdue_tasks = tasks.filter(
-        due_date__lt=timezone.now().date(),
-        status__in=['قيد التنفيذ', 'في الانتظار', 'معلقة']
-    )
-    overdue_tasks_list = [{
-        'id': task.id,
-        'title': task.title,
-        'project': task.project.title,
-        'volunteer': task.volunteer.profile.name if task.volunteer else None,
-        'due_date': task.due_date.isoformat() if task.due_date else None,
-        'status': task.status,
-        'priority': task.priority,
-    } for task in overdue_tasks[:10]]  # Top 10 overdue
-
-    # Totals
-    total_beneficiaries = projects.aggregate(total=Sum('beneficiaries'))['total'] or 0
-    total_donations = projects.aggregate(total=Sum('donation_amount'))['total'] or 0
-    total_volunteer_hours = volunteers.aggregate(
-        total=Sum('profile__total_volunteer_hours')
-    )['total'] or 0
-
-    # Build report data structure
-    report_data = {
-        'summary': {
-            'total_projects': projects.count(),
-            'total_volunteers': volunteers.count(),
-            'total_tasks': tasks.count(),
-            'total_beneficiaries': total_beneficiaries,
-            'total_donations': float(total_donations),
-            'total_volunteer_hours': total_volunteer_hours,
-            'date_from': date_from,
-            'date_to': date_to,
-        },
-        'projects': {
-            'by_status': projects_by_status,
-            'by_category': projects_by_category,
-            'list': projects_list,
-        },
-        'volunteers': {
-            'total': volunteers.count(),
-            'list': volunteers_list,
-        },
-        'tasks': {
-            'by_status': tasks_by_status,
-            'by_priority': tasks_by_priority,
-            'overdue': overdue_tasks_list,
-            'total_completed': tasks_by_status['completed'],
-            'completion_rate': int((tasks_by_status['completed'] / tasks.count()) * 100) if tasks.count() > 0 else 0,
-        },
-    }
+    if request.data.get('async') in (True, 'true', '1', 1):
+        job = ReportJob.objects.create(
+            admin=request.user,
+            date_from=date_from or None,
+            date_to=date_to or None,
+        )
+        return Response({
+            'message': 'تمت إضافة التقرير إلى قائمة الانتظار',
+            'job_id': job.id,
+            'job': ReportJobSerializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
 
-    # Generate report title
-    now = timezone.now()
-    if date_from and date_to:
-        title = f"تقرير شامل ({date_from} - {date_to})"
-    else:
-        title = f"تقرير شامل - {now.strftime('%Y-%m-%d %H:%M')}"
-
-    # Create and save report
-    report = AdminReport.objects.create(
-        admin=request.user,
-        title=title,
-        date_from=date_from,
-        date_to=date_to,
-        report_data=report_data,
-        total_projects=projects.count(),
-        total_volunteers=volunteers.count(),
-        total_tasks=tasks.count(),
-        total_beneficiaries=total_beneficiaries,
-        total_donations=total_donations,
-    )
+    # Nothing changed since the last report for this range - reuse it
+    report, created = get_or_create_report(request.user, date_from, date_to)
 
     serializer = AdminReportSerializer(report)
     return Response({
         'message': 'تم إنشاء التقرير بنجاح',
-        'report': serializer.data
-    }, status=status.HTTP_201_CREATED)
+        'report': serializer.data,
+        'reused': not created
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def report_job_status(request, job_id):
+    """
+    GET /api/admin/reports/jobs/{job_id}/
+    Status (queued/running/done/failed) and percent progress of a report job
+    """
+    try:
+        job = ReportJob.objects.get(id=job_id)
+    except ReportJob.DoesNotExist:
+        return Response(
+            {'error': 'المهمة غير موجودة'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return Response(ReportJobSerializer(job).data)
 
 
 @api_view(['GET'])
@@ -1044,8 +947,19 @@ def list_reports(request):
     """
     GET /api/admin/reports/
     List all generated reports
+
+    GET /api/admin/reports/?lite=1&page_size=20&cursor=...
+    Lightweight mode: report_data is never loaded, only the quick-stat columns
+    are returned, paginated by generated_at (use get_report_detail for the data)
     """
-    reports = AdminReport.objects.all()
+    if request.query_params.get('lite'):
+        reports = AdminReport.objects.defer('report_data').select_related('admin__profile')
+        paginator = ReportCursorPagination()
+        page = paginator.paginate_queryset(reports, request)
+        serializer = AdminReportListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    reports = AdminReport.objects.select_related('admin__profile')
     serializer = AdminReportSerializer(reports, many=True)
     return Response({'results': serializer.data})
 
@@ -1056,17 +970,117 @@ def get_report_detail(request, report_id):
     """
     GET /api/admin/reports/{id}/
     Get specific report details
+    report_data is streamed straight from its compressed column instead of
+    being decoded and re-rendered through DRF
     """
+    try:
+        report = AdminReport.objects.select_related('admin__profile').defer('report_data').annotate(
+            report_blob=ExpressionWrapper(F('report_data'), output_field=BinaryField())
+        ).get(id=report_id)
+    except AdminReport.DoesNotExist:
+        return Response(
+            {'error': 'التقرير غير موجود'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    metadata = AdminReportListSerializer(report).data
+    return StreamingHttpResponse(
+        stream_report_json(metadata, report.report_blob),
+        content_type='application/json'
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+@renderer_classes([JSONRenderer, XLSXRenderer, CSVRenderer])
+def export_report(request, report_id):
+    """
+    GET /api/admin/reports/{id}/export/?format=xlsx
+    GET /api/admin/reports/{id}/export/?format=csv&sheet=projects
+    Streamed download of a report's projects, volunteers, tasks and overdue tasks.
+    XLSX contains every sheet; CSV contains the one chosen by ?sheet=
+    (projects, volunteers, tasks, overdue - default projects)
+    """
+    export_format = request.query_params.get('format', 'xlsx')
+    sheet = request.query_params.get('sheet', 'projects')
+
+    if export_format == 'csv' and sheet not in SHEETS:
+        return Response(
+            {'error': f'sheet must be one of: {", ".join(SHEETS)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # The compressed bytes; rows are parsed from them while streaming
+    try:
+        report = AdminReport.objects.only('id').annotate(
+            report_blob=ExpressionWrapper(F('report_data'), output_field=BinaryField())
+        ).get(id=report_id)
+    except AdminReport.DoesNotExist:
+        return Response(
+            {'error': 'التقرير غير موجود'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    if export_format == 'csv':
+        response = StreamingHttpResponse(
+            stream_csv(report.report_blob, sheet),
+            content_type='text/csv; charset=utf-8'
+        )
+        filename = f'takaful_report_{report.id}_{sheet}.csv'
+    else:
+        response = StreamingHttpResponse(
+            stream_xlsx(report.report_blob),
+            content_type=XLSXRenderer.media_type
+        )
+        filename = f'takaful_report_{report.id}.xlsx'
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def diff_reports(request, report_id):
+    """
+    GET /api/admin/reports/{id}/diff/?base=<report_id>
+    What changed between two stored reports, computed from their report_data
+    (no regeneration). Without ?base= the latest earlier report of the same
+    kind (same date range, scheduled snapshot or not) is used.
+    """
+    base_id = request.query_params.get('base')
+    if base_id and not base_id.isdigit():
+        return Response({'error': 'رقم التقرير غير صالح'}, status=status.HTTP_400_BAD_REQUEST)
+
     try:
         report = AdminReport.objects.get(id=report_id)
-        serializer = AdminReportSerializer(report)
-        return Response(serializer.data)
     except AdminReport.DoesNotExist:
         return Response(
             {'error': 'التقرير غير موجود'},
             status=status.HTTP_404_NOT_FOUND
         )
 
+    if base_id:
+        base = AdminReport.objects.filter(id=base_id).first()
+    else:
+        base = AdminReport.objects.filter(
+            generated_at__lt=report.generated_at,
+            date_from=report.date_from,
+            date_to=report.date_to,
+            is_snapshot=report.is_snapshot,
+        ).order_by('-generated_at').first()
+
+    if base is None:
+        return Response(
+            {'error': 'لا يوجد تقرير سابق للمقارنة'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return Response({
+        'base': {'id': base.id, 'title': base.title, 'generated_at': base.generated_at},
+        'report': {'id': report.id, 'title': report.title, 'generated_at': report.generated_at},
+        'changes': diff_report_data(base.report_data, report.report_data),
+    })
+
 
 @api_view(['DELETE'])
 @permission_classes([IsAdmin])
@@ -1149,6 +1163,7 @@ def public_projects(request):
     """
     GET /api/public-projects/
     Public endpoint - returns all visible projects for public viewing
+    Optional: ?fields=id,title,category,status,progress and ?page_size= (cursor pagination)
     No authentication required
     """
     # Get all visible projects (not hidden)
@@ -1156,8 +1171,14 @@ def public_projects(request):
         is_hidden=False
     ).order_by('-created_at')
 
-    serializer = ProjectSerializer(projects, many=True)
-    return Response(serializer.data)
+    def build_response():
+        data, paginator = project_listing(request, projects)
+        if paginator is None:
+            return Response(data)
+        return paginator.get_paginated_response(data)
+
+    # 304 when the client's ETag / Last-Modified is still current
+    return conditional_get(request, projects, build_response, key=request.META.get('QUERY_STRING', ''))
 
 
 @api_view(['GET'])
@@ -1175,9 +1196,11 @@ def available_opportunities(request):
         is_hidden=False
     ).order_by('-created_at')  # Show all visible projects, sorted by newest first
 
-    serializer = ProjectSerializer(opportunities, many=True)
+    data, paginator = project_listing(request, opportunities)
+    if paginator is not None:
+        return paginator.get_paginated_response(data)
     return Response({
-        'results': serializer.data
+        'results': data
     })
 
 
@@ -1334,8 +1357,8 @@ def update_task_progress(request, task_id):
 @permission_classes([IsAdmin])
 def list_volunteer_applications(request):
     """
-    GET /api/admin/applications/
-    List all volunteer applications with optional status filter
+    GET /api/admin/applications/?status=&page_size=&cursor=&count=1
+    List all volunteer applications with optional status filter and cursor pages
     """
     status_filter = request.query_params.get('status', None)
 
@@ -1346,7 +1369,10 @@ def list_volunteer_applications(request):
     if status_filter:
         applications = applications.filter(status=status_filter)
 
+    applications, paginator = paginate_listing(request, applications, ApplicationCursorPagination)
     serializer = VolunteerApplicationSerializer(applications, many=True)
+    if paginator:
+        return paginator.get_paginated_response(serializer.data)
     return Response({'results': serializer.data})
 
 
@@ -1458,39 +1484,44 @@ def public_volunteers_stats(request):
     """
     from accounts.models import Profile
 
-    # Get all user profiles (volunteers only)
-    volunteers = Profile.objects.filter(role='user')
-
-    stats = []
-    for profile in volunteers:
-        # Calculate stats for each volunteer
-        total_hours = Task.objects.filter(
-            volunteer=profile.user,
-            status='مكتملة'
-        ).aggregate(total=Sum('hours'))['total'] or 0
-
-        participations_count = Task.objects.filter(
-            volunteer=profile.user
-        ).exclude(status='ملغاة').count()
-
-        successes_count = Task.objects.filter(
-            volunteer=profile.user,
-            status='مكتملة'
-        ).count()
-
-        stats.append({
-            'id': profile.user.id,
-            'gender': profile.gender,
-            'total_hours': total_hours,
-            'participations_count': participations_count,
-            'successes_count': successes_count,
-        })
+    # Counters come from the materialized VolunteerStatsSnapshot table (one query)
+    volunteers = Profile.objects.filter(role='user').values_list(
+        'user_id',
+        'gender',
+        'user__volunteer_stats__total_hours',
+        'user__volunteer_stats__participations_count',
+        'user__volunteer_stats__successes_count',
+    )
+
+    stats = [
+        {
+            'id': user_id,
+            'gender': gender,
+            'total_hours': total_hours or 0,
+            'participations_count': participations_count or 0,
+            'successes_count': successes_count or 0,
+        }
+        for user_id, gender, total_hours, participations_count, successes_count in volunteers
+    ]
 
     return Response(stats)
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def public_volunteers_distribution(request):
+    """
+    GET /api/public-volunteers-distribution/
+    Aggregated volunteer histograms (gender, age, city, hours, participations)
+    for the public volunteers page charts. Constant-size payload.
+    No authentication required.
+    """
+    return Response(cached_payload('volunteers-distribution', [VOLUNTEERS], volunteer_distributions))
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([PublicSuggestionThrottle])
 def public_submit_suggestion(request):
     """
     POST /api/public-suggestions/
@@ -1507,9 +1538,10 @@ def public_submit_suggestion(request):
     serializer = SuggestionSerializer(data=request.data)
 
     if serializer.is_valid():
-        serializer.save()
+        reference, _ = ingest_submission('suggestion', serializer)
         return Response({
-            'message': 'تم استلام اقتراحك بنجاح'
+            'message': 'تم استلام اقتراحك بنجاح',
+            'reference': str(reference)
         }, status=status.HTTP_201_CREATED)
 
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -1523,28 +1555,20 @@ def public_home_stats(request):
     Returns aggregated statistics for home page (Hero section)
     No authentication required
     """
-    # Total beneficiaries from all projects
-    total_beneficiaries = Project.objects.aggregate(
-        total=Sum('beneficiaries')
-    )['total'] or 0
-
-    # Total potential projects (all non-cancelled projects)
-    potential_projects = Project.objects.exclude(status='CANCELLED').count()
-
-    # Total donations amount
-    total_donations = Project.objects.aggregate(
-        total=Sum('donation_amount')
-    )['total'] or 0
+    # Beneficiaries, non-cancelled projects and donations in one query,
+    # cached until a Project changes
+    totals = cached_payload('home-stats', [PROJECTS], project_totals)
 
     return Response({
-        'beneficiaries': total_beneficiaries,
-        'potential_projects': potential_projects,
-        'donations': float(total_donations),
+        'beneficiaries': totals['total_beneficiaries'],
+        'potential_projects': totals['potential_projects'],
+        'donations': float(totals['total_donations']),
     })
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([PublicServiceRequestThrottle])
 def public_submit_service_request(request):
     """
     POST /api/public-service-request/
@@ -1562,10 +1586,11 @@ def public_submit_service_request(request):
     serializer = ServiceRequestSerializer(data=request.data)
 
     if serializer.is_valid():
-        serializer.save()
+        reference, service_request = ingest_submission('service_request', serializer)
         return Response({
             'message': 'تم استلام طلبك بنجاح. سيتم مراجعته من قبل الإدارة.',
-            'request_id': serializer.data['id']
+            'request_id': service_request.id if service_request else None,  # None until the spool is flushed
+            'reference': str(reference)
         }, status=status.HTTP_201_CREATED)
 
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -1583,10 +1608,16 @@ def public_services_list(request):
         is_active=True,
         service_type="للمتطوعين"  # Only volunteer opportunity services
     ).order_by('-created_at')
-    serializer = ServiceSerializer(services, many=True)
-    return Response({
-        'results': serializer.data
-    })
+
+    def compute():
+        return ServiceSerializer(services, many=True).data
+
+    def build_response():
+        return Response({
+            'results': cached_payload('services', [SERVICES], compute)
+        })
+
+    return conditional_get(request, services, build_response)
 
 
 @api_view(['GET'])
@@ -1601,10 +1632,16 @@ def beneficiary_services_list(request):
         is_active=True,
         service_type="للمستفيدين"  # Only beneficiary services
     ).order_by('-created_at')
-    serializer = ServiceSerializer(services, many=True)
-    return Response({
-        'results': serializer.data
-    })
+
+    def compute():
+        return ServiceSerializer(services, many=True).data
+
+    def build_response():
+        return Response({
+            'results': cached_payload('beneficiary-services', [SERVICES], compute)
+        })
+
+    return conditional_get(request, services, build_response)
 
 
 @api_view(['POST'])
@@ -1659,8 +1696,8 @@ def apply_to_service_as_volunteer(request, service_id):
 @permission_classes([IsAdmin])
 def list_service_volunteer_applications(request):
     """
-    GET /api/admin/service-volunteer-applications/
-    List all volunteer applications for services with optional status filter
+    GET /api/admin/service-volunteer-applications/?status=&page_size=&cursor=&count=1
+    List all volunteer applications for services with optional status filter and cursor pages
     """
     status_filter = request.query_params.get('status', None)
 
@@ -1671,7 +1708,10 @@ def list_service_volunteer_applications(request):
     if status_filter:
         applications = applications.filter(status=status_filter)
 
+    applications, paginator = paginate_listing(request, applications, ApplicationCursorPagination)
     serializer = ServiceVolunteerApplicationSerializer(applications, many=True)
+    if paginator:
+        return paginator.get_paginated_response(serializer.data)
     return Response({'results': serializer.data})
 
 
@@ -1756,25 +1796,88 @@ def public_volunteer_statistics(request):
     Optional query param: ?year=2025 (defaults to latest year)
     """
     year = request.query_params.get('year', None)
+    if year and not year.isdigit():
+        return Response({'error': 'السنة غير صالحة'}, status=status.HTTP_400_BAD_REQUEST)
 
+    statistics = VolunteerStatistics.objects.all()
     if year:
-        stats = VolunteerStatistics.objects.filter(year=int(year)).first()
-    else:
-        # Get the most recent year's statistics
-        stats = VolunteerStatistics.objects.first()
+        statistics = statistics.filter(year=int(year))
 
-    if not stats:
-        return Response({
-            'error': 'No statistics found',
-            'data': None
-        }, status=status.HTTP_404_NOT_FOUND)
+    def compute():
+        # Most recent year's statistics unless ?year= narrowed it down
+        stats = statistics.prefetch_related(
+            'quarterly_targets', 'department_hours', 'top_volunteers'
+        ).first()
+
+        if not stats:
+            return {}  # Cached as "not found"
+        data = VolunteerStatisticsSerializer(stats).data
+
+        # Live actuals from the task rollups replace uploaded figures for years the platform tracked
+        actuals = live_actuals(stats.year)
+        if actuals:
+            data['total_hours'] = actuals['total_hours']
+            data['total_volunteers'] = actuals['total_volunteers']
+            data['hours_display'] = f"{actuals['total_hours']:,}"
+            data['volunteers_display'] = f"{actuals['total_volunteers']:,}"
+            for target in data['quarterly_targets']:
+                quarter = actuals['quarters'].get(target['quarter'], {})
+                target['hours_actual'] = quarter.get('hours', 0)
+                target['volunteer_actual'] = quarter.get('volunteers', 0)
+            data['top_volunteers'] = actuals['top_volunteers']
+        return data
+
+    def build_response():
+        data = cached_payload('volunteer-statistics', [VOLUNTEER_STATISTICS], compute, year or 'latest')
+
+        if not data:
+            return Response({
+                'error': 'No statistics found',
+                'data': None
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(data)
+
+    return conditional_get(request, statistics, build_response, key=year or 'latest')
+
+
+@require_GET
+def public_snapshot(request, name):
+    """
+    GET /api/public-snapshots/{name}.json
+    Serves the pre-rendered snapshot of a public endpoint (see snapshots.py)
+    straight from disk/memory - one versions query, no DRF. gzip is sent when
+    accepted. Falls back to the live endpoint while no current snapshot has
+    been published.
+    """
+    if name not in SNAPSHOT_NAMES:
+        raise Http404
+
+    snapshot = load_snapshot(name)
+    if snapshot is None or not snapshot_is_current(name, snapshot):
+        view, _ = public_snapshot_views()[name]
+        return view(request)
+
+    version, body, gzip_body, _ = snapshot
+    etag = f'"{version}"'
+
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    elif negotiate_encoding(request.headers.get('Accept-Encoding', ''), ['gzip']):
+        response = HttpResponse(gzip_body, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(body, content_type='application/json')
 
-    serializer = VolunteerStatisticsSerializer(stats)
-    return Response(serializer.data)
+    response['ETag'] = etag
+    patch_vary_headers(response, ['Accept-Encoding'])
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([PublicWaterSupplyRequestThrottle])
 def public_water_supply_request(request):
     """
     POST /api/public-water-supply-request/
@@ -1815,10 +1918,27 @@ def public_water_supply_request(request):
 
     serializer = WaterSupplyRequestSerializer(data=mapped_data)
     if serializer.is_valid():
-        serializer.save()
+        # Resubmission of a request that is still open: answer with the original (one index lookup)
+        fingerprint = water_request_fingerprint(*(
+            serializer.validated_data.get(field, '')
+            for field in ('mobile_number', 'mosque_name', 'neighborhood', 'location_link')
+        ))
+        duplicate = WaterSupplyRequest.objects.filter(
+            fingerprint=fingerprint, status__in=WaterSupplyRequest.OPEN_STATUSES,
+        ).only('id', 'submission_ref').first()
+        if duplicate is not None:
+            return Response({
+                'success': True,
+                'duplicate': True,
+                'message': 'تم استلام طلبك مسبقاً وهو قيد المعالجة',
+                'reference': str(duplicate.submission_ref) if duplicate.submission_ref else None
+            }, status=status.HTTP_200_OK)
+
+        reference, _ = ingest_submission('water_supply_request', serializer)
         return Response({
             'success': True,
-            'message': 'تم إرسال طلبك بنجاح'
+            'message': 'تم إرسال طلبك بنجاح',
+            'reference': str(reference)
         }, status=status.HTTP_201_CREATED)
 
     return Response({
@@ -0,0 +1,133 @@
+"""
+Server-side filtering and ordering for the approved volunteers list
+(list_volunteers). The open task load and the status derived from it are
+computed in SQL, so they can be filtered and sorted on, and skills are
+matched through the indexed VolunteerSkill table.
+
+Query parameters:
+    city         exact city
+    skills       comma-separated; volunteers with any of them
+    status       نشط / مشغول / غير نشط
+    min_hours    minimum total volunteer hours
+    max_hours    maximum total volunteer hours
+    ordering     join_date, name, hours, rating or current_tasks ('-' for descending)
+"""
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+
+from .models import Task, VolunteerSkill
+from .reports import TASK_COMPLETED
+
+
+STATUS_INACTIVE = 'غير نشط'
+STATUS_ACTIVE = 'نشط'
+STATUS_BUSY = 'مشغول'
+
+# Open tasks from which a volunteer counts as busy
+BUSY_TASKS = 5
+
+# ?ordering= value -> annotation / field on the User queryset
+ORDERINGS = {
+    'join_date': 'date_joined',
+    'name': 'volunteer_name',
+    'hours': 'volunteer_hours',
+    'rating': 'volunteer_rating',
+    'current_tasks': 'current_tasks_count',
+}
+DEFAULT_ORDERING = '-join_date'
+
+
+def volunteer_status(current_tasks):
+    """Python twin of the SQL status, for volunteers loaded without with_task_load()"""
+    if current_tasks == 0:
+        return STATUS_INACTIVE
+    if current_tasks >= BUSY_TASKS:
+        return STATUS_BUSY
+    return STATUS_ACTIVE
+
+
+def with_task_load(queryset):
+    """
+    Annotate users with current_tasks_count (tasks not completed) and
+    volunteer_status, plus the profile columns the list can be sorted on.
+    """
+    open_tasks = (
+        Task.objects.filter(volunteer=OuterRef('pk'))
+        .exclude(status=TASK_COMPLETED)
+        .order_by()
+        .values('volunteer')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    return queryset.annotate(
+        current_tasks_count=Coalesce(Subquery(open_tasks), 0),
+        volunteer_name=F('profile__name'),
+        volunteer_hours=F('profile__total_volunteer_hours'),
+        volunteer_rating=F('profile__rating'),
+    ).annotate(
+        volunteer_status=Case(
+            When(current_tasks_count=0, then=Value(STATUS_INACTIVE)),
+            When(current_tasks_count__gte=BUSY_TASKS, then=Value(STATUS_BUSY)),
+            default=Value(STATUS_ACTIVE),
+        ),
+    )
+
+
+def _int_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: 'يجب أن تكون القيمة رقماً صحيحاً'})
+
+
+def filter_volunteers(queryset, params):
+    """Apply the city / skills / status / hours filters of params to a with_task_load() queryset"""
+    city = params.get('city')
+    if city:
+        queryset = queryset.filter(profile__city=city)
+
+    skills = [skill.strip() for skill in params.get('skills', '').split(',') if skill.strip()]
+    if skills:
+        queryset = queryset.filter(Exists(VolunteerSkill.objects.filter(user=OuterRef('pk'), skill__in=skills)))
+
+    status = params.get('status')
+    if status:
+        queryset = queryset.filter(volunteer_status=status)
+
+    hours = Q()
+    min_hours = _int_param(params, 'min_hours')
+    if min_hours is not None:
+        hours &= Q(profile__total_volunteer_hours__gte=min_hours)
+    max_hours = _int_param(params, 'max_hours')
+    if max_hours is not None:
+        hours &= Q(profile__total_volunteer_hours__lte=max_hours)
+    return queryset.filter(hours)
+
+
+def volunteer_ordering(params):
+    """(field, id) ordering for ?ordering=; the id keeps cursor pages stable"""
+    ordering = params.get('ordering') or DEFAULT_ORDERING
+    descending = ordering.startswith('-')
+    field = ORDERINGS.get(ordering.lstrip('-'))
+    if field is None:
+        raise ValidationError({'ordering': f'قيم الترتيب المتاحة: {", ".join(ORDERINGS)}'})
+    if descending:
+        return ('-' + field, '-id')
+    return (field, 'id')
+
+
+def sync_skills(user_id, skills):
+    """Make the user's VolunteerSkill rows match their Profile.skills list"""
+    wanted = {str(skill).strip()[:200] for skill in skills or [] if str(skill).strip()}
+    existing = set(VolunteerSkill.objects.filter(user_id=user_id).values_list('skill', flat=True))
+    if existing - wanted:
+        VolunteerSkill.objects.filter(user_id=user_id, skill__in=existing - wanted).delete()
+    if wanted - existing:
+        VolunteerSkill.objects.bulk_create(
+            [VolunteerSkill(user_id=user_id, skill=skill) for skill in wanted - existing],
+            ignore_conflicts=True,
+        )
@@ -0,0 +1,96 @@
+"""
+Maintenance of the VolunteerStatsSnapshot table.
+Each Task contributes (hours, participation, success) to its volunteer's row:
+    - participation: the task is not cancelled
+    - success / hours: the task is completed
+Task saves and deletes apply the difference between the old and new
+contribution with F() updates, so the public endpoint reads one table.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Task, VolunteerStatsSnapshot
+from .reports import TASK_COMPLETED
+
+
+TASK_CANCELLED = 'ملغاة'
+
+
+def task_contribution(volunteer_id, status, hours):
+    """(volunteer_id, hours, participations, successes) a task adds to the stats"""
+    completed = status == TASK_COMPLETED
+    return (
+        volunteer_id,
+        (hours or 0) if completed else 0,
+        0 if status == TASK_CANCELLED else 1,
+        1 if completed else 0,
+    )
+
+
+def apply_delta(user_id, hours=0, participations=0, successes=0):
+    """Add the given amounts to a volunteer's row, creating it if missing"""
+    if user_id is None or not (hours or participations or successes):
+        return
+
+    rows = VolunteerStatsSnapshot.objects.filter(user_id=user_id)
+    updated = rows.update(
+        total_hours=F('total_hours') + hours,
+        participations_count=F('participations_count') + participations,
+        successes_count=F('successes_count') + successes,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        _, created = VolunteerStatsSnapshot.objects.get_or_create(
+            user_id=user_id,
+            defaults={
+                'total_hours': hours,
+                'participations_count': participations,
+                'successes_count': successes,
+            },
+        )
+        if not created:
+            # Another writer created the row in the meantime
+            apply_delta(user_id, hours, participations, successes)
+
+
+def apply_change(old, new):
+    """Move a task's contribution from old to new (either may be None)"""
+    if old == new:
+        return
+    if old is not None:
+        user_id, hours, participations, successes = old
+        apply_delta(user_id, -hours, -participations, -successes)
+    if new is not None:
+        apply_delta(*new)
+
+
+def rebuild():
+    """
+    Recompute every row from Task in one aggregate query. Returns the row count.
+    The table is replaced in one transaction, so readers never see it empty.
+    """
+    with transaction.atomic():
+        totals = (
+            Task.objects.filter(volunteer__isnull=False)
+            .order_by()
+            .values('volunteer_id')
+            .annotate(
+                total_hours=Sum('hours', filter=Q(status=TASK_COMPLETED)),
+                participations_count=Count('id', filter=~Q(status=TASK_CANCELLED)),
+                successes_count=Count('id', filter=Q(status=TASK_COMPLETED)),
+            )
+        )
+        rows = [
+            VolunteerStatsSnapshot(
+                user_id=row['volunteer_id'],
+                total_hours=row['total_hours'] or 0,
+                participations_count=row['participations_count'],
+                successes_count=row['successes_count'],
+            )
+            for row in totals
+        ]
+
+        VolunteerStatsSnapshot.objects.all().delete()
+        VolunteerStatsSnapshot.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
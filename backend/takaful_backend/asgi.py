@@ -2,6 +2,9 @@
 ASGI config for takaful_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it so the admin SSE stream (/api/admin/events/) holds no worker thread:
+
+    gunicorn takaful_backend.asgi:application -k uvicorn.workers.UvicornWorker
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
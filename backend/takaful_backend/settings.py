@@ -60,6 +60,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # CORS
+    "takaful_app.compression.CompressionMiddleware",  # gzip/brotli with cached compressed bodies
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -102,6 +103,73 @@ DATABASES = {
 }
 
 
+# ===========================
+# Cache
+# ===========================
+# CACHE_BACKEND: "locmem" (default, per process), "file" or "db"
+# ("db" needs `python manage.py createcachetable`)
+
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "locmem")
+
+if CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("CACHE_LOCATION", str(BASE_DIR / ".cache")),
+        }
+    }
+elif CACHE_BACKEND == "db":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": os.environ.get("CACHE_LOCATION", "takaful_cache"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "takaful",
+        }
+    }
+
+# Seconds a versioned public response stays cached (entries are also
+# invalidated immediately by model signals through their version)
+PUBLIC_CACHE_TIMEOUT = int(os.environ.get("PUBLIC_CACHE_TIMEOUT", "3600"))
+
+# Seconds after which a running report job is considered abandoned by its worker
+REPORT_JOB_TIMEOUT = int(os.environ.get("REPORT_JOB_TIMEOUT", "1800"))
+
+# Token-bucket throttle for anonymous POST endpoints (see takaful_app/throttling.py)
+PUBLIC_THROTTLE = {
+    "BACKEND": os.environ.get("PUBLIC_THROTTLE_BACKEND", "cache"),  # "cache" (DB fallback) or "db"
+    "SCOPES": {
+        "public-suggestion": {"capacity": 5, "refill_per_minute": 1},
+        "public-service-request": {"capacity": 5, "refill_per_minute": 1},
+        "public-water-supply-request": {"capacity": 3, "refill_per_minute": 0.5},
+    },
+}
+
+# Public form ingestion: "direct" (one INSERT per request) or "spool" (buffered, see takaful_app/ingest.py)
+PUBLIC_INGEST_MODE = os.environ.get("PUBLIC_INGEST_MODE", "direct")
+PUBLIC_INGEST_SPOOL_DIR = Path(os.environ.get("PUBLIC_INGEST_SPOOL_DIR", str(BASE_DIR / "spool")))
+
+# Live admin dashboard events over SSE (see takaful_app/events.py)
+ADMIN_EVENTS = {
+    "POLL_INTERVAL": float(os.environ.get("ADMIN_EVENTS_POLL_INTERVAL", "1")),  # Seconds between log polls per process
+    "HEARTBEAT": 15,  # Seconds between keep-alive comments
+    "WSGI_RETRY": int(os.environ.get("ADMIN_EVENTS_WSGI_RETRY", "5")),  # Seconds between short polls when served over WSGI
+    "RETENTION_HOURS": 24,
+}
+
+# Response compression (see takaful_app/compression.py)
+COMPRESSION_MIN_LENGTH = int(os.environ.get("COMPRESSION_MIN_LENGTH", "1024"))
+COMPRESSION_CACHE_BYTES = int(os.environ.get("COMPRESSION_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+# Pre-rendered public endpoint snapshots (see takaful_app/snapshots.py)
+PUBLIC_SNAPSHOT_DIR = Path(os.environ.get("PUBLIC_SNAPSHOT_DIR", str(BASE_DIR / "public_snapshots")))
+
+
 # ===========================
 # Password validation
 # ===========================
@@ -195,6 +263,9 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    # Proxies in front of the app (Render's load balancer); throttles identify
+    # clients by the X-Forwarded-For entry this many hops from the end
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", "1")),
 }
 
 